@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from ast_parser.parser import EquationKind
+
+
+@dataclass
+class GeneratedProgram:
+    """Linear program `max c x, A x (<=, =, >=) b, x >= 0` produced by
+    a generator."""
+
+    A: np.ndarray
+    """Constraint matrix of shape (m, n)."""
+    b: np.ndarray
+    """Right-hand side vector of length m."""
+    c: np.ndarray
+    """Objective coefficients of length n."""
+    senses: list[EquationKind]
+    """Relationship of every row."""
+
+    def to_equations(self) -> str:
+        """Writes the program in the input format of the solver, the
+        objective `Z = c x` first.
+
+        Returns:
+            str: The equations, separated by commas.
+        """
+        names = [f"x_{j + 1}" for j in range(self.c.shape[0])]
+
+        equations = ["Z = " + _expression(self.c, names)]
+        for row, sense, bound in zip(self.A, self.senses, self.b):
+            equations.append(f"{_expression(row, names)} {sense.value} {float(bound)!r}")
+
+        return ", ".join(equations)
+
+
+def _expression(coefficients: np.ndarray, names: list[str]) -> str:
+    """Writes the terms of a row, skipping zero coefficients.
+
+    Args:
+        coefficients (numpy.ndarray): Coefficient of every variable.
+        names (list[str]): Name of every variable.
+
+    Returns:
+        str: The terms, `0` if they are all zero.
+    """
+    terms = []
+    for j in np.flatnonzero(coefficients):
+        value = float(coefficients[j])
+        sign = "-" if value < 0 else "+"
+
+        if terms or sign == "-":
+            terms.append(f"{sign} {abs(value)!r}{names[j]}")
+        else:
+            terms.append(f"{value!r}{names[j]}")
+
+    return " ".join(terms) or "0"
+
+
+def _packing(
+    rng: np.random.Generator, m: int, n: int, density: float
+) -> GeneratedProgram:
+    """Generates a feasible and bounded packing program: nonnegative
+    coefficients, `<=` rows with positive bounds and every column in at
+    least one row.
+
+    Args:
+        rng (numpy.random.Generator): Source of the coefficients.
+        m (int): Number of rows.
+        n (int): Number of columns.
+        density (float): Share of nonzero coefficients.
+
+    Returns:
+        GeneratedProgram: The program.
+    """
+    A = np.round(rng.uniform(1.0, 10.0, (m, n)), 2)
+    A *= rng.random((m, n)) < density
+
+    # Every column needs an entry, or the program is unbounded.
+    empty = np.flatnonzero(~A.any(axis=0))
+    A[rng.integers(0, m, empty.shape[0]), empty] = np.round(
+        rng.uniform(1.0, 10.0, empty.shape[0]), 2
+    )
+
+    b = np.round(rng.uniform(10.0, 100.0, m), 2)
+    c = np.round(rng.uniform(1.0, 10.0, n), 2)
+
+    return GeneratedProgram(A, b, c, [EquationKind.LEQ] * m)
+
+
+def dense(rng: np.random.Generator, size: int) -> GeneratedProgram:
+    """Square program with every coefficient set.
+
+    Args:
+        rng (numpy.random.Generator): Source of the coefficients.
+        size (int): Number of rows and columns.
+
+    Returns:
+        GeneratedProgram: The program.
+    """
+    return _packing(rng, size, size, 1.0)
+
+
+def sparse(rng: np.random.Generator, size: int) -> GeneratedProgram:
+    """Square program with about five coefficients per row.
+
+    Args:
+        rng (numpy.random.Generator): Source of the coefficients.
+        size (int): Number of rows and columns.
+
+    Returns:
+        GeneratedProgram: The program.
+    """
+    return _packing(rng, size, size, min(1.0, 5.0 / size))
+
+
+def degenerate(rng: np.random.Generator, size: int) -> GeneratedProgram:
+    """Square program where half of the rows have a zero bound, so many
+    pivots do not move the solution.
+
+    Args:
+        rng (numpy.random.Generator): Source of the coefficients.
+        size (int): Number of rows and columns.
+
+    Returns:
+        GeneratedProgram: The program.
+    """
+    program = _packing(rng, size, size, min(1.0, 10.0 / size))
+
+    zero = rng.permutation(size)[: size // 2]
+    program.b[zero] = 0.0
+    # Rows with a zero bound mix signs, so they are not just x = 0.
+    program.A[zero] *= np.where(rng.random((zero.shape[0], size)) < 0.5, -1.0, 1.0)
+
+    return program
+
+
+def wide(rng: np.random.Generator, size: int) -> GeneratedProgram:
+    """Program with four times more columns than rows.
+
+    Args:
+        rng (numpy.random.Generator): Source of the coefficients.
+        size (int): Number of rows.
+
+    Returns:
+        GeneratedProgram: The program.
+    """
+    return _packing(rng, size, 4 * size, min(1.0, 10.0 / size))
+
+
+def tall(rng: np.random.Generator, size: int) -> GeneratedProgram:
+    """Program with four times more rows than columns.
+
+    Args:
+        rng (numpy.random.Generator): Source of the coefficients.
+        size (int): Number of columns.
+
+    Returns:
+        GeneratedProgram: The program.
+    """
+    return _packing(rng, 4 * size, size, min(1.0, 10.0 / size))
+
+
+def transportation(rng: np.random.Generator, size: int) -> GeneratedProgram:
+    """Balanced transportation program between `size / 2` sources and
+    as many destinations, its cost minimized: `<=` supply rows, `>=`
+    demand rows, one column per route.
+
+    Args:
+        rng (numpy.random.Generator): Source of the coefficients.
+        size (int): Number of sources plus destinations.
+
+    Returns:
+        GeneratedProgram: The program.
+    """
+    sources = destinations = max(size // 2, 1)
+
+    supply = rng.integers(10, 100, sources).astype(float)
+    demand = rng.multinomial(int(supply.sum()), np.ones(destinations) / destinations)
+
+    A = np.zeros((sources + destinations, sources * destinations))
+    for i in range(sources):
+        A[i, i * destinations : (i + 1) * destinations] = 1.0
+    for k in range(destinations):
+        A[sources + k, k::destinations] = 1.0
+
+    cost = np.round(rng.uniform(1.0, 20.0, sources * destinations), 2)
+
+    return GeneratedProgram(
+        A,
+        np.concatenate((supply, demand.astype(float))),
+        -cost,
+        [EquationKind.LEQ] * sources + [EquationKind.GEQ] * destinations,
+    )
+
+
+GENERATORS: dict[str, Callable[[np.random.Generator, int], GeneratedProgram]] = {
+    "dense": dense,
+    "sparse": sparse,
+    "degenerate": degenerate,
+    "wide": wide,
+    "tall": tall,
+    "transportation": transportation,
+}
+"""Generator of every family of programs."""
+
+SIZES: dict[str, int] = {"small": 10, "medium": 40, "large": 120}
+"""Size parameter of every size class."""
+
+
+def generate(family: str, size: str, seed: int = 0) -> GeneratedProgram:
+    """Generates a program, the same one for the same arguments.
+
+    Args:
+        family (str): Family of the program, a key of GENERATORS.
+        size (str): Size class of the program, a key of SIZES.
+        seed (int, optional): Seed of the coefficients. Defaults to 0.
+
+    Returns:
+        GeneratedProgram: The program.
+    """
+    rng = np.random.default_rng([seed, list(GENERATORS).index(family), SIZES[size]])
+
+    return GENERATORS[family](rng, SIZES[size])
+
+
+__all__ = ("GeneratedProgram", "GENERATORS", "SIZES", "generate")
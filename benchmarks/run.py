@@ -0,0 +1,407 @@
+"""Times the lex, parse, build and solve stages on seeded programs and
+compares them against a stored baseline.
+
+The committed baseline holds what does not depend on the machine: the
+status, iterations and peak memory of every case. Wall times are only
+compared against timings recorded on the same machine with --save.
+
+    python benchmarks/run.py                      # compare with the baselines
+    python benchmarks/run.py --save               # record new baselines
+    python benchmarks/run.py --sizes small large --families dense sparse
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(ROOT), "src"))
+sys.path.insert(0, ROOT)
+
+from algorithm.problem import LinearProgram  # noqa: E402
+from algorithm.solver import Solver  # noqa: E402
+from algorithm.two_phase import TwoPhaseSimplex  # noqa: E402
+from ast_parser.coo import CooParser  # noqa: E402
+from ast_parser.fast_lexer import FastLexer  # noqa: E402
+from ast_parser.parser import Parser  # noqa: E402
+from generators import GENERATORS, SIZES, generate  # noqa: E402
+from main import find_objective  # noqa: E402
+
+BASELINE = os.path.join(ROOT, "baseline.json")
+"""Default path of the stored baseline."""
+TIMINGS = os.path.join(ROOT, "timings.json")
+"""Default path of the timings recorded on this machine, not committed."""
+
+
+@dataclass
+class StageResult:
+    """Measurements of one stage of one case."""
+
+    seconds: float
+    """Best wall time over the repeats."""
+    peak_kib: float
+    """Peak memory allocated by the stage, in KiB."""
+
+
+@dataclass
+class CaseResult:
+    """Measurements of every stage of one case."""
+
+    shape: tuple[int, int]
+    """The number of rows and columns of the program."""
+    status: str
+    """Termination status of the solve."""
+    iterations: int
+    """Number of pivots of the solve."""
+    stages: dict[str, StageResult] = field(default_factory=dict)
+    """Measurements of every stage."""
+
+
+def measure(
+    stage: Callable[..., object],
+    repeats: int,
+    setup: Callable[[], tuple] | None = None,
+) -> tuple[StageResult, object]:
+    """Times a stage, then runs it once more to trace its memory.
+
+    Args:
+        stage (Callable[..., object]): The stage.
+        repeats (int): Number of timed runs.
+        setup (Callable[[], tuple], optional): Makes the arguments of
+            every run of the stage, untimed. Defaults to None, no
+            arguments.
+
+    Returns:
+        tuple[StageResult, object]: The measurements and the output of
+            the stage.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        arguments = setup() if setup is not None else ()
+
+        start = time.perf_counter()
+        output = stage(*arguments)
+        best = min(best, time.perf_counter() - start)
+
+    arguments = setup() if setup is not None else ()
+
+    # Tracing slows the stage down, so it is kept out of the timings.
+    tracemalloc.start()
+    try:
+        stage(*arguments)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return StageResult(best, peak / 1024), output
+
+
+def _solver(text: str) -> Solver:
+    """Prepares a Solver for matrix assembly without solving.
+
+    Args:
+        text (str): The program, in the input format of the solver.
+
+    Returns:
+        Solver: The Solver holding the equations with their slack
+            variables.
+    """
+    solver = Solver.__new__(Solver)
+    solver.add_slack_variables(*find_objective(tuple(Parser(text))))
+
+    return solver
+
+
+def run_case(family: str, size: str, seed: int, repeats: int) -> CaseResult:
+    """Runs every stage on one generated program.
+
+    Args:
+        family (str): Family of the program.
+        size (str): Size class of the program.
+        seed (int): Seed of the program.
+        repeats (int): Number of timed runs of every stage.
+
+    Returns:
+        CaseResult: The measurements.
+    """
+    text = generate(family, size, seed).to_equations()
+
+    stages = {}
+
+    stages["lex"], _ = measure(
+        lambda: collections.deque(FastLexer(text), maxlen=0), repeats
+    )
+    stages["parse"], _ = measure(lambda: list(Parser(text)), repeats)
+    # The path of main.py, which modifies the Equations, so every run
+    # gets freshly parsed ones.
+    stages["assemble"], _ = measure(
+        lambda solver: solver.convert_to_matrices(),
+        repeats,
+        lambda: (_solver(text),),
+    )
+    stages["parse_coo"], equations = measure(lambda: CooParser(text).parse(), repeats)
+    stages["build"], form = measure(
+        lambda: LinearProgram.from_coo(equations, sparse=True).standard_form(), repeats
+    )
+    stages["solve"], result = measure(
+        lambda: TwoPhaseSimplex(form.A, form.b, form.c).solve(), repeats
+    )
+
+    return CaseResult(
+        (form.A.shape[0], form.num_structural),
+        result.status.value,
+        result.iterations,
+        stages,
+    )
+
+
+def machine() -> dict[str, str]:
+    """Describes the machine the timings are taken on.
+
+    Returns:
+        dict[str, str]: The host, architecture and interpreter.
+    """
+    return {
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "python": platform.python_version(),
+    }
+
+
+def to_baseline(result: CaseResult) -> dict:
+    """Keeps the measurements of a case that do not depend on the
+    machine.
+
+    Args:
+        result (CaseResult): The measurements.
+
+    Returns:
+        dict: The shape, status, iterations and peak memory of every
+            stage.
+    """
+    return {
+        "shape": list(result.shape),
+        "status": result.status,
+        "iterations": result.iterations,
+        "stages": {
+            name: {"peak_kib": stage.peak_kib} for name, stage in result.stages.items()
+        },
+    }
+
+
+def load_timings(path: str) -> dict[str, dict[str, float]]:
+    """Loads the timings recorded on this machine.
+
+    Args:
+        path (str): Path of the timings.
+
+    Returns:
+        dict[str, dict[str, float]]: The seconds of every stage, by
+            case, empty if none were recorded here.
+    """
+    if not os.path.exists(path):
+        return {}
+
+    with open(path, encoding="utf-8") as file:
+        stored = json.load(file)
+
+    if stored.get("machine") != machine():
+        print(f"Ignoring {path}, it was recorded on another machine\n")
+
+        return {}
+
+    return stored["cases"]
+
+
+def compare(
+    results: dict[str, CaseResult],
+    baseline: dict[str, dict],
+    timings: dict[str, dict[str, float]],
+    tolerance: float,
+    floor: float,
+) -> list[str]:
+    """Lists the regressions against the baselines.
+
+    Args:
+        results (dict[str, CaseResult]): The measurements, by case.
+        baseline (dict[str, dict]): The stored measurements, by case.
+        timings (dict[str, dict[str, float]]): The seconds of every
+            stage recorded on this machine, by case.
+        tolerance (float): Allowed relative slowdown or memory growth.
+        floor (float): Time differences below this many seconds are
+            noise and never flagged.
+
+    Returns:
+        list[str]: A description of every regression.
+    """
+    regressions = []
+
+    for case, result in results.items():
+        stored = baseline.get(case)
+        if stored is not None:
+            if result.status != stored["status"]:
+                regressions.append(
+                    f"{case}: status {stored['status']} -> {result.status}"
+                )
+            if result.iterations > stored["iterations"]:
+                regressions.append(
+                    f"{case}: iterations {stored['iterations']} -> {result.iterations}"
+                )
+
+        for name, stage in result.stages.items():
+            before = stored["stages"].get(name) if stored is not None else None
+            if (
+                before is not None
+                and stage.peak_kib > before["peak_kib"] * (1.0 + tolerance) + 1.0
+            ):
+                regressions.append(
+                    f"{case}/{name}: {before['peak_kib']:.0f} KiB -> "
+                    f"{stage.peak_kib:.0f} KiB peak"
+                )
+
+            seconds = timings.get(case, {}).get(name)
+            if (
+                seconds is not None
+                and stage.seconds > seconds * (1.0 + tolerance)
+                and stage.seconds - seconds > floor
+            ):
+                regressions.append(
+                    f"{case}/{name}: {seconds * 1e3:.2f} ms -> "
+                    f"{stage.seconds * 1e3:.2f} ms"
+                )
+
+    return regressions
+
+
+def report(
+    results: dict[str, CaseResult], timings: dict[str, dict[str, float]]
+) -> None:
+    """Prints a table of the measurements, with the ratio to the time
+    of every stage recorded on this machine.
+
+    Args:
+        results (dict[str, CaseResult]): The measurements, by case.
+        timings (dict[str, dict[str, float]]): The seconds of every
+            stage recorded on this machine, by case.
+    """
+    print(
+        f"{'case':<24}{'shape':>12}{'status':>12}{'iters':>7}  "
+        f"{'stage':<10}{'ms':>10}{'peak KiB':>11}{'vs base':>9}"
+    )
+
+    for case, result in results.items():
+        stored = timings.get(case, {})
+        shape = "x".join(map(str, result.shape))
+
+        for k, (name, stage) in enumerate(result.stages.items()):
+            ratio = ""
+            if stored.get(name, 0.0) > 0.0:
+                ratio = f"{stage.seconds / stored[name]:.2f}x"
+
+            print(
+                f"{case if k == 0 else '':<24}"
+                f"{shape if k == 0 else '':>12}"
+                f"{result.status if k == 0 else '':>12}"
+                f"{result.iterations if k == 0 else '':>7}  "
+                f"{name:<10}{stage.seconds * 1e3:>10.2f}"
+                f"{stage.peak_kib:>11.0f}{ratio:>9}"
+            )
+
+
+def main() -> int:
+    """Runs the suite.
+
+    Returns:
+        int: 1 if a regression is flagged, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--families", nargs="+", choices=list(GENERATORS), default=list(GENERATORS)
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"]
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per stage")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--timings", default=TIMINGS)
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="store the results as the baseline and the timings of this machine",
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="allowed relative regression"
+    )
+    parser.add_argument(
+        "--floor", type=float, default=0.002, help="ignored time difference, seconds"
+    )
+    args = parser.parse_args()
+
+    results = {}
+    for size in args.sizes:
+        for family in args.families:
+            case = f"{family}/{size}/{args.seed}"
+            results[case] = run_case(family, size, args.seed, args.repeats)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    timings = load_timings(args.timings)
+
+    report(results, timings)
+
+    if args.save:
+        # Cases that were not run keep their stored measurements.
+        baseline.update({case: to_baseline(result) for case, result in results.items()})
+        timings.update(
+            {
+                case: {name: stage.seconds for name, stage in result.stages.items()}
+                for case, result in results.items()
+            }
+        )
+
+        for path, stored in (
+            (args.baseline, baseline),
+            (args.timings, {"machine": machine(), "cases": timings}),
+        ):
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(stored, file, indent=2, sort_keys=True)
+                file.write("\n")
+
+        print(f"\nBaseline saved to {args.baseline}, timings to {args.timings}")
+
+        return 0
+
+    regressions = compare(results, baseline, timings, args.tolerance, args.floor)
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print("  " + regression)
+
+        return 1
+
+    if not baseline:
+        print("\nNo baseline to compare with")
+    elif not timings:
+        print("\nNo regressions, times not compared: record them here with --save")
+    else:
+        print("\nNo regressions")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+from algorithm.batch import BatchResult, BatchSimplex
+from algorithm.builder import ProgramBuilder
+from algorithm.cache import CachedResult, CanonicalForm, ResultCache
+from algorithm.dual import DualPricing, DualSimplex
+from algorithm.errors import (
+    InfeasibleException,
+    SingularBasisException,
+    SolverException,
+    UnboundedException,
+)
+from algorithm.events import PivotCallback, PivotEvent, PivotTrace
+from algorithm.formats import read_lp, read_mps, write_lp, write_mps
+from algorithm.lu import BasisFactorization, LUFactorization
+from algorithm.matrix import DenseMatrix, SparseMatrix, as_matrix
+from algorithm.model import Model, ModelSolution
+from algorithm.parallel import ParallelSolver
+from algorithm.presolve import Presolver
+from algorithm.pricing import (
+    DantzigPricing,
+    DevexPricing,
+    PartialPricing,
+    PricingStrategy,
+    SteepestEdgePricing,
+)
+from algorithm.problem import LinearProgram, StandardForm
+from algorithm.profiling import StageProfiler, StageReport, profiled
+from algorithm.ratio import (
+    RatioTest,
+    RatioTestResult,
+    harris_ratio_test,
+    textbook_ratio_test,
+)
+from algorithm.revised import RevisedSimplex, SimplexResult, SimplexStatus
+from algorithm.scaling import Scaling, ScalingMethod
+from algorithm.storage import StoredModel, load_model, save_model
+from algorithm.two_phase import TwoPhaseSimplex
+
+__all__ = (
+    "SolverException",
+    "SingularBasisException",
+    "UnboundedException",
+    "InfeasibleException",
+    "LUFactorization",
+    "BasisFactorization",
+    "DenseMatrix",
+    "SparseMatrix",
+    "as_matrix",
+    "ModelSolution",
+    "Model",
+    "LinearProgram",
+    "ProgramBuilder",
+    "read_mps",
+    "write_mps",
+    "read_lp",
+    "write_lp",
+    "StoredModel",
+    "save_model",
+    "load_model",
+    "StandardForm",
+    "Presolver",
+    "PricingStrategy",
+    "DantzigPricing",
+    "PartialPricing",
+    "DevexPricing",
+    "SteepestEdgePricing",
+    "RatioTest",
+    "RatioTestResult",
+    "textbook_ratio_test",
+    "harris_ratio_test",
+    "SimplexStatus",
+    "SimplexResult",
+    "RevisedSimplex",
+    "PivotEvent",
+    "PivotCallback",
+    "PivotTrace",
+    "ScalingMethod",
+    "Scaling",
+    "DualPricing",
+    "DualSimplex",
+    "TwoPhaseSimplex",
+    "BatchResult",
+    "BatchSimplex",
+    "ParallelSolver",
+    "CanonicalForm",
+    "CachedResult",
+    "ResultCache",
+    "StageReport",
+    "StageProfiler",
+    "profiled",
+)
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from algorithm.revised import SimplexResult, SimplexStatus
+
+_STATUSES = (
+    SimplexStatus.OPTIMAL,
+    SimplexStatus.UNBOUNDED,
+    SimplexStatus.INFEASIBLE,
+    SimplexStatus.ITERATION_LIMIT,
+)
+"""Termination statuses by their internal codes."""
+
+_RUNNING = -1
+"""Internal code of an instance that is still pivoting."""
+
+
+@dataclass
+class BatchResult:
+    """Outcome of a batch solve, one entry per instance."""
+
+    statuses: tuple[SimplexStatus, ...]
+    """Termination status of every instance."""
+    x: np.ndarray
+    """Values of the columns, of shape (k, n)."""
+    objective: np.ndarray
+    """Values of the objective functions, of length k."""
+    basis: np.ndarray
+    """Indices of the basic columns, of shape (k, m). Positions still
+    held by artificials have indices of n and above."""
+    duals: np.ndarray
+    """Simplex multipliers of the rows, of shape (k, m)."""
+    iterations: np.ndarray
+    """Number of pivots of both phases, of length k."""
+
+    def __len__(self) -> int:
+        """Gets the number of instances.
+
+        Returns:
+            int: The number of instances.
+        """
+        return len(self.statuses)
+
+    def result(self, index: int) -> SimplexResult:
+        """Extracts the outcome of one instance.
+
+        Args:
+            index (int): Index of the instance.
+
+        Returns:
+            SimplexResult: The outcome of the instance.
+        """
+        return SimplexResult(
+            self.statuses[index],
+            self.x[index],
+            float(self.objective[index]),
+            self.basis[index],
+            self.duals[index],
+            int(self.iterations[index]),
+        )
+
+
+class BatchSimplex:
+    """Two-phase tableau simplex method over a batch of programs
+    `max c x, A x = b, x >= 0` of the same shape.
+
+    Every pivot is a handful of array operations over all instances
+    still running, so one pass of the loop advances the whole batch.
+    Instances that have converged are masked out. Phase 1 starts every
+    instance from artificial columns, artificials left in the basis at
+    zero are pinned there in phase 2 by a ratio test on the magnitude of
+    their entries.
+
+    Any of A, b and c may be shared by all instances, i.e. given without
+    the leading batch dimension.
+
+    Args:
+        A (numpy.ndarray): Constraint matrices of shape (k, m, n).
+        b (numpy.ndarray): Right-hand side vectors of shape (k, m).
+        c (numpy.ndarray): Objective coefficients of shape (k, n).
+        tolerance (float, optional): Optimality and pivot tolerance.
+            Defaults to 1e-9.
+        feasibility_tolerance (float, optional): Largest sum of the
+            artificials, relative to the right-hand side, that is still
+            considered feasible. Defaults to 1e-7.
+        max_iterations (int, optional): Maximum number of pivots per
+            phase and instance. Defaults to a limit proportional to the
+            problem size.
+    """
+
+    _A: np.ndarray
+    """Constraint matrices of shape (k, m, n)."""
+    _b: np.ndarray
+    """Right-hand side vectors of shape (k, m)."""
+    _c: np.ndarray
+    """Objective coefficients of shape (k, n)."""
+
+    tolerance: float
+    """Optimality and pivot tolerance."""
+    feasibility_tolerance: float
+    """Largest relative sum of the artificials considered feasible."""
+    max_iterations: int
+    """Maximum number of pivots per phase and instance."""
+
+    def __init__(
+        self,
+        A: np.ndarray,
+        b: np.ndarray,
+        c: np.ndarray,
+        tolerance: float = 1e-9,
+        feasibility_tolerance: float = 1e-7,
+        max_iterations: int | None = None,
+    ) -> None:
+        A = np.asarray(A, dtype=float)
+        b = np.asarray(b, dtype=float)
+        c = np.asarray(c, dtype=float)
+
+        m, n = A.shape[-2:]
+        k = max(
+            A.shape[0] if A.ndim == 3 else 1,
+            b.shape[0] if b.ndim == 2 else 1,
+            c.shape[0] if c.ndim == 2 else 1,
+        )
+
+        self._A = np.broadcast_to(A, (k, m, n))
+        self._b = np.broadcast_to(b, (k, m))
+        self._c = np.broadcast_to(c, (k, n))
+
+        self.tolerance = tolerance
+        self.feasibility_tolerance = feasibility_tolerance
+        self.max_iterations = (
+            max_iterations if max_iterations is not None else max(50 * (m + n), 1)
+        )
+
+    def solve(self) -> BatchResult:
+        """Runs phase 1 and phase 2 over the batch.
+
+        Returns:
+            BatchResult: The outcome of every instance.
+        """
+        k, m, n = self._A.shape
+
+        row_signs = np.where(self._b < 0.0, -1.0, 1.0)
+
+        tableau = np.concatenate(
+            (self._A * row_signs[:, :, None], np.broadcast_to(np.eye(m), (k, m, m))),
+            axis=2,
+        )
+        x_B = self._b * row_signs
+        basis = np.tile(n + np.arange(m), (k, 1))
+
+        codes = np.full(k, _RUNNING)
+        iterations = np.zeros(k, dtype=np.int64)
+
+        # Phase 1 maximizes minus the sum of the artificials.
+        c = np.concatenate((np.zeros(n), -np.ones(m)))
+        reduced_costs = self._reduced_costs(tableau, basis, np.broadcast_to(c, (k, n + m)))
+
+        self._iterate(tableau, x_B, basis, reduced_costs, codes, iterations, False)
+
+        infeasibility = np.where(basis >= n, x_B, 0.0).sum(axis=1)
+        limit = self.feasibility_tolerance * np.maximum(
+            1.0, np.abs(self._b).max(axis=1, initial=0.0)
+        )
+
+        feasible = codes == _STATUSES.index(SimplexStatus.OPTIMAL)
+        codes[feasible & (infeasibility > limit)] = _STATUSES.index(
+            SimplexStatus.INFEASIBLE
+        )
+        codes[feasible & (infeasibility <= limit)] = _RUNNING
+
+        # Phase 2 optimizes the original objective.
+        c = np.concatenate((self._c, np.zeros((k, m))), axis=1)
+        reduced_costs = self._reduced_costs(tableau, basis, c)
+
+        self._iterate(tableau, x_B, basis, reduced_costs, codes, iterations, True)
+
+        x = np.zeros((k, n + m))
+        np.put_along_axis(x, basis, x_B, axis=1)
+        x = x[:, :n]
+
+        return BatchResult(
+            tuple(_STATUSES[code] for code in codes),
+            x,
+            np.einsum("kn,kn->k", self._c, x),
+            basis,
+            reduced_costs[:, n:] * row_signs,
+            iterations,
+        )
+
+    @staticmethod
+    def _reduced_costs(
+        tableau: np.ndarray, basis: np.ndarray, c: np.ndarray
+    ) -> np.ndarray:
+        """Computes the reduced costs of the current bases.
+
+        Args:
+            tableau (numpy.ndarray): The tableaus `B^-1 A`.
+            basis (numpy.ndarray): The basic columns.
+            c (numpy.ndarray): Objective coefficients of all columns.
+
+        Returns:
+            numpy.ndarray: The reduced costs `c_B B^-1 A - c`.
+        """
+        c_B = np.take_along_axis(c, basis, axis=1)
+
+        return np.einsum("km,kmj->kj", c_B, tableau) - c
+
+    def _iterate(
+        self,
+        tableau: np.ndarray,
+        x_B: np.ndarray,
+        basis: np.ndarray,
+        reduced_costs: np.ndarray,
+        codes: np.ndarray,
+        iterations: np.ndarray,
+        pin_artificials: bool,
+    ) -> None:
+        """Pivots the running instances until each of them stops. All
+        arrays are updated in place.
+
+        Args:
+            tableau (numpy.ndarray): The tableaus `B^-1 A`.
+            x_B (numpy.ndarray): Values of the basic variables.
+            basis (numpy.ndarray): The basic columns.
+            reduced_costs (numpy.ndarray): Reduced costs of all columns.
+            codes (numpy.ndarray): Status codes, the running instances
+                are set to their termination status.
+            iterations (numpy.ndarray): Pivot counters.
+            pin_artificials (bool): Keep the artificials out of the
+                basis and at zero, for phase 2.
+        """
+        n = self._A.shape[2]
+
+        allowed = np.ones(tableau.shape[2], dtype=bool)
+        if pin_artificials:
+            allowed[n:] = False
+
+        running = np.flatnonzero(codes == _RUNNING)
+
+        for _ in range(self.max_iterations):
+            if running.shape[0] == 0:
+                return
+
+            candidates = np.where(allowed, reduced_costs[running], np.inf)
+            entering = np.argmin(candidates, axis=1)
+
+            optimal = candidates[np.arange(running.shape[0]), entering] >= -self.tolerance
+            codes[running[optimal]] = _STATUSES.index(SimplexStatus.OPTIMAL)
+            running, entering = running[~optimal], entering[~optimal]
+
+            lanes = np.arange(running.shape[0])
+            alpha = tableau[running[:, None], np.arange(tableau.shape[1]), entering[:, None]]
+
+            pivots = alpha
+            if pin_artificials:
+                pivots = np.where(basis[running] >= n, np.abs(alpha), alpha)
+
+            eligible = pivots > self.tolerance
+            ratios = np.where(
+                eligible, x_B[running] / np.where(eligible, pivots, 1.0), np.inf
+            )
+            leaving = np.argmin(ratios, axis=1)
+
+            unbounded = np.isinf(ratios[lanes, leaving])
+            codes[running[unbounded]] = _STATUSES.index(SimplexStatus.UNBOUNDED)
+            running = running[~unbounded]
+            entering, leaving = entering[~unbounded], leaving[~unbounded]
+            alpha = alpha[~unbounded]
+
+            lanes = np.arange(running.shape[0])
+            pivot = alpha[lanes, leaving]
+
+            rows = tableau[running]
+            pivot_rows = rows[lanes, leaving] / pivot[:, None]
+            rows -= alpha[:, :, None] * pivot_rows[:, None, :]
+            rows[lanes, leaving] = pivot_rows
+            tableau[running] = rows
+
+            values = x_B[running]
+            step = values[lanes, leaving] / pivot
+            values -= alpha * step[:, None]
+            values[lanes, leaving] = step
+            x_B[running] = np.maximum(values, 0.0)
+
+            reduced_costs[running] -= (
+                reduced_costs[running, entering][:, None] * pivot_rows
+            )
+            basis[running, leaving] = entering
+            iterations[running] += 1
+
+        codes[running] = _STATUSES.index(SimplexStatus.ITERATION_LIMIT)
+
+
+__all__ = ("BatchResult", "BatchSimplex")
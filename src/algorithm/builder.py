@@ -0,0 +1,377 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+
+from algorithm.matrix import DenseMatrix, SparseMatrix
+from algorithm.problem import LinearProgram
+from algorithm.revised import SimplexResult
+from algorithm.two_phase import TwoPhaseSimplex
+from ast_parser.parser import EquationKind
+
+
+class ProgramBuilder:
+    """Assembles a LinearProgram `max c x, A x (<=, =, >=) b, x >= 0`
+    from arrays, without formatting the coefficients into equations.
+
+    Variables and constraints are added in blocks. A block of
+    constraints is kept as coordinate triplets, whatever the storage of
+    its coefficients, and the blocks are only concatenated on build.
+
+    Args:
+        variable_prefix (str, optional): Prefix of the generated
+            variable names. Defaults to "x_".
+        row_prefix (str, optional): Prefix of the generated row names.
+            Defaults to "r_".
+    """
+
+    variable_prefix: str
+    """Prefix of the generated variable names."""
+    row_prefix: str
+    """Prefix of the generated row names."""
+
+    _variable_names: list[str]
+    """Name of every variable."""
+    _variable_indices: dict[str, int]
+    """Index of every variable name."""
+    _c: np.ndarray
+    """Objective coefficient of every variable."""
+
+    _row_names: list[str]
+    """Name of every row."""
+    _row_indices: dict[str, int]
+    """Index of every row name."""
+    _senses: list[EquationKind]
+    """Relationship of every row."""
+    _b: list[np.ndarray]
+    """Right-hand sides of every block of rows."""
+    _triplets: list[tuple[np.ndarray, np.ndarray, np.ndarray]]
+    """Row indices, column indices and values of every block of rows."""
+
+    def __init__(self, variable_prefix: str = "x_", row_prefix: str = "r_") -> None:
+        self.variable_prefix = variable_prefix
+        self.row_prefix = row_prefix
+
+        self._variable_names = []
+        self._variable_indices = {}
+        self._c = np.zeros(0)
+
+        self._row_names = []
+        self._row_indices = {}
+        self._senses = []
+        self._b = []
+        self._triplets = []
+
+    @classmethod
+    def from_arrays(
+        cls,
+        A: np.ndarray | DenseMatrix | SparseMatrix,
+        b: np.ndarray,
+        c: np.ndarray,
+        senses: EquationKind | str | Iterable[EquationKind | str],
+        variable_names: Iterable[str] | None = None,
+        row_names: Iterable[str] | None = None,
+    ) -> ProgramBuilder:
+        """Creates a builder holding a whole program.
+
+        Args:
+            A (numpy.ndarray | DenseMatrix | SparseMatrix): Constraint
+                matrix of shape (m, n).
+            b (numpy.ndarray): Right-hand side vector of length m.
+            c (numpy.ndarray): Objective coefficients of length n.
+            senses (EquationKind | str | Iterable[EquationKind | str]):
+                Relationship of every row, or of all rows.
+            variable_names (Iterable[str], optional): Name of every
+                column. Defaults to `x_0`, `x_1`, ...
+            row_names (Iterable[str], optional): Name of every row.
+                Defaults to `r_0`, `r_1`, ...
+
+        Raises:
+            ValueError: The shapes do not match or a name is repeated.
+
+        Returns:
+            ProgramBuilder: The builder.
+        """
+        builder = cls()
+
+        c = np.asarray(c, dtype=float).reshape(-1)
+        builder.add_variables(c.shape[0], variable_names, c)
+        builder.add_constraints(A, senses, b, row_names)
+
+        return builder
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Gets the number of rows and columns added so far.
+
+        Returns:
+            tuple[int, int]: The number of rows and columns.
+        """
+        return len(self._row_names), len(self._variable_names)
+
+    def add_variables(
+        self,
+        count: int | None = None,
+        names: Iterable[str] | None = None,
+        objective: float | np.ndarray = 0.0,
+    ) -> np.ndarray:
+        """Adds a block of variables.
+
+        Args:
+            count (int, optional): Number of variables. Defaults to the
+                number of names.
+            names (Iterable[str], optional): Name of every variable.
+                Defaults to the prefix followed by the column index.
+            objective (float | numpy.ndarray, optional): Objective
+                coefficient of every variable, or of all of them.
+                Defaults to 0.0.
+
+        Raises:
+            ValueError: The count does not match the names or a name
+                already exists.
+
+        Returns:
+            numpy.ndarray: The column indices of the variables.
+        """
+        start = len(self._variable_names)
+
+        if names is None:
+            if count is None:
+                raise ValueError("Either the count or the names must be given")
+
+            names = [f"{self.variable_prefix}{start + j}" for j in range(count)]
+        else:
+            names = [str(name) for name in names]
+
+            if count is not None and count != len(names):
+                raise ValueError(f"Expected {count} variable names, got {len(names)}")
+
+        objective = np.broadcast_to(
+            np.asarray(objective, dtype=float), (len(names),)
+        )
+
+        self._register(names, self._variable_names, self._variable_indices, "Column")
+        self._c = np.concatenate((self._c, objective))
+
+        return np.arange(start, len(self._variable_names))
+
+    def add_constraints(
+        self,
+        A: np.ndarray | DenseMatrix | SparseMatrix,
+        senses: EquationKind | str | Iterable[EquationKind | str],
+        b: float | np.ndarray,
+        names: Iterable[str] | None = None,
+        columns: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Adds a block of constraints `A x[columns] (<=, =, >=) b`.
+
+        Args:
+            A (numpy.ndarray | DenseMatrix | SparseMatrix): Coefficients
+                of shape (k, len(columns)). A vector is a single row.
+            senses (EquationKind | str | Iterable[EquationKind | str]):
+                Relationship of every row, or of all rows.
+            b (float | numpy.ndarray): Right-hand side of every row, or
+                of all rows.
+            names (Iterable[str], optional): Name of every row. Defaults
+                to the prefix followed by the row index.
+            columns (numpy.ndarray, optional): Variable of every column
+                of A, by index or name. Defaults to all variables.
+
+        Raises:
+            ValueError: The shapes do not match, a variable is unknown
+                or a name already exists.
+
+        Returns:
+            numpy.ndarray: The row indices of the constraints.
+        """
+        if not isinstance(A, (DenseMatrix, SparseMatrix)):
+            A = np.asarray(A, dtype=float)
+            A = DenseMatrix(A.reshape(1, -1) if A.ndim == 1 else A)
+
+        k, width = A.shape
+        columns = self._column_indices(columns)
+
+        if width != columns.shape[0]:
+            raise ValueError(
+                f"Expected {columns.shape[0]} coefficients per row, got {width}"
+            )
+
+        senses = self._senses_of(senses, k)
+        b = np.broadcast_to(np.asarray(b, dtype=float), (k,)).copy()
+
+        start = len(self._row_names)
+        if names is None:
+            names = [f"{self.row_prefix}{start + i}" for i in range(k)]
+        else:
+            names = [str(name) for name in names]
+
+            if len(names) != k:
+                raise ValueError(f"Expected {k} row names, got {len(names)}")
+
+        self._register(names, self._row_names, self._row_indices, "Row")
+
+        rows, cols, values = (np.asarray(array) for array in A.to_coo())
+        self._triplets.append((rows + start, columns[cols], values.astype(float)))
+        self._senses.extend(senses)
+        self._b.append(b)
+
+        return np.arange(start, start + k)
+
+    def set_objective(
+        self, values: float | np.ndarray, columns: np.ndarray | None = None
+    ) -> None:
+        """Sets objective coefficients.
+
+        Args:
+            values (float | numpy.ndarray): The new coefficients, or one
+                for all given variables.
+            columns (numpy.ndarray, optional): The variables, by index or
+                name. Defaults to all variables.
+
+        Raises:
+            ValueError: A variable is unknown.
+        """
+        columns = self._column_indices(columns)
+
+        self._c[columns] = np.broadcast_to(
+            np.asarray(values, dtype=float), columns.shape
+        )
+
+    def build(self, sparse: bool = True) -> LinearProgram:
+        """Assembles the blocks into a LinearProgram.
+
+        Args:
+            sparse (bool, optional): Store the constraint matrix in
+                compressed sparse form. Defaults to True.
+
+        Returns:
+            LinearProgram: The assembled program.
+        """
+        shape = self.shape
+
+        if self._triplets:
+            rows, cols, values = (np.concatenate(arrays) for arrays in zip(*self._triplets))
+        else:
+            rows = cols = np.zeros(0, dtype=np.int64)
+            values = np.zeros(0)
+
+        A = SparseMatrix.from_coo(rows, cols, values, shape)
+        if not sparse:
+            A = DenseMatrix(A.to_dense())
+
+        return LinearProgram(
+            A,
+            np.concatenate(self._b) if self._b else np.zeros(0),
+            self._c.copy(),
+            tuple(self._senses),
+            tuple(self._variable_names),
+            tuple(self._row_names),
+        )
+
+    def solve(self, sparse: bool = True, **options) -> SimplexResult:
+        """Builds the program and solves it with the two-phase method.
+
+        Args:
+            sparse (bool, optional): Store the constraint matrix in
+                compressed sparse form. Defaults to True.
+            **options: Options passed through to TwoPhaseSimplex.
+
+        Returns:
+            SimplexResult: The outcome of the solve, with the values of
+                the variables only.
+        """
+        form = self.build(sparse).standard_form()
+
+        result = TwoPhaseSimplex(form.A, form.b, form.c, **options).solve()
+        result.x = result.x[: form.num_structural]
+
+        return result
+
+    def _column_indices(self, columns: np.ndarray | None) -> np.ndarray:
+        """Resolves variables given by index or name.
+
+        Args:
+            columns (numpy.ndarray | None): The variables, None for all.
+
+        Raises:
+            ValueError: A variable is unknown.
+
+        Returns:
+            numpy.ndarray: The column indices.
+        """
+        n = len(self._variable_names)
+
+        if columns is None:
+            return np.arange(n)
+
+        columns = np.asarray(columns).reshape(-1)
+
+        if columns.dtype.kind in "US" or columns.dtype == object:
+            try:
+                return np.array(
+                    [self._variable_indices[str(name)] for name in columns],
+                    dtype=np.int64,
+                )
+            except KeyError as error:
+                raise ValueError(f"Column {error.args[0]} does not exist") from None
+
+        columns = columns.astype(np.int64)
+        if columns.shape[0] and (columns.min() < 0 or columns.max() >= n):
+            raise ValueError(f"Column indices must be in [0, {n})")
+
+        return columns
+
+    @staticmethod
+    def _senses_of(
+        senses: EquationKind | str | Iterable[EquationKind | str], count: int
+    ) -> list[EquationKind]:
+        """Resolves the relationships of a block of rows.
+
+        Args:
+            senses (EquationKind | str | Iterable[EquationKind | str]):
+                Relationship of every row, or of all rows.
+            count (int): Number of rows.
+
+        Raises:
+            ValueError: The number of relationships does not match.
+
+        Returns:
+            list[EquationKind]: Relationship of every row.
+        """
+        if isinstance(senses, str):
+            return [EquationKind(senses)] * count
+
+        senses = [EquationKind(sense) for sense in senses]
+        if len(senses) != count:
+            raise ValueError(f"Expected {count} senses, got {len(senses)}")
+
+        return senses
+
+    @staticmethod
+    def _register(
+        names: list[str], existing: list[str], indices: dict[str, int], label: str
+    ) -> None:
+        """Appends new unique names.
+
+        Args:
+            names (list[str]): The new names.
+            existing (list[str]): The names so far.
+            indices (dict[str, int]): Index of every name so far.
+            label (str): Kind of the names, for the error message.
+
+        Raises:
+            ValueError: A name already exists or is repeated.
+        """
+        additions = {}
+        for name in names:
+            if name in indices or name in additions:
+                raise ValueError(f"{label} {name} already exists")
+
+            additions[name] = len(existing) + len(additions)
+
+        indices.update(additions)
+        existing.extend(names)
+
+
+__all__ = ("ProgramBuilder",)
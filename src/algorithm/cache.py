@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+import numpy as np
+
+from algorithm.problem import LinearProgram
+from algorithm.revised import SimplexResult, SimplexStatus
+from ast_parser.parser import EquationKind
+
+
+@dataclass
+class CanonicalForm:
+    """Fingerprint of a LinearProgram that does not depend on the order
+    of its rows and columns, on the scale of its rows, or on writing a
+    `>=` row as a `<=` one, together with the maps between the program
+    and its canonical form."""
+
+    key: str
+    """Hash of the canonical program."""
+    variable_names: tuple[str, ...]
+    """Name of every column of the program."""
+    row_positions: np.ndarray
+    """Canonical position of every row of the program."""
+    row_factors: np.ndarray
+    """Factor every row of the program has been multiplied by."""
+
+    @classmethod
+    def of(cls, program: LinearProgram, decimals: int = 12) -> CanonicalForm:
+        """Computes the canonical form of a program.
+
+        Every row is divided by its largest coefficient, or the
+        magnitude of its bound if it is empty, and negated if
+        it is a `>=` row, or an equality whose first coefficient, by
+        column name, is negative. The rows are then sorted.
+
+        Args:
+            program (LinearProgram): The program.
+            decimals (int, optional): Number of decimals the normalized
+                coefficients are rounded to. Defaults to 12.
+
+        Returns:
+            CanonicalForm: The canonical form of the program.
+        """
+        names = program.variable_names
+        m = program.shape[0]
+
+        # Columns are ordered by name, so that a row lists its entries
+        # in the same order whatever the column order of the program.
+        rank = np.empty(len(names), dtype=np.int64)
+        rank[np.argsort(np.array(names, dtype=object), kind="stable")] = np.arange(
+            len(names)
+        )
+
+        rows, cols, values = (np.asarray(array) for array in program.A.to_coo())
+        order = np.lexsort((rank[cols], rows))
+        rows, cols, values = rows[order], cols[order], values[order]
+        starts = np.searchsorted(rows, np.arange(m + 1))
+
+        factors = np.ones(m)
+        canonical_rows = []
+
+        for i in range(m):
+            entries = slice(starts[i], starts[i + 1])
+            kind = program.senses[i]
+
+            factor = 1.0
+            if starts[i + 1] > starts[i]:
+                factor = 1.0 / np.abs(values[entries]).max()
+            elif program.b[i] != 0.0:
+                factor = 1.0 / abs(program.b[i])
+            if kind == EquationKind.GEQ or (
+                kind == EquationKind.EQ
+                and starts[i + 1] > starts[i]
+                and values[starts[i]] < 0.0
+            ):
+                factor = -factor
+
+            if kind != EquationKind.EQ:
+                kind = EquationKind.LEQ
+
+            factors[i] = factor
+            canonical_rows.append(
+                [
+                    kind.value,
+                    [names[j] for j in cols[entries]],
+                    np.round(values[entries] * factor, decimals).tolist(),
+                    # Adding zero turns -0.0 into 0.0.
+                    round(float(program.b[i] * factor), decimals) + 0.0,
+                ]
+            )
+
+        serialized = [json.dumps(row) for row in canonical_rows]
+        order = sorted(range(m), key=serialized.__getitem__)
+
+        positions = np.empty(m, dtype=np.int64)
+        positions[order] = np.arange(m)
+
+        objective = sorted(
+            (name, round(float(value), decimals) + 0.0)
+            for name, value in zip(names, program.c)
+        )
+        digest = hashlib.sha256(
+            json.dumps([objective, [serialized[i] for i in order]]).encode()
+        )
+
+        return cls(digest.hexdigest(), tuple(names), positions, factors)
+
+    def to_canonical(self, result: SimplexResult) -> CachedResult:
+        """Maps the result of the program to its canonical form.
+
+        Args:
+            result (SimplexResult): Outcome of solving the program.
+
+        Returns:
+            CachedResult: The outcome in canonical form.
+        """
+        duals = np.empty(self.row_positions.shape[0])
+        duals[self.row_positions] = np.asarray(result.duals) / self.row_factors
+
+        return CachedResult(
+            result.status,
+            result.objective,
+            dict(zip(self.variable_names, np.asarray(result.x).tolist())),
+            duals,
+            result.iterations,
+        )
+
+    def from_canonical(self, cached: CachedResult) -> SimplexResult:
+        """Maps a result in canonical form back to the program.
+
+        Args:
+            cached (CachedResult): The outcome in canonical form.
+
+        Returns:
+            SimplexResult: The outcome of the program. The basis is not
+                cached and left empty.
+        """
+        return SimplexResult(
+            cached.status,
+            np.array([cached.values[name] for name in self.variable_names]),
+            cached.objective,
+            np.zeros(0, dtype=np.int64),
+            cached.duals[self.row_positions] * self.row_factors,
+            cached.iterations,
+        )
+
+
+@dataclass
+class CachedResult:
+    """Outcome of a solve in canonical form."""
+
+    status: SimplexStatus
+    """Termination status of the engine."""
+    objective: float
+    """Value of the objective function."""
+    values: dict[str, float]
+    """Values of the columns. The names are the keys."""
+    duals: np.ndarray
+    """Simplex multipliers of the canonical rows."""
+    iterations: int
+    """Number of pivots performed."""
+
+
+class ResultCache:
+    """Cache of solve results keyed by the CanonicalForm of the program,
+    so resubmitting a program with reordered rows or columns hits it.
+
+    Entries expire after a time to live and the least recently used
+    entry is evicted once the cache is full. Concurrent callers asking
+    for a program whose solve is running wait for that solve instead of
+    starting another one. The cache is thread-safe.
+
+    Args:
+        max_entries (int, optional): Largest number of cached results.
+            Defaults to 1024.
+        ttl (float, optional): Seconds a result stays valid. Defaults
+            to 300.0.
+    """
+
+    max_entries: int
+    """Largest number of cached results."""
+    ttl: float
+    """Seconds a result stays valid."""
+
+    hits: int
+    """Number of results served from the cache or a running solve."""
+    misses: int
+    """Number of solves started."""
+
+    _entries: OrderedDict[str, tuple[float, CachedResult]]
+    """Cached results with their expiry times, least recently used
+    first."""
+    _in_flight: dict[str, Future]
+    """Futures of the running solves."""
+    _lock: threading.Lock
+    """Guards the entries and the running solves."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 300.0) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Gets the number of cached results, expired ones included.
+
+        Returns:
+            int: The number of cached results.
+        """
+        return len(self._entries)
+
+    def solve(
+        self,
+        program: LinearProgram,
+        solver: Callable[[LinearProgram], SimplexResult],
+    ) -> SimplexResult:
+        """Gets the result of a program, solving it on a miss.
+
+        Args:
+            program (LinearProgram): The program.
+            solver (Callable[[LinearProgram], SimplexResult]): Solves
+                the program on a miss.
+
+        Returns:
+            SimplexResult: The outcome of the program.
+        """
+        form = CanonicalForm.of(program)
+        future, owner = self._claim(form.key)
+
+        if owner:
+            self._complete(form, future, lambda: solver(program))
+
+        return form.from_canonical(future.result())
+
+    async def solve_async(
+        self,
+        program: LinearProgram,
+        solver: Callable[[LinearProgram], Awaitable[SimplexResult]],
+    ) -> SimplexResult:
+        """Gets the result of a program, solving it on a miss, without
+        blocking the event loop.
+
+        Args:
+            program (LinearProgram): The program.
+            solver (Callable[[LinearProgram], Awaitable[SimplexResult]]):
+                Solves the program on a miss.
+
+        Returns:
+            SimplexResult: The outcome of the program.
+        """
+        form = CanonicalForm.of(program)
+        future, owner = self._claim(form.key)
+
+        if owner:
+            try:
+                result = await solver(program)
+            except BaseException as error:
+                self._complete(form, future, None, error)
+                raise
+
+            self._complete(form, future, lambda: result)
+
+        return form.from_canonical(await asyncio.wrap_future(future))
+
+    def clear(self) -> None:
+        """Removes all cached results."""
+        with self._lock:
+            self._entries.clear()
+
+    def _claim(self, key: str) -> tuple[Future, bool]:
+        """Looks a program up.
+
+        Args:
+            key (str): Key of the program.
+
+        Returns:
+            tuple[Future, bool]: The future of the result, and whether
+                the caller has to solve the program and complete it.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expiry, cached = entry
+                if expiry > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+
+                    future = Future()
+                    future.set_result(cached)
+
+                    return future, False
+
+                del self._entries[key]
+
+            if key in self._in_flight:
+                self.hits += 1
+
+                return self._in_flight[key], False
+
+            self.misses += 1
+
+            future = Future()
+            self._in_flight[key] = future
+
+            return future, True
+
+    def _complete(
+        self,
+        form: CanonicalForm,
+        future: Future,
+        solve: Callable[[], SimplexResult] | None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Runs a claimed solve, caches its result and wakes the waiting
+        callers.
+
+        Args:
+            form (CanonicalForm): Canonical form of the program.
+            future (Future): The claimed future.
+            solve (Callable[[], SimplexResult] | None): Produces the
+                result, None if the solve failed.
+            error (BaseException, optional): The failure of the solve.
+        """
+        if solve is not None:
+            try:
+                cached = form.to_canonical(solve())
+            except BaseException as failure:
+                error = failure
+
+        with self._lock:
+            del self._in_flight[form.key]
+
+            if error is None:
+                self._entries[form.key] = (time.monotonic() + self.ttl, cached)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(cached)
+
+
+__all__ = ("CanonicalForm", "CachedResult", "ResultCache")
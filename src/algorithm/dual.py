@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import time
+from enum import Enum
+
+import numpy as np
+
+from algorithm.errors import SolverException
+from algorithm.events import PivotCallback
+from algorithm.matrix import DenseMatrix, SparseMatrix
+from algorithm.pricing import PricingStrategy
+from algorithm.ratio import (
+    RatioTest,
+    RatioTestResult,
+    harris_ratio_test,
+    textbook_ratio_test,
+)
+from algorithm.revised import RevisedSimplex, SimplexResult, SimplexStatus
+
+
+class DualPricing(str, Enum):
+    """Rule for choosing the leaving row of the dual simplex."""
+
+    DANTZIG = "dantzig"
+    """Most infeasible basic variable."""
+    STEEPEST_EDGE = "steepest edge"
+    """Dual steepest edge, infeasibility scaled by the row norms of the
+    basis inverse."""
+
+
+class DualSimplex(RevisedSimplex):
+    """Dual revised simplex method for `max c x, A x = b, x >= 0`.
+
+    The engine starts from a dual feasible basis, i.e. one with
+    non-negative reduced costs, whose basic variables may be negative.
+    This is the state left behind by an optimal basis after the right
+    hand side has been changed or a constraint has been added, and the
+    dual simplex usually restores feasibility in a few pivots.
+
+    Args:
+        A (numpy.ndarray | DenseMatrix | SparseMatrix): Constraint
+            matrix of shape (m, n), dense or sparse.
+        b (numpy.ndarray): Right-hand side vector of length m.
+        c (numpy.ndarray): Objective coefficients of length n.
+        basis (numpy.ndarray, optional): Indices of the starting basic
+            columns. Must be dual feasible. Defaults to the last m
+            columns, i.e. the slack basis.
+        refactorization_frequency (int, optional): Number of pivots
+            between two fresh factorizations. Defaults to 64.
+        tolerance (float, optional): Feasibility and pivot tolerance.
+            Defaults to 1e-9.
+        max_iterations (int, optional): Maximum number of pivots.
+            Defaults to a limit proportional to the problem size.
+        ratio_test (RatioTest, optional): Rule for choosing the entering
+            variable. Defaults to RatioTest.HARRIS.
+        pricing (PricingStrategy, optional): Primal pricing strategy
+            kept in sync with the basis. Defaults to DantzigPricing.
+        dual_pricing (DualPricing, optional): Rule for choosing the
+            leaving row. Defaults to DualPricing.STEEPEST_EDGE.
+        callback (PivotCallback, optional): Called with a PivotEvent
+            after every pivot, e.g. a PivotTrace. Defaults to None.
+    """
+
+    dual_pricing: DualPricing
+    """Rule for choosing the leaving row."""
+
+    _weights: np.ndarray
+    """Dual steepest-edge weights of the basis positions."""
+
+    def __init__(
+        self,
+        A: np.ndarray | DenseMatrix | SparseMatrix,
+        b: np.ndarray,
+        c: np.ndarray,
+        basis: np.ndarray | None = None,
+        refactorization_frequency: int = 64,
+        tolerance: float = 1e-9,
+        max_iterations: int | None = None,
+        ratio_test: RatioTest = RatioTest.HARRIS,
+        pricing: PricingStrategy | None = None,
+        dual_pricing: DualPricing = DualPricing.STEEPEST_EDGE,
+        callback: PivotCallback | None = None,
+    ) -> None:
+        super().__init__(
+            A,
+            b,
+            c,
+            basis,
+            refactorization_frequency,
+            tolerance,
+            max_iterations,
+            ratio_test,
+            pricing,
+            callback,
+        )
+
+        self.dual_pricing = DualPricing(dual_pricing)
+
+        # Exact for the slack basis, a reference framework otherwise.
+        self._weights = np.ones(self._basis.shape[0])
+
+    def solve(self) -> SimplexResult:
+        """Runs the dual pivot loop until optimality, infeasibility or
+        the iteration limit.
+
+        Raises:
+            SolverException: The starting basis is not dual feasible.
+
+        Returns:
+            SimplexResult: The outcome of the solve.
+        """
+        iterations = 0
+        callback = self.callback
+
+        self.pricing.initialize(self._A, self._basis)
+
+        if not self.dual_feasible:
+            raise SolverException("Starting basis is not dual feasible")
+
+        while iterations < self.max_iterations:
+            if callback is not None:
+                start = time.perf_counter()
+
+            leaving = self._price_row()
+            if leaving is None:
+                return self._result(SimplexStatus.OPTIMAL, iterations)
+
+            unit = np.zeros(self._basis.shape[0])
+            unit[leaving] = 1.0
+
+            rho = self._factorization.btran(unit)
+            pivot_row = self._A.rmatvec(rho)
+            pivot_row[self._basis] = 0.0
+
+            reduced_costs = self._reduced_costs()
+
+            ratio = self._dual_ratio_test(pivot_row, reduced_costs)
+            if ratio.row is None:
+                return self._result(SimplexStatus.INFEASIBLE, iterations)
+
+            entering = ratio.row
+            alpha = self._factorization.ftran(self._A.column(entering))
+
+            if self.dual_pricing == DualPricing.STEEPEST_EDGE:
+                self._update_weights(leaving, alpha, rho)
+
+            step = self._x_B[leaving] / alpha[leaving]
+
+            if callback is not None:
+                # The pivot updates alpha and the basis in place.
+                leaving_column = int(self._basis[leaving])
+                pivot = float(alpha[leaving])
+                dual_infeasibility = max(0.0, -float(reduced_costs.min()))
+
+            self._pivot(entering, leaving, alpha, step)
+
+            iterations += 1
+
+            if callback is not None:
+                callback(
+                    self._event(
+                        iterations,
+                        entering,
+                        leaving_column,
+                        leaving,
+                        pivot,
+                        step,
+                        dual_infeasibility,
+                        start,
+                    )
+                )
+
+        return self._result(SimplexStatus.ITERATION_LIMIT, iterations)
+
+    def _price_row(self) -> int | None:
+        """Chooses the leaving row by the configured dual pricing rule.
+
+        Returns:
+            int | None: Position of the leaving column in the basis, or
+                None if the basis is primal feasible.
+        """
+        infeasibilities = np.minimum(self._x_B + self.tolerance, 0.0)
+
+        if self.dual_pricing == DualPricing.STEEPEST_EDGE:
+            scores = infeasibilities**2 / self._weights
+        else:
+            scores = np.abs(infeasibilities)
+
+        leaving = int(np.argmax(scores))
+
+        return leaving if scores[leaving] > 0.0 else None
+
+    def _dual_ratio_test(
+        self, pivot_row: np.ndarray, reduced_costs: np.ndarray
+    ) -> RatioTestResult:
+        """Chooses the entering column by the ratio test over the
+        reduced costs.
+
+        Args:
+            pivot_row (numpy.ndarray): The leaving row of `B^-1 A`,
+                zero for the basic columns.
+            reduced_costs (numpy.ndarray): The reduced costs of the
+                basis.
+
+        Returns:
+            RatioTestResult: The entering column as `row`, the dual
+                step and the ties.
+        """
+        if self.ratio_test == RatioTest.HARRIS:
+            return harris_ratio_test(
+                reduced_costs, -pivot_row, self.tolerance, self.tolerance
+            )
+
+        return textbook_ratio_test(reduced_costs, -pivot_row, self.tolerance)
+
+    def _update_weights(self, leaving: int, alpha: np.ndarray, rho: np.ndarray) -> None:
+        """Updates the dual steepest-edge weights for a pivot.
+
+        Args:
+            leaving (int): Position of the leaving column in the basis.
+            alpha (numpy.ndarray): The entering column transformed by
+                the basis.
+            rho (numpy.ndarray): The leaving row of the basis inverse.
+        """
+        tau = self._factorization.ftran(rho)
+        ratios = alpha / alpha[leaving]
+        weight = self._weights[leaving]
+
+        self._weights = np.maximum(
+            self._weights - 2.0 * ratios * tau + ratios**2 * weight,
+            self.tolerance,
+        )
+        self._weights[leaving] = max(weight / alpha[leaving] ** 2, self.tolerance)
+
+
+__all__ = ("DualPricing", "DualSimplex")
@@ -0,0 +1,48 @@
+class SolverException(Exception):
+    """Base class for exceptions raised by the simplex engines.
+
+    Args:
+        description (str, optional): An optional description of the
+            error.
+    """
+
+    def __init__(self, description: str | None = None) -> None:
+        super().__init__(description)
+
+
+class SingularBasisException(SolverException):
+    """A SingularBasisException is raised when the basis matrix cannot
+    be factorized because it is (numerically) singular.
+
+    Args:
+        description (str, optional): An optional description of the
+            error.
+    """
+
+
+class UnboundedException(SolverException):
+    """An UnboundedException is raised when the objective function can
+    be increased without limit over the feasible region.
+
+    Args:
+        description (str, optional): An optional description of the
+            error.
+    """
+
+
+class InfeasibleException(SolverException):
+    """An InfeasibleException is raised when the constraints have no
+    feasible solution.
+
+    Args:
+        description (str, optional): An optional description of the
+            error.
+    """
+
+
+__all__ = (
+    "SolverException",
+    "SingularBasisException",
+    "UnboundedException",
+    "InfeasibleException",
+)
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Callable
+
+import numpy as np
+
+
+@dataclass
+class PivotEvent:
+    """State of a simplex engine right after a pivot."""
+
+    iteration: int
+    """Number of pivots performed so far, this one included."""
+    phase: int
+    """Phase of a TwoPhaseSimplex solve, 1 or 2, 0 for an engine run on
+    its own."""
+    entering: int
+    """Index of the entering column."""
+    leaving: int
+    """Index of the leaving column."""
+    row: int
+    """Position of the exchange in the basis."""
+    objective: float
+    """Objective value of the new basis, of the program the engine
+    runs on."""
+    primal_infeasibility: float
+    """Largest negative part of the basic variables of the new basis."""
+    dual_infeasibility: float
+    """Largest negative part of the reduced costs of all columns, at the
+    basis the pivot started from."""
+    pivot: float
+    """Pivot element, the entry of the transformed entering column in
+    the leaving row."""
+    step: float
+    """Step length of the entering variable, zero for a degenerate
+    pivot."""
+    elapsed: float
+    """Duration of the iteration, in seconds."""
+
+
+PivotCallback = Callable[[PivotEvent], None]
+"""Function called by the engines after every pivot."""
+
+
+_DTYPE = np.dtype(
+    [
+        (field.name, np.int64 if field.type == "int" else np.float64)
+        for field in fields(PivotEvent)
+    ]
+)
+"""Record of a PivotEvent in a PivotTrace."""
+
+
+class PivotTrace:
+    """Ring buffer of the last pivots of a solve, to be passed as the
+    callback of an engine.
+
+    The events are copied into a preallocated record array, so tracing
+    a long solve takes constant memory and allocates nothing per pivot
+    beyond the event itself.
+
+    Args:
+        capacity (int, optional): Number of pivots kept. Defaults to
+            1024.
+        tolerance (float, optional): Largest step of a pivot counted as
+            degenerate. Defaults to 1e-12.
+    """
+
+    capacity: int
+    """Number of pivots kept."""
+    tolerance: float
+    """Largest step of a degenerate pivot."""
+    count: int
+    """Number of pivots seen."""
+    degenerate: int
+    """Number of degenerate pivots seen."""
+
+    _records: np.ndarray
+    """The records, the oldest one at `count % capacity` once full."""
+
+    def __init__(self, capacity: int = 1024, tolerance: float = 1e-12) -> None:
+        if capacity < 1:
+            raise ValueError("Capacity must be positive")
+
+        self.capacity = capacity
+        self.tolerance = tolerance
+        self.count = 0
+        self.degenerate = 0
+
+        self._records = np.zeros(capacity, dtype=_DTYPE)
+
+    def __call__(self, event: PivotEvent) -> None:
+        """Records a pivot.
+
+        Args:
+            event (PivotEvent): The pivot.
+        """
+        self._records[self.count % self.capacity] = (
+            event.iteration,
+            event.phase,
+            event.entering,
+            event.leaving,
+            event.row,
+            event.objective,
+            event.primal_infeasibility,
+            event.dual_infeasibility,
+            event.pivot,
+            event.step,
+            event.elapsed,
+        )
+
+        self.count += 1
+        if event.step <= self.tolerance:
+            self.degenerate += 1
+
+    def __len__(self) -> int:
+        """Gets the number of pivots kept.
+
+        Returns:
+            int: The number of pivots kept.
+        """
+        return min(self.count, self.capacity)
+
+    @property
+    def records(self) -> np.ndarray:
+        """Gets the pivots kept, oldest first.
+
+        Returns:
+            numpy.ndarray: Record array with a field per attribute of
+                PivotEvent.
+        """
+        if self.count <= self.capacity:
+            return self._records[: self.count].copy()
+
+        start = self.count % self.capacity
+
+        return np.concatenate((self._records[start:], self._records[:start]))
+
+    def events(self) -> list[PivotEvent]:
+        """Gets the pivots kept, oldest first.
+
+        Returns:
+            list[PivotEvent]: The pivots.
+        """
+        return [PivotEvent(*record) for record in self.records.tolist()]
+
+    def stalled(self, window: int = 50, tolerance: float = 1e-9) -> bool:
+        """Checks whether the objective has stopped improving.
+
+        Args:
+            window (int, optional): Number of last pivots looked at.
+                Defaults to 50.
+            tolerance (float, optional): Smallest relative improvement.
+                Defaults to 1e-9.
+
+        Returns:
+            bool: True if the last pivots of the same phase, at least
+                window of them, improved the objective by less than the
+                tolerance.
+        """
+        records = self.records[-window - 1 :]
+        if records.shape[0] <= window:
+            return False
+
+        records = records[records["phase"] == records["phase"][-1]]
+        if records.shape[0] <= window:
+            return False
+
+        objective = records["objective"]
+
+        return bool(
+            objective[-1] - objective[0] <= tolerance * max(1.0, abs(objective[0]))
+        )
+
+    def clear(self) -> None:
+        """Forgets the pivots seen."""
+        self.count = 0
+        self.degenerate = 0
+
+
+__all__ = ("PivotEvent", "PivotCallback", "PivotTrace")
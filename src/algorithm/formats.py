@@ -0,0 +1,1300 @@
+from __future__ import annotations
+
+import math
+import re
+from array import array
+from contextlib import contextmanager, nullcontext
+from os import PathLike
+from typing import Iterator, TextIO
+
+import numpy as np
+
+from algorithm.builder import ProgramBuilder
+from algorithm.matrix import SparseMatrix
+from algorithm.problem import LinearProgram
+from ast_parser.coo import SymbolTable
+from ast_parser.parser import EquationKind
+
+_CHUNK_SIZE = 1 << 20
+"""Number of characters of the lines read at a time."""
+
+_SENSES = {"L": EquationKind.LEQ, "G": EquationKind.GEQ, "E": EquationKind.EQ}
+"""Relationship of every MPS row type."""
+_MPS_TYPES = {kind: code for code, kind in _SENSES.items()}
+"""MPS row type of every relationship."""
+_LP_RELATIONS = {
+    "<": EquationKind.LEQ,
+    "<=": EquationKind.LEQ,
+    "=<": EquationKind.LEQ,
+    ">": EquationKind.GEQ,
+    ">=": EquationKind.GEQ,
+    "=>": EquationKind.GEQ,
+    "=": EquationKind.EQ,
+}
+"""Relationship of every LP relational operator."""
+
+_SPACE = re.compile(r"\s")
+"""Pattern of a character not allowed in an MPS name."""
+_FIXED_FIELDS = ((1, 3), (4, 12), (14, 22), (24, 36), (39, 47), (49, 61))
+"""Character ranges of the six fields of a fixed MPS line."""
+
+_LP_NAME = r"[A-Za-z_!\"#$%&()/,;?@`'{}|~][\w!\"#$%&()/,.;?@`'{}|~]*"
+"""Pattern of an LP name."""
+_LP_TOKEN = re.compile(
+    rf"""
+    (?P<number>(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][-+]?[0-9]+)?)
+    | (?P<relation><=|>=|=<|=>|<|>|=)
+    | (?P<sign>[-+])
+    | (?P<colon>:)
+    | (?P<name>{_LP_NAME})
+    | (?P<invalid>\S)
+    """,
+    re.VERBOSE,
+)
+"""Pattern of a token of an LP file, whitespace being skipped."""
+_LP_LABEL = re.compile(rf"\s*({_LP_NAME})\s*:")
+"""Pattern of the name of an objective or a constraint."""
+_LP_TERM = re.compile(
+    rf"""
+    \s*([-+]?)
+    \s*((?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][-+]?[0-9]+)?)?
+    # The whole name is matched, and it is not a label.
+    \s*({_LP_NAME})(?![\w!"#$%&()/,.;?@`'{{}}|~]|\s*:)
+    """,
+    re.VERBOSE,
+)
+"""Pattern of a `[sign] [coefficient] variable` term of an LP file."""
+_LP_SECTION = re.compile(
+    r"""
+    \s*(?P<section>
+        maxi[mz]i[sz]e|maximum|max
+        | mini[mz]i[sz]e|minimum|min
+        | subject\s+to|such\s+that|s\.t\.|st
+        | bounds?
+        | generals?|gen|integers?|binar(?:y|ies)|bin
+        | semi-continuous|semis?|sos
+        | end
+    )(?=\s|$)
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+"""Pattern of an LP section keyword at the start of a line."""
+
+
+class _ModelReader:
+    """Collects the rows, columns and bounds of a model file and
+    assembles them into a LinearProgram.
+
+    Names are interned as they are read and the coefficients go to
+    typed arrays, so no per-row or per-column objects are kept.
+    """
+
+    _columns: SymbolTable
+    """Name and index of every column."""
+    _c: array
+    """Objective coefficient of every column, as read."""
+    _lower: array
+    """Lower bound of every column."""
+    _upper: array
+    """Upper bound of every column."""
+
+    _row_names: list[str]
+    """Name of every row."""
+    _row_indices: dict[str, int]
+    """Index of every row name."""
+    _senses: list[EquationKind]
+    """Relationship of every row."""
+    _rhs: array
+    """Right-hand side of every row."""
+    _ranges: dict[int, float]
+    """Range of every ranged row."""
+
+    _rows: array
+    """Row of every coefficient."""
+    _cols: array
+    """Column of every coefficient."""
+    _values: array
+    """Value of every coefficient."""
+
+    _maximize: bool
+    """Whether the objective is maximized."""
+
+    def __init__(self) -> None:
+        self._columns = SymbolTable()
+        self._c = array("d")
+        self._lower = array("d")
+        self._upper = array("d")
+
+        self._row_names = []
+        self._row_indices = {}
+        self._senses = []
+        self._rhs = array("d")
+        self._ranges = {}
+
+        self._rows = array("q")
+        self._cols = array("q")
+        self._values = array("d")
+
+        self._maximize = False
+
+    def _column(self, name: str) -> int:
+        """Gets the index of a column, adding it if it is new.
+
+        Args:
+            name (str): Name of the column.
+
+        Returns:
+            int: The index of the column.
+        """
+        j = self._columns.intern(name)
+
+        if j == len(self._c):
+            self._c.append(0.0)
+            self._lower.append(0.0)
+            self._upper.append(math.inf)
+
+        return j
+
+    def _add_row(self, name: str, sense: EquationKind, rhs: float = 0.0) -> int:
+        """Adds a row.
+
+        Args:
+            name (str): Name of the row.
+            sense (EquationKind): Relationship of the row.
+            rhs (float, optional): Right-hand side. Defaults to 0.0.
+
+        Raises:
+            ValueError: The row already exists.
+
+        Returns:
+            int: The index of the row.
+        """
+        if name in self._row_indices:
+            raise ValueError(f"Row {name} already exists")
+
+        i = self._row_indices[name] = len(self._row_names)
+        self._row_names.append(name)
+        self._senses.append(sense)
+        self._rhs.append(rhs)
+
+        return i
+
+    def program(self, sparse: bool = True) -> LinearProgram:
+        """Assembles the model read so far.
+
+        Ranged rows get a second row named `{row}_range`. Finite bounds
+        become the rows `{column}_lower`, `{column}_upper` or
+        `{column}_fixed`, and a column with a negative lower bound is
+        split into itself and `{column}_neg`, its value being their
+        difference.
+
+        Args:
+            sparse (bool, optional): Store the constraint matrix in
+                compressed sparse form. Defaults to True.
+
+        Returns:
+            LinearProgram: The model.
+        """
+        names = self._columns.names
+        n = len(names)
+
+        rows = np.frombuffer(self._rows, dtype=np.int64)
+        cols = np.frombuffer(self._cols, dtype=np.int64)
+        values = np.frombuffer(self._values, dtype=float)
+
+        c = np.frombuffer(self._c, dtype=float)
+        if not self._maximize:
+            c = -c
+
+        lower = np.frombuffer(self._lower, dtype=float)
+        upper = np.frombuffer(self._upper, dtype=float)
+
+        # Columns with a negative lower bound are split in two.
+        split = np.flatnonzero(lower < 0.0)
+        partners = np.full(n, -1, dtype=np.int64)
+        partners[split] = n + np.arange(split.shape[0])
+
+        builder = ProgramBuilder()
+        builder.add_variables(names=names, objective=c)
+        builder.add_variables(
+            names=[f"{names[j]}_neg" for j in split], objective=-c[split]
+        )
+
+        mirrored = partners[cols] >= 0
+        senses, rhs = list(self._senses), np.frombuffer(self._rhs, dtype=float)
+
+        # A ranged equality keeps its right-hand side as the bound on
+        # the side given by the sign of the range, a zero range leaves
+        # it an equality.
+        for i, spread in self._ranges.items():
+            if senses[i] == EquationKind.EQ and spread != 0.0:
+                senses[i] = EquationKind.GEQ if spread > 0 else EquationKind.LEQ
+
+        builder.add_constraints(
+            SparseMatrix.from_coo(
+                np.concatenate((rows, rows[mirrored])),
+                np.concatenate((cols, partners[cols[mirrored]])),
+                np.concatenate((values, -values[mirrored])),
+                (len(self._row_names), n + split.shape[0]),
+            ),
+            senses,
+            rhs,
+            self._row_names,
+        )
+
+        self._add_range_rows(builder, rows, cols, values, partners, mirrored)
+        self._add_bound_rows(builder, lower, upper, partners)
+
+        return builder.build(sparse)
+
+    def _add_range_rows(
+        self,
+        builder: ProgramBuilder,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        values: np.ndarray,
+        partners: np.ndarray,
+        mirrored: np.ndarray,
+    ) -> None:
+        """Adds the second row of every ranged row.
+
+        Args:
+            builder (ProgramBuilder): The program being built.
+            rows (numpy.ndarray): Row of every coefficient.
+            cols (numpy.ndarray): Column of every coefficient.
+            values (numpy.ndarray): Value of every coefficient.
+            partners (numpy.ndarray): Split partner of every column, -1
+                if it is not split.
+            mirrored (numpy.ndarray): Whether the column of every
+                coefficient is split.
+        """
+        # A zero range on an equality adds nothing to it.
+        ranged = np.array(
+            sorted(
+                i
+                for i, spread in self._ranges.items()
+                if spread != 0.0 or self._senses[i] != EquationKind.EQ
+            ),
+            dtype=np.int64,
+        )
+        if ranged.shape[0] == 0:
+            return
+
+        positions = np.full(len(self._row_names), -1, dtype=np.int64)
+        positions[ranged] = np.arange(ranged.shape[0])
+
+        senses, bounds = [], []
+        for i in ranged:
+            sense, rhs, spread = self._senses[i], self._rhs[i], self._ranges[i]
+
+            if sense == EquationKind.LEQ or (sense == EquationKind.EQ and spread < 0):
+                senses.append(EquationKind.GEQ)
+                bounds.append(rhs - abs(spread))
+            else:
+                senses.append(EquationKind.LEQ)
+                bounds.append(rhs + abs(spread))
+
+        selected = positions[rows] >= 0
+        both = selected & mirrored
+
+        builder.add_constraints(
+            SparseMatrix.from_coo(
+                np.concatenate((positions[rows[selected]], positions[rows[both]])),
+                np.concatenate((cols[selected], partners[cols[both]])),
+                np.concatenate((values[selected], -values[both])),
+                (ranged.shape[0], builder.shape[1]),
+            ),
+            senses,
+            np.array(bounds),
+            [f"{self._row_names[i]}_range" for i in ranged],
+        )
+
+    def _add_bound_rows(
+        self,
+        builder: ProgramBuilder,
+        lower: np.ndarray,
+        upper: np.ndarray,
+        partners: np.ndarray,
+    ) -> None:
+        """Adds a row for every finite bound other than `x >= 0`.
+
+        Args:
+            builder (ProgramBuilder): The program being built.
+            lower (numpy.ndarray): Lower bound of every column.
+            upper (numpy.ndarray): Upper bound of every column.
+            partners (numpy.ndarray): Split partner of every column, -1
+                if it is not split.
+        """
+        names = self._columns.names
+
+        fixed = lower == upper
+        bounds = (
+            (np.flatnonzero(fixed), lower, EquationKind.EQ, "fixed"),
+            (
+                np.flatnonzero(~fixed & np.isfinite(lower) & (lower != 0.0)),
+                lower,
+                EquationKind.GEQ,
+                "lower",
+            ),
+            (np.flatnonzero(~fixed & np.isfinite(upper)), upper, EquationKind.LEQ, "upper"),
+        )
+
+        for columns, values, sense, suffix in bounds:
+            if columns.shape[0] == 0:
+                continue
+
+            split = partners[columns] >= 0
+            k = columns.shape[0]
+
+            builder.add_constraints(
+                SparseMatrix.from_coo(
+                    np.concatenate((np.arange(k), np.flatnonzero(split))),
+                    np.concatenate((columns, partners[columns[split]])),
+                    np.concatenate((np.ones(k), -np.ones(int(split.sum())))),
+                    (k, builder.shape[1]),
+                ),
+                sense,
+                values[columns],
+                [f"{names[j]}_{suffix}" for j in columns],
+            )
+
+
+class _MpsReader(_ModelReader):
+    """Reads a model in free or fixed MPS format.
+
+    Args:
+        fixed (bool): Whether the fields are found by position instead
+            of being separated by whitespace.
+    """
+
+    fixed: bool
+    """Whether the fields are found by position."""
+
+    _section: str
+    """Section of the current line."""
+    _objective: str | None
+    """Name of the objective row."""
+    _free_rows: set[str]
+    """Names of the neutral rows after the objective row."""
+    _line: int
+    """Number of the current line."""
+
+    def __init__(self, fixed: bool) -> None:
+        super().__init__()
+
+        self.fixed = fixed
+
+        self._section = ""
+        self._objective = None
+        self._free_rows = set()
+        self._line = 0
+
+    def feed(self, lines: list[str]) -> None:
+        """Reads a chunk of lines.
+
+        Args:
+            lines (list[str]): The lines.
+
+        Raises:
+            ValueError: A line is malformed.
+        """
+        row_indices, rows, cols, values = (
+            self._row_indices,
+            self._rows,
+            self._cols,
+            self._values,
+        )
+        column, j = None, -1
+
+        for line in lines:
+            self._line += 1
+
+            if not line.strip() or line[0] == "*":
+                continue
+
+            try:
+                # The coefficients of a free COLUMNS section are most of
+                # a file, the common `column row value` line is read
+                # here and the column is only interned once in a row.
+                if (
+                    line[0] in " \t"
+                    and self._section == "COLUMNS"
+                    and not self.fixed
+                ):
+                    fields = line.split()
+                    i = row_indices.get(fields[1]) if len(fields) == 3 else None
+
+                    if i is not None:
+                        if fields[0] != column:
+                            column, j = fields[0], self._column(fields[0])
+
+                        values.append(float(fields[2]))
+                        rows.append(i)
+                        cols.append(j)
+                    else:
+                        self._read_data(fields)
+                elif line[0] in " \t":
+                    self._read_data(self._fields(line))
+                else:
+                    self._read_header(line.split())
+            except IndexError:
+                raise ValueError(f"Line {self._line}: Missing field") from None
+            except ValueError as error:
+                raise ValueError(f"Line {self._line}: {error}") from None
+
+    def _fields(self, line: str) -> list[str]:
+        """Splits a data line into fields.
+
+        Args:
+            line (str): The line.
+
+        Returns:
+            list[str]: The fields, the unused ones of a fixed line
+                included as empty strings.
+        """
+        if not self.fixed:
+            return line.split()
+
+        line = line.rstrip("\r\n")
+
+        return [line[start:end].strip() for start, end in _FIXED_FIELDS]
+
+    def _read_header(self, fields: list[str]) -> None:
+        """Reads a section header.
+
+        Args:
+            fields (list[str]): The fields of the line.
+
+        Raises:
+            ValueError: The section is not supported.
+        """
+        section = fields[0].upper()
+
+        if section not in (
+            "NAME",
+            "OBJSENSE",
+            "ROWS",
+            "COLUMNS",
+            "RHS",
+            "RANGES",
+            "BOUNDS",
+            "ENDATA",
+        ):
+            raise ValueError(f"Unsupported section {fields[0]}")
+
+        if section == "OBJSENSE" and len(fields) > 1:
+            self._read_sense(fields[1])
+
+        self._section = section
+
+    def _read_sense(self, sense: str) -> None:
+        """Reads the objective sense.
+
+        Args:
+            sense (str): MAX, MAXIMIZE, MIN or MINIMIZE.
+
+        Raises:
+            ValueError: The sense is unknown.
+        """
+        sense = sense.upper()
+
+        if sense not in ("MAX", "MAXIMIZE", "MIN", "MINIMIZE"):
+            raise ValueError(f"Unknown objective sense {sense}")
+
+        self._maximize = sense.startswith("MAX")
+
+    def _read_data(self, fields: list[str]) -> None:
+        """Reads a data line of the current section.
+
+        Args:
+            fields (list[str]): The fields of the line.
+
+        Raises:
+            ValueError: The line is malformed.
+        """
+        section = self._section
+
+        if section == "COLUMNS":
+            if self.fixed:
+                fields = fields[1:]
+            if len(fields) > 2 and fields[1].strip("'").upper() == "MARKER":
+                return
+
+            j = self._column(fields[0])
+            for k in range(1, len(fields) - 1, 2):
+                if fields[k]:
+                    self._read_coefficient(fields[k], j, float(fields[k + 1]))
+        elif section in ("RHS", "RANGES"):
+            if self.fixed:
+                fields = fields[1:]
+            elif len(fields) % 2 == 0:
+                fields = [""] + fields
+
+            for k in range(1, len(fields) - 1, 2):
+                if fields[k]:
+                    self._read_rhs(section, fields[k], float(fields[k + 1]))
+        elif section == "BOUNDS":
+            self._read_bound(fields)
+        elif section == "ROWS":
+            if self.fixed:
+                fields = fields[:2]
+
+            self._read_row(fields[0].upper(), fields[1])
+        elif section == "OBJSENSE":
+            self._read_sense("".join(fields))
+        else:
+            raise ValueError(f"Unexpected data in section {section or 'NAME'}")
+
+    def _read_row(self, kind: str, name: str) -> None:
+        """Reads a row definition.
+
+        Args:
+            kind (str): N, L, G or E.
+            name (str): Name of the row.
+
+        Raises:
+            ValueError: The row type is unknown.
+        """
+        if kind == "N":
+            if self._objective is None:
+                self._objective = name
+            else:
+                self._free_rows.add(name)
+        elif kind in _SENSES:
+            self._add_row(name, _SENSES[kind])
+        else:
+            raise ValueError(f"Unknown row type {kind}")
+
+    def _read_coefficient(self, row: str, j: int, value: float) -> None:
+        """Reads a coefficient of the COLUMNS section.
+
+        Args:
+            row (str): Name of the row.
+            j (int): Index of the column.
+            value (float): The coefficient.
+
+        Raises:
+            ValueError: The row is unknown.
+        """
+        i = self._row_indices.get(row)
+
+        if i is not None:
+            self._rows.append(i)
+            self._cols.append(j)
+            self._values.append(value)
+        elif row == self._objective:
+            self._c[j] += value
+        elif row not in self._free_rows:
+            raise ValueError(f"Unknown row {row}")
+
+    def _read_rhs(self, section: str, row: str, value: float) -> None:
+        """Reads a right-hand side or a range.
+
+        The right-hand side of the objective row, a constant offset of
+        the objective, is ignored.
+
+        Args:
+            section (str): RHS or RANGES.
+            row (str): Name of the row.
+            value (float): The right-hand side or range.
+
+        Raises:
+            ValueError: The row is unknown.
+        """
+        i = self._row_indices.get(row)
+
+        if i is None:
+            if row == self._objective or row in self._free_rows:
+                return
+
+            raise ValueError(f"Unknown row {row}")
+
+        if section == "RHS":
+            self._rhs[i] = value
+        else:
+            self._ranges[i] = value
+
+    def _read_bound(self, fields: list[str]) -> None:
+        """Reads a bound.
+
+        Args:
+            fields (list[str]): The fields of the line.
+
+        Raises:
+            ValueError: The bound type is unknown.
+        """
+        kind = fields[0].upper()
+        valued = kind in ("UP", "LO", "FX", "LI", "UI")
+
+        if self.fixed:
+            column, value = fields[2], fields[3]
+        elif len(fields) == (4 if valued else 3):
+            column, value = fields[2], fields[3] if valued else ""
+        else:
+            column, value = fields[1], fields[2] if valued else ""
+
+        j = self._column(column)
+        value = float(value) if valued else 0.0
+
+        if kind in ("UP", "UI"):
+            self._upper[j] = value
+        elif kind in ("LO", "LI"):
+            self._lower[j] = value
+        elif kind == "FX":
+            self._lower[j] = self._upper[j] = value
+        elif kind == "FR":
+            self._lower[j], self._upper[j] = -math.inf, math.inf
+        elif kind == "MI":
+            self._lower[j] = -math.inf
+        elif kind == "PL":
+            self._upper[j] = math.inf
+        elif kind == "BV":
+            self._lower[j], self._upper[j] = 0.0, 1.0
+        else:
+            raise ValueError(f"Unknown bound type {kind}")
+
+
+class _LpReader(_ModelReader):
+    """Reads a model in CPLEX LP format.
+
+    Integer and binary declarations are relaxed, binaries keeping their
+    bounds. Constant terms of the objective are ignored.
+    """
+
+    _section: str
+    """Section of the current line, by its canonical keyword."""
+    _line: int
+    """Number of the current line."""
+
+    _name: str | None
+    """Name of the current statement."""
+    _terms: dict[int, float]
+    """Coefficients of the current statement. The columns are the
+    keys."""
+    _constant: float
+    """Sum of the constant terms of the current statement."""
+    _sign: float
+    """Sign of the next term."""
+    _coefficient: float | None
+    """Pending coefficient of the next term."""
+    _relation: EquationKind | None
+    """Relationship of the current constraint, once read."""
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self._section = ""
+        self._line = 0
+
+        self._start_statement()
+
+    def feed(self, lines: list[str]) -> None:
+        """Reads a chunk of lines.
+
+        Args:
+            lines (list[str]): The lines.
+
+        Raises:
+            ValueError: A line is malformed.
+        """
+        for line in lines:
+            self._line += 1
+
+            line = line.split("\\", 1)[0]
+            if not line.strip():
+                continue
+
+            try:
+                self._read_line(line)
+            except ValueError as error:
+                raise ValueError(f"Line {self._line}: {error}") from None
+
+    def finish(self) -> None:
+        """Checks that the last statement is complete.
+
+        Raises:
+            ValueError: A constraint is incomplete.
+        """
+        self._end_section()
+
+    def _read_line(self, line: str) -> None:
+        """Reads a line.
+
+        Args:
+            line (str): The line, without comment.
+
+        Raises:
+            ValueError: The line is malformed.
+        """
+        header = _LP_SECTION.match(line)
+        if header is not None and not line[header.end() :].lstrip().startswith(":"):
+            self._end_section()
+            self._section = self._canonical_section(header.group("section"))
+
+            line = line[header.end() :]
+            if not line.strip():
+                return
+
+        if self._section == "bounds":
+            self._read_bounds(self._tokens(line))
+        elif self._section in ("general", "binary"):
+            for kind, name in self._tokens(line):
+                if kind != "name":
+                    raise ValueError(f"Expected a variable but got {name}")
+
+                j = self._column(name)
+
+                if self._section == "binary":
+                    self._lower[j], self._upper[j] = 0.0, 1.0
+        elif self._section in ("objective", "constraints"):
+            tokens = self._tokens(line[self._read_terms(line) :])
+
+            for k, (kind, value) in enumerate(tokens):
+                if (
+                    kind == "name"
+                    and k + 1 < len(tokens)
+                    and tokens[k + 1][0] == "colon"
+                ):
+                    self._name = value
+                elif kind != "colon":
+                    self._read_token(kind, value)
+        elif self._section == "end":
+            raise ValueError("Unexpected content after End")
+        else:
+            raise ValueError("Expected an objective sense")
+
+    def _read_terms(self, line: str) -> int:
+        """Reads the leading `[sign] [coefficient] variable` terms of a
+        line, the bulk of an expression, without tokenizing them.
+
+        Args:
+            line (str): The line.
+
+        Returns:
+            int: The position of the rest of the line.
+        """
+        label = _LP_LABEL.match(line)
+        if label is not None:
+            self._name = label.group(1)
+
+        position = 0 if label is None else label.end()
+
+        # A pending sign or coefficient is completed by the tokens.
+        if self._relation is not None or self._coefficient is not None or self._sign != 1.0:
+            return position
+
+        terms = self._terms
+        while (term := _LP_TERM.match(line, position)) is not None:
+            sign, coefficient, name = term.groups()
+
+            value = float(coefficient) if coefficient else 1.0
+            j = self._column(name)
+
+            terms[j] = terms.get(j, 0.0) + (-value if sign == "-" else value)
+            position = term.end()
+
+        return position
+
+    def _canonical_section(self, keyword: str) -> str:
+        """Maps a section keyword to its section.
+
+        Args:
+            keyword (str): The keyword.
+
+        Raises:
+            ValueError: The section is not supported.
+
+        Returns:
+            str: objective, constraints, bounds, general, binary or end.
+        """
+        keyword = " ".join(keyword.lower().split())
+
+        if keyword.startswith("max") or keyword.startswith("min"):
+            self._maximize = keyword.startswith("max")
+
+            return "objective"
+        if keyword in ("subject to", "such that", "s.t.", "st"):
+            return "constraints"
+        if keyword.startswith("bound"):
+            return "bounds"
+        if keyword.startswith("gen") or keyword.startswith("integer"):
+            return "general"
+        if keyword.startswith("bin"):
+            return "binary"
+        if keyword == "end":
+            return "end"
+
+        raise ValueError(f"Unsupported section {keyword}")
+
+    def _tokens(self, line: str) -> list[tuple[str, str]]:
+        """Splits a line into tokens.
+
+        Args:
+            line (str): The line.
+
+        Raises:
+            ValueError: The line contains an invalid character.
+
+        Returns:
+            list[tuple[str, str]]: The kind and text of every token.
+        """
+        tokens = [(match.lastgroup, match.group()) for match in _LP_TOKEN.finditer(line)]
+
+        for kind, value in tokens:
+            if kind == "invalid":
+                raise ValueError(f"Invalid character {value!r}")
+
+        return tokens
+
+    def _start_statement(self) -> None:
+        """Resets the current statement."""
+        self._name = None
+        self._terms = {}
+        self._constant = 0.0
+        self._sign = 1.0
+        self._coefficient = None
+        self._relation = None
+
+    def _read_token(self, kind: str, value: str) -> None:
+        """Reads a token of the objective or of a constraint.
+
+        Args:
+            kind (str): Kind of the token.
+            value (str): Text of the token.
+
+        Raises:
+            ValueError: The token is unexpected.
+        """
+        if self._relation is not None:
+            if kind == "sign":
+                self._sign *= -1.0 if value == "-" else 1.0
+            elif kind == "number":
+                self._add_constraint(self._sign * float(value))
+            else:
+                raise ValueError("Expected a constant right-hand side")
+        elif kind == "name":
+            j = self._column(value)
+            coefficient = self._sign * (
+                1.0 if self._coefficient is None else self._coefficient
+            )
+
+            self._terms[j] = self._terms.get(j, 0.0) + coefficient
+            self._sign, self._coefficient = 1.0, None
+        elif kind == "number":
+            if self._coefficient is not None:
+                raise ValueError("Expected a variable after a coefficient")
+
+            self._coefficient = float(value)
+        else:
+            self._flush_constant()
+
+            if kind == "sign":
+                self._sign *= -1.0 if value == "-" else 1.0
+            elif self._section == "constraints":
+                self._relation = _LP_RELATIONS[value]
+                self._sign = 1.0
+            else:
+                raise ValueError("Unexpected relational operator in the objective")
+
+    def _flush_constant(self) -> None:
+        """Moves a pending coefficient without variable to the constant
+        terms."""
+        if self._coefficient is not None:
+            self._constant += self._sign * self._coefficient
+            self._sign, self._coefficient = 1.0, None
+
+    def _add_constraint(self, rhs: float) -> None:
+        """Adds the current constraint.
+
+        Args:
+            rhs (float): The right-hand side.
+
+        Raises:
+            ValueError: The row already exists.
+        """
+        name = self._name or f"R{len(self._row_names) + 1}"
+        i = self._add_row(name, self._relation, rhs - self._constant)
+
+        for j, value in self._terms.items():
+            self._rows.append(i)
+            self._cols.append(j)
+            self._values.append(value)
+
+        self._start_statement()
+
+    def _end_section(self) -> None:
+        """Completes the statement of the section being left.
+
+        Raises:
+            ValueError: A constraint is incomplete.
+        """
+        if self._section == "objective":
+            for j, value in self._terms.items():
+                self._c[j] += value
+        elif self._section == "constraints" and (
+            self._terms or self._relation is not None or self._coefficient is not None
+        ):
+            raise ValueError("Incomplete constraint")
+
+        self._start_statement()
+
+    def _read_bounds(self, tokens: list[tuple[str, str]]) -> None:
+        """Reads a bound: `x free`, `x (<=, >=, =) v`, `v (<=, >=) x`
+        or `l <= x <= u`, a value being a number or (-)inf(inity).
+
+        Args:
+            tokens (list[tuple[str, str]]): The tokens of the line.
+
+        Raises:
+            ValueError: The bound is malformed.
+        """
+        items, sign = [], 1.0
+        for kind, value in tokens:
+            if kind == "sign":
+                sign *= -1.0 if value == "-" else 1.0
+            elif kind == "number" or value.lower() in ("inf", "infinity"):
+                items.append(("value", sign * float(value)))
+                sign = 1.0
+            elif kind in ("name", "relation"):
+                items.append((kind, value))
+
+        if (
+            len(items) == 2
+            and items[0][0] == "name"
+            and items[1][0] == "name"
+            and items[1][1].lower() == "free"
+        ):
+            j = self._column(items[0][1])
+            self._lower[j], self._upper[j] = -math.inf, math.inf
+
+            return
+
+        kinds = [kind for kind, _ in items]
+        if kinds == ["name", "relation", "value"]:
+            bounds = [(items[0][1], items[1][1], items[2][1])]
+        elif kinds == ["value", "relation", "name"]:
+            bounds = [(items[2][1], _mirrored(items[1][1]), items[0][1])]
+        elif kinds == ["value", "relation", "name", "relation", "value"]:
+            bounds = [
+                (items[2][1], _mirrored(items[1][1]), items[0][1]),
+                (items[2][1], items[3][1], items[4][1]),
+            ]
+        else:
+            raise ValueError("Malformed bound")
+
+        for column, relation, value in bounds:
+            j = self._column(column)
+            sense = _LP_RELATIONS[relation]
+
+            if sense != EquationKind.GEQ:
+                self._upper[j] = value
+            if sense != EquationKind.LEQ:
+                self._lower[j] = value
+
+
+def _mirrored(relation: str) -> str:
+    """Swaps the sides of a relational operator.
+
+    Args:
+        relation (str): The operator.
+
+    Returns:
+        str: The operator with its sides swapped.
+    """
+    return {"<": ">", ">": "<", "<=": ">=", ">=": "<=", "=<": "=>", "=>": "=<"}.get(
+        relation, relation
+    )
+
+
+@contextmanager
+def _opened(
+    target: str | PathLike | TextIO, mode: str
+) -> Iterator[TextIO]:
+    """Opens a path, or passes an open file through.
+
+    Args:
+        target (str | PathLike | TextIO): The path or the file.
+        mode (str): Mode to open a path in.
+
+    Yields:
+        TextIO: The file.
+    """
+    if isinstance(target, (str, PathLike)):
+        with open(target, mode, encoding="utf-8") as file:
+            yield file
+    else:
+        with nullcontext(target) as file:
+            yield file
+
+
+def _read_chunks(file: TextIO, reader: _MpsReader | _LpReader) -> None:
+    """Feeds a file to a reader in chunks of lines.
+
+    Args:
+        file (TextIO): The file.
+        reader (_MpsReader | _LpReader): The reader.
+    """
+    while lines := file.readlines(_CHUNK_SIZE):
+        reader.feed(lines)
+
+
+def read_mps(
+    source: str | PathLike | TextIO, fixed: bool = False, sparse: bool = True
+) -> LinearProgram:
+    """Reads a model in MPS format.
+
+    The objective is minimized unless an OBJSENSE section says MAX.
+    The program maximizes, so a minimized objective is negated. See
+    _ModelReader.program for the rows added for bounds and ranges.
+
+    Args:
+        source (str | PathLike | TextIO): Path or open file.
+        fixed (bool, optional): Find the fields by position, which
+            allows spaces in names. Defaults to False, the free format.
+        sparse (bool, optional): Store the constraint matrix in
+            compressed sparse form. Defaults to True.
+
+    Raises:
+        ValueError: The file is malformed.
+
+    Returns:
+        LinearProgram: The model.
+    """
+    reader = _MpsReader(fixed)
+
+    with _opened(source, "r") as file:
+        _read_chunks(file, reader)
+
+    return reader.program(sparse)
+
+
+def read_lp(source: str | PathLike | TextIO, sparse: bool = True) -> LinearProgram:
+    """Reads a model in CPLEX LP format.
+
+    A minimized objective is negated, as the program maximizes. See
+    _ModelReader.program for the rows added for bounds.
+
+    Args:
+        source (str | PathLike | TextIO): Path or open file.
+        sparse (bool, optional): Store the constraint matrix in
+            compressed sparse form. Defaults to True.
+
+    Raises:
+        ValueError: The file is malformed.
+
+    Returns:
+        LinearProgram: The model.
+    """
+    reader = _LpReader()
+
+    with _opened(source, "r") as file:
+        _read_chunks(file, reader)
+
+    reader.finish()
+
+    return reader.program(sparse)
+
+
+def _columnwise(program: LinearProgram) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Gets the coefficients of a program in column order, the objective
+    being the row m and coming first in every column.
+
+    The objective coefficient of a column without any other coefficient
+    is kept even if it is zero, so that every column is listed.
+
+    Args:
+        program (LinearProgram): The program.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: Row, column
+            and value of every coefficient.
+    """
+    m, n = program.shape
+    rows, cols, values = (np.asarray(array) for array in program.A.to_coo())
+
+    c = np.asarray(program.c, dtype=float)
+    listed = (c != 0.0) | (np.bincount(cols, minlength=n) == 0)
+    objective = np.flatnonzero(listed)
+
+    rows = np.concatenate((np.full(objective.shape[0], m), rows))
+    cols = np.concatenate((objective, cols))
+    values = np.concatenate((c[objective], values))
+
+    order = np.lexsort((np.where(rows == m, -1, rows), cols))
+
+    return rows[order], cols[order], values[order]
+
+
+def _fixed_number(value: float) -> str:
+    """Formats a number into the 12 characters of a fixed MPS field.
+
+    Args:
+        value (float): The number.
+
+    Returns:
+        str: The shortest exact representation, or the closest one that
+            fits.
+    """
+    text = repr(float(value))
+
+    precision = 12
+    while len(text) > 12:
+        text = f"{value:.{precision}g}"
+        precision -= 1
+
+    return text
+
+
+def write_mps(
+    program: LinearProgram,
+    target: str | PathLike | TextIO,
+    name: str = "PROGRAM",
+    fixed: bool = False,
+) -> None:
+    """Writes a program in MPS format, with an OBJSENSE MAX section.
+
+    Args:
+        program (LinearProgram): The program.
+        target (str | PathLike | TextIO): Path or open file.
+        name (str, optional): Name of the model. Defaults to "PROGRAM".
+        fixed (bool, optional): Align the fields by position. Names must
+            then fit in 8 characters and numbers are rounded to 12.
+            Defaults to False, the free format.
+
+    Raises:
+        ValueError: A name does not fit the format.
+    """
+    objective = "OBJ"
+    while objective in program.row_names:
+        objective += "_"
+
+    names = (objective,) + program.row_names + program.variable_names
+    for item in names:
+        if not item or _SPACE.search(item):
+            raise ValueError(f"Name {item!r} cannot be written to MPS")
+        if fixed and len(item) > 8:
+            raise ValueError(f"Name {item} is longer than 8 characters")
+
+    def lines(firsts: list[str], seconds: list[str], values: list[float]) -> Iterator[str]:
+        # The fields of a fixed line start at the 5th, 15th and 25th
+        # characters.
+        if fixed:
+            return (
+                f"    {first:<8}  {second:<8}  {_fixed_number(value)}\n"
+                for first, second, value in zip(firsts, seconds, values)
+            )
+
+        return (
+            f"    {first}  {second}  {value!r}\n"
+            for first, second, value in zip(firsts, seconds, values)
+        )
+
+    rows, cols, values = _columnwise(program)
+    row_names = program.row_names + (objective,)
+    column_names = program.variable_names
+    written = np.asarray(program.b) != 0.0
+
+    with _opened(target, "w") as file:
+        file.write(f"NAME          {name}\nOBJSENSE\n    MAX\nROWS\n")
+        file.write(f" N  {objective}\n")
+        file.writelines(
+            f" {_MPS_TYPES[sense]}  {row}\n"
+            for sense, row in zip(program.senses, program.row_names)
+        )
+
+        file.write("COLUMNS\n")
+        file.writelines(
+            lines(
+                [column_names[j] for j in cols.tolist()],
+                [row_names[i] for i in rows.tolist()],
+                values.tolist(),
+            )
+        )
+
+        file.write("RHS\n")
+        file.writelines(
+            lines(
+                ["RHS"] * int(written.sum()),
+                [program.row_names[i] for i in np.flatnonzero(written).tolist()],
+                np.asarray(program.b)[written].tolist(),
+            )
+        )
+
+        file.write("ENDATA\n")
+
+
+def write_lp(program: LinearProgram, target: str | PathLike | TextIO) -> None:
+    """Writes a program in CPLEX LP format.
+
+    Every column is listed in the objective, zero coefficients included,
+    so reading the file back keeps the columns and their order.
+
+    Args:
+        program (LinearProgram): The program.
+        target (str | PathLike | TextIO): Path or open file.
+
+    Raises:
+        ValueError: A name does not fit the format.
+    """
+    for item in program.row_names + program.variable_names:
+        if re.fullmatch(_LP_NAME, item) is None or _LP_SECTION.fullmatch(item):
+            raise ValueError(f"Name {item!r} cannot be written to LP")
+
+    names = program.variable_names
+
+    def expression(columns: np.ndarray, values: np.ndarray) -> Iterator[str]:
+        for k, (j, value) in enumerate(zip(columns, values)):
+            sign = "-" if value < 0.0 else "+"
+            if k == 0 and sign == "+":
+                yield f"{abs(float(value))!r} {names[j]}"
+            else:
+                yield f"{sign} {abs(float(value))!r} {names[j]}"
+
+    def wrapped(prefix: str, terms: Iterator[str], suffix: str = "") -> str:
+        # LP lines are limited in length, expressions continue on the
+        # next lines.
+        lines, current = [], prefix
+        for term in terms:
+            if len(current) + len(term) > 240:
+                lines.append(current)
+                current = "   "
+            current += " " + term
+
+        return "\n".join(lines + [current + suffix]) + "\n"
+
+    rows, cols, values = (np.asarray(array) for array in program.A.to_coo())
+    order = np.lexsort((cols, rows))
+    rows, cols, values = rows[order], cols[order], values[order]
+    starts = np.searchsorted(rows, np.arange(program.shape[0] + 1))
+
+    with _opened(target, "w") as file:
+        file.write("Maximize\n")
+        file.write(
+            wrapped(
+                " obj:",
+                expression(np.arange(program.shape[1]), np.asarray(program.c)),
+            )
+        )
+
+        file.write("Subject To\n")
+        for i, row in enumerate(program.row_names):
+            entries = slice(starts[i], starts[i + 1])
+            columns, coefficients = cols[entries], values[entries]
+
+            # A row needs a term to be read back.
+            if columns.shape[0] == 0 and program.shape[1]:
+                columns, coefficients = np.zeros(1, dtype=np.int64), np.zeros(1)
+
+            relation = program.senses[i].value
+            file.write(
+                wrapped(
+                    f" {row}:",
+                    expression(columns, coefficients),
+                    f" {relation} {float(program.b[i])!r}",
+                )
+            )
+
+        file.write("End\n")
+
+
+__all__ = ("read_mps", "write_mps", "read_lp", "write_lp")
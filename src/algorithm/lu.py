@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import numpy as np
+
+from algorithm.errors import SingularBasisException
+
+_BLOCK = 64
+"""Number of columns LUFactorization works on at once."""
+
+
+class LUFactorization:
+    """Dense LU factorization with partial pivoting, `P B = L U`.
+
+    Both triangular factors are stored in a single dense matrix: the
+    strictly lower part holds L (with an implicit unit diagonal), the
+    upper part holds U. Sparsity of the factorized matrix is not
+    exploited, the factors take `8 m^2` bytes.
+
+    The factorization and the triangular solves work on blocks of
+    columns: the trailing matrix is updated once per block, and the
+    solves apply the inverted diagonal blocks of L and U, so most of
+    the work runs in matrix products rather than row by row.
+
+    Args:
+        matrix (numpy.ndarray): Square matrix to factorize.
+        tolerance (float, optional): Smallest acceptable magnitude of a
+            pivot. Defaults to 1e-11.
+
+    Raises:
+        SingularBasisException: The matrix is numerically singular.
+    """
+
+    _lu: np.ndarray
+    """Combined L and U factors."""
+    _permutation: np.ndarray
+    """Row permutation, row `i` of `P B` is row `_permutation[i]` of B."""
+    _blocks: list[tuple[int, int, np.ndarray, np.ndarray]]
+    """Start and end of every diagonal block, with the inverses of its
+    L and U parts."""
+
+    def __init__(self, matrix: np.ndarray, tolerance: float = 1e-11) -> None:
+        lu = np.array(matrix, dtype=float)
+        size = lu.shape[0]
+        permutation = np.arange(size)
+        blocks = []
+
+        for start in range(0, size, _BLOCK):
+            end = min(start + _BLOCK, size)
+
+            # The columns of the block are factorized one by one, the
+            # rows are exchanged in full.
+            for k in range(start, end):
+                pivot = k + int(np.argmax(np.abs(lu[k:, k])))
+
+                if abs(lu[pivot, k]) <= tolerance:
+                    raise SingularBasisException(
+                        f"Basis matrix is singular, no pivot in column {k}"
+                    )
+
+                if pivot != k:
+                    lu[[k, pivot]] = lu[[pivot, k]]
+                    permutation[[k, pivot]] = permutation[[pivot, k]]
+
+                lu[k + 1 :, k] /= lu[k, k]
+                lu[k + 1 :, k + 1 : end] -= np.outer(lu[k + 1 :, k], lu[k, k + 1 : end])
+
+            diagonal = lu[start:end, start:end]
+            lower = np.linalg.inv(np.tril(diagonal, -1) + np.eye(end - start))
+            upper = np.linalg.inv(np.triu(diagonal))
+            blocks.append((start, end, lower, upper))
+
+            # The rows of U right of the block, then the trailing matrix.
+            lu[start:end, end:] = lower @ lu[start:end, end:]
+            lu[end:, end:] -= lu[end:, start:end] @ lu[start:end, end:]
+
+        self._lu = lu
+        self._permutation = permutation
+        self._blocks = blocks
+
+    def solve(self, rhs: np.ndarray) -> np.ndarray:
+        """Solves `B x = rhs`.
+
+        Args:
+            rhs (numpy.ndarray): Right-hand side vector, or matrix with
+                one right-hand side per column.
+
+        Returns:
+            numpy.ndarray: The solution x, of the shape of rhs.
+        """
+        lu = self._lu
+        x = np.array(rhs, dtype=float)[self._permutation]
+
+        for start, end, lower, _ in self._blocks:
+            x[start:end] = lower @ x[start:end]
+            x[end:] -= lu[end:, start:end] @ x[start:end]
+        for start, end, _, upper in reversed(self._blocks):
+            x[start:end] = upper @ x[start:end]
+            x[:start] -= lu[:start, start:end] @ x[start:end]
+
+        return x
+
+    def solve_transposed(self, rhs: np.ndarray) -> np.ndarray:
+        """Solves `B^T y = rhs`.
+
+        Args:
+            rhs (numpy.ndarray): Right-hand side vector, or matrix with
+                one right-hand side per column.
+
+        Returns:
+            numpy.ndarray: The solution y, of the shape of rhs.
+        """
+        lu = self._lu
+        w = np.array(rhs, dtype=float)
+
+        for start, end, _, upper in self._blocks:
+            w[start:end] = upper.T @ w[start:end]
+            w[end:] -= lu[start:end, end:].T @ w[start:end]
+        for start, end, lower, _ in reversed(self._blocks):
+            w[start:end] = lower.T @ w[start:end]
+            w[:start] -= lu[start:end, :start].T @ w[start:end]
+
+        y = np.empty_like(w)
+        y[self._permutation] = w
+
+        return y
+
+
+class BasisFactorization:
+    """Factorization of the simplex basis that is updated after every
+    pivot instead of being recomputed.
+
+    The basis `B_k` after k pivots is represented in product form,
+    `B_k = B_0 E_1 ... E_k`, where `B_0` is kept as an LU factorization
+    and every `E_i` is an eta matrix, the identity with one column
+    replaced. Once the eta file grows beyond the refactorization
+    frequency, the owner is expected to call `refactorize` with the
+    current basis matrix.
+
+    The basis matrix and the factors of `B_0` are dense (m, m) arrays,
+    even when the constraint matrix is a SparseMatrix.
+
+    Args:
+        matrix (numpy.ndarray): The initial basis matrix.
+        refactorization_frequency (int, optional): Number of updates
+            after which a fresh factorization is requested. Defaults to
+            64.
+        tolerance (float, optional): Smallest acceptable magnitude of a
+            pivot. Defaults to 1e-11.
+    """
+
+    refactorization_frequency: int
+    """Number of updates after which a fresh factorization is
+    requested."""
+    tolerance: float
+    """Smallest acceptable magnitude of a pivot."""
+
+    _lu: LUFactorization
+    """LU factorization of the basis at the last refactorization."""
+    _etas: list[tuple[int, np.ndarray]]
+    """Eta file, the pivot row and the eta column of every update."""
+
+    def __init__(
+        self,
+        matrix: np.ndarray,
+        refactorization_frequency: int = 64,
+        tolerance: float = 1e-11,
+    ) -> None:
+        self.refactorization_frequency = refactorization_frequency
+        self.tolerance = tolerance
+
+        self.refactorize(matrix)
+
+    @property
+    def requires_refactorization(self) -> bool:
+        """Checks if the eta file has reached the refactorization
+        frequency.
+
+        Returns:
+            bool: True if the basis should be refactorized, False
+                otherwise.
+        """
+        return len(self._etas) >= self.refactorization_frequency
+
+    def refactorize(self, matrix: np.ndarray) -> None:
+        """Factorizes the basis from scratch and clears the eta file.
+
+        Args:
+            matrix (numpy.ndarray): The current basis matrix.
+
+        Raises:
+            SingularBasisException: The basis matrix is numerically
+                singular.
+        """
+        self._lu = LUFactorization(matrix, self.tolerance)
+        self._etas = []
+
+    def ftran(self, rhs: np.ndarray) -> np.ndarray:
+        """Forward transformation, solves `B x = rhs`.
+
+        Args:
+            rhs (numpy.ndarray): Right-hand side vector.
+
+        Returns:
+            numpy.ndarray: The solution vector x.
+        """
+        x = self._lu.solve(rhs)
+
+        for row, eta in self._etas:
+            pivot = x[row] / eta[row]
+
+            x -= pivot * eta
+            x[row] = pivot
+
+        return x
+
+    def btran(self, rhs: np.ndarray) -> np.ndarray:
+        """Backward transformation, solves `B^T y = rhs`.
+
+        Args:
+            rhs (numpy.ndarray): Right-hand side vector.
+
+        Returns:
+            numpy.ndarray: The solution vector y.
+        """
+        y = np.array(rhs, dtype=float)
+
+        for row, eta in reversed(self._etas):
+            y[row] = (y[row] - (eta @ y - eta[row] * y[row])) / eta[row]
+
+        return self._lu.solve_transposed(y)
+
+    def update(self, row: int, column: np.ndarray) -> None:
+        """Replaces the basis column at the given position.
+
+        Args:
+            row (int): Position of the leaving column in the basis.
+            column (numpy.ndarray): The entering column already
+                transformed by `ftran`.
+
+        Raises:
+            SingularBasisException: The pivot element is too small.
+        """
+        if abs(column[row]) <= self.tolerance:
+            raise SingularBasisException(
+                f"Pivot element {column[row]} is too small to update the basis"
+            )
+
+        self._etas.append((row, np.array(column, dtype=float)))
+
+
+__all__ = ("LUFactorization", "BasisFactorization")
@@ -0,0 +1,563 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+class DenseMatrix:
+    """Constraint matrix stored as a dense array.
+
+    The DenseMatrix and the SparseMatrix share the same access methods,
+    so the simplex engines do not depend on the storage mode.
+
+    Args:
+        array (numpy.ndarray): The dense matrix of shape (m, n).
+    """
+
+    _array: np.ndarray
+    """The dense matrix."""
+
+    def __init__(self, array: np.ndarray) -> None:
+        self._array = np.asarray(array, dtype=float)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Gets the shape of the matrix.
+
+        Returns:
+            tuple[int, int]: The number of rows and columns.
+        """
+        return self._array.shape
+
+    @property
+    def nnz(self) -> int:
+        """Gets the number of stored nonzero entries.
+
+        Returns:
+            int: The number of nonzero entries.
+        """
+        return int(np.count_nonzero(self._array))
+
+    def column(self, j: int) -> np.ndarray:
+        """Gets a column as a dense vector.
+
+        Args:
+            j (int): Index of the column.
+
+        Returns:
+            numpy.ndarray: The column of length m.
+        """
+        return self._array[:, j].copy()
+
+    def columns(self, indices: np.ndarray) -> np.ndarray:
+        """Gets several columns as a dense matrix.
+
+        Args:
+            indices (numpy.ndarray): Indices of the columns.
+
+        Returns:
+            numpy.ndarray: The dense submatrix of shape (m, k).
+        """
+        return self._array[:, indices]
+
+    def row(self, i: int) -> np.ndarray:
+        """Gets a row as a dense vector.
+
+        Args:
+            i (int): Index of the row.
+
+        Returns:
+            numpy.ndarray: The row of length n.
+        """
+        return self._array[i].copy()
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """Computes `A x`.
+
+        Args:
+            x (numpy.ndarray): Vector of length n.
+
+        Returns:
+            numpy.ndarray: Vector of length m.
+        """
+        return self._array @ x
+
+    def rmatvec(self, y: np.ndarray) -> np.ndarray:
+        """Computes `y A`.
+
+        Args:
+            y (numpy.ndarray): Vector of length m.
+
+        Returns:
+            numpy.ndarray: Vector of length n.
+        """
+        return y @ self._array
+
+    def rmatvec_columns(self, y: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        """Computes `y A` restricted to the given columns.
+
+        Args:
+            y (numpy.ndarray): Vector of length m.
+            indices (numpy.ndarray): Indices of the columns.
+
+        Returns:
+            numpy.ndarray: Vector of length k.
+        """
+        return y @ self._array[:, indices]
+
+    def column_norms(self) -> np.ndarray:
+        """Computes the squared Euclidean norm of every column.
+
+        Returns:
+            numpy.ndarray: Vector of length n.
+        """
+        return np.einsum("ij,ij->j", self._array, self._array)
+
+    def scaled(
+        self, row_factors: np.ndarray, column_factors: np.ndarray
+    ) -> DenseMatrix:
+        """Multiplies the rows and the columns by the given factors.
+
+        Args:
+            row_factors (numpy.ndarray): Factor of every row.
+            column_factors (numpy.ndarray): Factor of every column.
+
+        Returns:
+            DenseMatrix: The scaled matrix `diag(r) A diag(s)`.
+        """
+        return DenseMatrix(
+            self._array * np.asarray(row_factors)[:, None] * np.asarray(column_factors)
+        )
+
+    def append_unit_columns(self, rows: np.ndarray, values: np.ndarray) -> DenseMatrix:
+        """Appends columns with a single nonzero entry each.
+
+        Args:
+            rows (numpy.ndarray): Row of the entry of every new column.
+            values (numpy.ndarray): Value of the entry of every new
+                column.
+
+        Returns:
+            DenseMatrix: The matrix with the new columns on the right.
+        """
+        columns = np.zeros((self._array.shape[0], len(rows)))
+        columns[rows, np.arange(len(rows))] = values
+
+        return DenseMatrix(np.hstack((self._array, columns)))
+
+    def to_coo(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Converts the matrix to coordinate triplets of its nonzeros.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: Row
+                indices, column indices and values.
+        """
+        rows, cols = np.nonzero(self._array)
+
+        return rows, cols, self._array[rows, cols]
+
+    def to_dense(self) -> np.ndarray:
+        """Converts the matrix to a dense array.
+
+        Returns:
+            numpy.ndarray: The dense matrix of shape (m, n).
+        """
+        return self._array
+
+
+class SparseMatrix:
+    """Constraint matrix stored in compressed sparse form.
+
+    The entries are kept twice: in CSC order for column access (entering
+    columns, basis assembly) and in CSR order for row access (pricing
+    with sparse multipliers, row computations of the dual simplex).
+
+    Only the constraint matrix is sparse. The engines assemble the basis
+    through `columns` as a dense (m, m) array and factorize it densely,
+    see BasisFactorization, so their memory still grows with the square
+    of the number of rows: about 8 GB for 30000 rows.
+
+    Args:
+        shape (tuple[int, int]): The number of rows and columns.
+        indptr (numpy.ndarray): CSC column pointers of length n + 1.
+        indices (numpy.ndarray): CSC row indices of the entries.
+        data (numpy.ndarray): CSC values of the entries.
+    """
+
+    _shape: tuple[int, int]
+    """The number of rows and columns."""
+
+    _col_indptr: np.ndarray
+    """CSC column pointers."""
+    _col_indices: np.ndarray
+    """CSC row indices of the entries."""
+    _col_data: np.ndarray
+    """CSC values of the entries."""
+    _col_ids: np.ndarray
+    """Column index of every CSC entry."""
+
+    _row_indptr: np.ndarray
+    """CSR row pointers."""
+    _row_indices: np.ndarray
+    """CSR column indices of the entries."""
+    _row_data: np.ndarray
+    """CSR values of the entries."""
+
+    def __init__(
+        self,
+        shape: tuple[int, int],
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        data: np.ndarray,
+    ) -> None:
+        self._shape = (int(shape[0]), int(shape[1]))
+
+        self._col_indptr = np.asarray(indptr, dtype=np.int64)
+        self._col_indices = np.asarray(indices, dtype=np.int64)
+        self._col_data = np.asarray(data, dtype=float)
+        self._col_ids = np.repeat(
+            np.arange(self._shape[1]), np.diff(self._col_indptr)
+        )
+
+        order = np.argsort(self._col_indices, kind="stable")
+        counts = np.bincount(self._col_indices, minlength=self._shape[0])
+
+        self._row_indptr = np.concatenate(([0], np.cumsum(counts)))
+        self._row_indices = self._col_ids[order]
+        self._row_data = self._col_data[order]
+
+    @classmethod
+    def from_coo(
+        cls,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        values: np.ndarray,
+        shape: tuple[int, int],
+    ) -> SparseMatrix:
+        """Builds the matrix from coordinate triplets.
+
+        Duplicate entries are summed and explicit zeros are dropped.
+
+        Args:
+            rows (numpy.ndarray): Row indices of the entries.
+            cols (numpy.ndarray): Column indices of the entries.
+            values (numpy.ndarray): Values of the entries.
+            shape (tuple[int, int]): The number of rows and columns.
+
+        Returns:
+            SparseMatrix: The assembled matrix.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = np.asarray(values, dtype=float)
+
+        height = max(int(shape[0]), 1)
+
+        keys = cols * height + rows
+        keys, inverse = np.unique(keys, return_inverse=True)
+        values = np.bincount(inverse, weights=values, minlength=keys.shape[0])
+
+        nonzero = values != 0.0
+        keys, values = keys[nonzero], values[nonzero]
+
+        cols, rows = np.divmod(keys, height)
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(cols, minlength=shape[1]))))
+
+        return cls(shape, indptr, rows, values)
+
+    @classmethod
+    def from_compressed(
+        cls, shape: tuple[int, int], arrays: tuple[np.ndarray, ...]
+    ) -> SparseMatrix:
+        """Builds the matrix from the arrays of to_compressed, without
+        copying or sorting them.
+
+        Args:
+            shape (tuple[int, int]): The number of rows and columns.
+            arrays (tuple[numpy.ndarray, ...]): The arrays, see
+                to_compressed.
+
+        Returns:
+            SparseMatrix: The matrix backed by the arrays.
+        """
+        matrix = cls.__new__(cls)
+        matrix._shape = (int(shape[0]), int(shape[1]))
+
+        (
+            matrix._col_indptr,
+            matrix._col_indices,
+            matrix._col_data,
+            matrix._col_ids,
+            matrix._row_indptr,
+            matrix._row_indices,
+            matrix._row_data,
+        ) = arrays
+
+        return matrix
+
+    @classmethod
+    def from_dense(cls, array: np.ndarray) -> SparseMatrix:
+        """Builds the matrix from a dense array.
+
+        Args:
+            array (numpy.ndarray): The dense matrix of shape (m, n).
+
+        Returns:
+            SparseMatrix: The compressed matrix.
+        """
+        array = np.asarray(array, dtype=float)
+        rows, cols = np.nonzero(array)
+
+        return cls.from_coo(rows, cols, array[rows, cols], array.shape)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Gets the shape of the matrix.
+
+        Returns:
+            tuple[int, int]: The number of rows and columns.
+        """
+        return self._shape
+
+    @property
+    def nnz(self) -> int:
+        """Gets the number of stored nonzero entries.
+
+        Returns:
+            int: The number of nonzero entries.
+        """
+        return int(self._col_data.shape[0])
+
+    def column(self, j: int) -> np.ndarray:
+        """Gets a column as a dense vector.
+
+        Args:
+            j (int): Index of the column.
+
+        Returns:
+            numpy.ndarray: The column of length m.
+        """
+        start, end = self._col_indptr[j], self._col_indptr[j + 1]
+
+        column = np.zeros(self._shape[0])
+        column[self._col_indices[start:end]] = self._col_data[start:end]
+
+        return column
+
+    def columns(self, indices: np.ndarray) -> np.ndarray:
+        """Gets several columns as a dense matrix, e.g. the basis matrix,
+        which takes `8 m k` bytes whatever the sparsity.
+
+        Args:
+            indices (numpy.ndarray): Indices of the columns.
+
+        Returns:
+            numpy.ndarray: The dense submatrix of shape (m, k).
+        """
+        submatrix = np.zeros((self._shape[0], len(indices)))
+
+        for k, j in enumerate(indices):
+            start, end = self._col_indptr[j], self._col_indptr[j + 1]
+            submatrix[self._col_indices[start:end], k] = self._col_data[start:end]
+
+        return submatrix
+
+    def row(self, i: int) -> np.ndarray:
+        """Gets a row as a dense vector.
+
+        Args:
+            i (int): Index of the row.
+
+        Returns:
+            numpy.ndarray: The row of length n.
+        """
+        start, end = self._row_indptr[i], self._row_indptr[i + 1]
+
+        row = np.zeros(self._shape[1])
+        row[self._row_indices[start:end]] = self._row_data[start:end]
+
+        return row
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """Computes `A x`.
+
+        Args:
+            x (numpy.ndarray): Vector of length n.
+
+        Returns:
+            numpy.ndarray: Vector of length m.
+        """
+        return np.bincount(
+            self._col_indices,
+            weights=self._col_data * x[self._col_ids],
+            minlength=self._shape[0],
+        )
+
+    def rmatvec(self, y: np.ndarray) -> np.ndarray:
+        """Computes `y A`.
+
+        Sparse multiplier vectors are combined row-wise through the CSR
+        copy, so only the rows of their nonzero entries are touched.
+
+        Args:
+            y (numpy.ndarray): Vector of length m.
+
+        Returns:
+            numpy.ndarray: Vector of length n.
+        """
+        nonzero = np.flatnonzero(y)
+
+        if 4 * nonzero.shape[0] >= self._shape[0]:
+            return np.bincount(
+                self._col_ids,
+                weights=self._col_data * y[self._col_indices],
+                minlength=self._shape[1],
+            )
+
+        starts, ends = self._row_indptr[nonzero], self._row_indptr[nonzero + 1]
+        lengths = ends - starts
+        positions = np.repeat(ends - np.cumsum(lengths), lengths) + np.arange(
+            lengths.sum()
+        )
+
+        return np.bincount(
+            self._row_indices[positions],
+            weights=self._row_data[positions] * np.repeat(y[nonzero], lengths),
+            minlength=self._shape[1],
+        )
+
+    def rmatvec_columns(self, y: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        """Computes `y A` restricted to the given columns.
+
+        Only the CSC entries of the requested columns are touched.
+
+        Args:
+            y (numpy.ndarray): Vector of length m.
+            indices (numpy.ndarray): Indices of the columns.
+
+        Returns:
+            numpy.ndarray: Vector of length k.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+
+        starts = self._col_indptr[indices]
+        lengths = self._col_indptr[indices + 1] - starts
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(
+            lengths.sum()
+        )
+
+        return np.bincount(
+            np.repeat(np.arange(indices.shape[0]), lengths),
+            weights=self._col_data[positions] * y[self._col_indices[positions]],
+            minlength=indices.shape[0],
+        )
+
+    def column_norms(self) -> np.ndarray:
+        """Computes the squared Euclidean norm of every column.
+
+        Returns:
+            numpy.ndarray: Vector of length n.
+        """
+        return np.bincount(
+            self._col_ids, weights=self._col_data**2, minlength=self._shape[1]
+        )
+
+    def scaled(
+        self, row_factors: np.ndarray, column_factors: np.ndarray
+    ) -> SparseMatrix:
+        """Multiplies the rows and the columns by the given factors.
+
+        Args:
+            row_factors (numpy.ndarray): Factor of every row.
+            column_factors (numpy.ndarray): Factor of every column.
+
+        Returns:
+            SparseMatrix: The scaled matrix `diag(r) A diag(s)`.
+        """
+        return SparseMatrix(
+            self._shape,
+            self._col_indptr,
+            self._col_indices,
+            self._col_data
+            * np.asarray(row_factors)[self._col_indices]
+            * np.asarray(column_factors)[self._col_ids],
+        )
+
+    def append_unit_columns(self, rows: np.ndarray, values: np.ndarray) -> SparseMatrix:
+        """Appends columns with a single nonzero entry each.
+
+        Args:
+            rows (numpy.ndarray): Row of the entry of every new column.
+            values (numpy.ndarray): Value of the entry of every new
+                column.
+
+        Returns:
+            SparseMatrix: The matrix with the new columns on the right.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+
+        return SparseMatrix(
+            (self._shape[0], self._shape[1] + rows.shape[0]),
+            np.concatenate(
+                (self._col_indptr, self._col_indptr[-1] + np.arange(1, rows.shape[0] + 1))
+            ),
+            np.concatenate((self._col_indices, rows)),
+            np.concatenate((self._col_data, np.asarray(values, dtype=float))),
+        )
+
+    def to_coo(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Converts the matrix to coordinate triplets in CSC order.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: Row
+                indices, column indices and values.
+        """
+        return self._col_indices, self._col_ids, self._col_data
+
+    def to_compressed(self) -> tuple[np.ndarray, ...]:
+        """Gets the arrays the matrix is stored in.
+
+        Returns:
+            tuple[numpy.ndarray, ...]: CSC column pointers, row indices,
+                values and column index of every entry, then CSR row
+                pointers, column indices and values.
+        """
+        return (
+            self._col_indptr,
+            self._col_indices,
+            self._col_data,
+            self._col_ids,
+            self._row_indptr,
+            self._row_indices,
+            self._row_data,
+        )
+
+    def to_dense(self) -> np.ndarray:
+        """Converts the matrix to a dense array.
+
+        Returns:
+            numpy.ndarray: The dense matrix of shape (m, n).
+        """
+        array = np.zeros(self._shape)
+        array[self._col_indices, self._col_ids] = self._col_data
+
+        return array
+
+
+def as_matrix(A: np.ndarray | DenseMatrix | SparseMatrix) -> DenseMatrix | SparseMatrix:
+    """Wraps a constraint matrix into one of the supported storage modes.
+
+    Args:
+        A (numpy.ndarray | DenseMatrix | SparseMatrix): The constraint
+            matrix.
+
+    Returns:
+        DenseMatrix | SparseMatrix: The matrix with the common access
+            methods.
+    """
+    if isinstance(A, (DenseMatrix, SparseMatrix)):
+        return A
+
+    return DenseMatrix(A)
+
+
+__all__ = ("DenseMatrix", "SparseMatrix", "as_matrix")
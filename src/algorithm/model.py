@@ -0,0 +1,546 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from os import PathLike
+
+import numpy as np
+
+from algorithm.dual import DualSimplex
+from algorithm.errors import InfeasibleException, SingularBasisException
+from algorithm.matrix import DenseMatrix, SparseMatrix
+from algorithm.presolve import Presolver
+from algorithm.pricing import PricingStrategy
+from algorithm.problem import LinearProgram, StandardForm
+from algorithm.revised import RevisedSimplex, SimplexResult, SimplexStatus
+from algorithm.two_phase import TwoPhaseSimplex
+from ast_parser.parser import Equation, EquationKind
+
+
+@dataclass
+class ModelSolution:
+    """Outcome of a Model solve."""
+
+    status: SimplexStatus
+    """Termination status of the engine."""
+    objective: float
+    """Value of the objective function."""
+    values: dict[str, float]
+    """Values of the columns. The names are the keys."""
+    duals: dict[str, float]
+    """Simplex multipliers of the rows. The names are the keys."""
+    iterations: int
+    """Number of pivots performed."""
+    warm_started: bool = field(default=False)
+    """Whether the solve started from the previous basis."""
+
+
+class Model:
+    """Editable linear program `max c x, A x (<=, =, >=) b, x >= 0`.
+
+    Rows and columns are addressed by name. Every solve remembers the
+    optimal basis by name, so the next solve after an edit starts from
+    it: with the primal simplex if the basis stays primal feasible,
+    with the dual simplex if it stays dual feasible (e.g. after a right
+    hand side change or a new row). Otherwise the model is solved from
+    scratch by the two-phase method. The basis can be saved to disk and
+    loaded by another process.
+    """
+
+    _objective: dict[str, float]
+    """Objective coefficients. The column names are the keys, in column
+    order."""
+    _rows: dict[str, Equation]
+    """Constraint rows. The row names are the keys, in row order."""
+
+    _basic_columns: list[str]
+    """Columns in the last optimal basis."""
+    _basic_rows: list[str]
+    """Rows whose slack is in the last optimal basis."""
+    _nonbasic_rows: list[str]
+    """Rows whose slack is not in the last optimal basis."""
+
+    def __init__(self) -> None:
+        self._objective = {}
+        self._rows = {}
+
+        self._basic_columns = []
+        self._basic_rows = []
+        self._nonbasic_rows = []
+
+    @classmethod
+    def from_equations(cls, objective_functions, constraints) -> Model:
+        """Builds a Model from parsed Equations, the same way Solver
+        interprets them.
+
+        Args:
+            objective_functions (list of Equation objects): List of
+                objective functions, the first one containing `Z`.
+            constraints (list of Equation objects): List of constraint
+                equations.
+
+        Returns:
+            Model: The model with rows named `r_0`, `r_1`, ...
+        """
+        model = cls()
+
+        for name, coefficient in objective_functions[0].variables.items():
+            if name != "Z":
+                model.add_column(name, -coefficient)
+
+        for i, constraint in enumerate(constraints):
+            for name in constraint.variables:
+                if name not in model._objective:
+                    model.add_column(name)
+
+            model.add_row(
+                f"r_{i}", constraint.variables, constraint.kind, constraint.bound
+            )
+
+        return model
+
+    @property
+    def variable_names(self) -> tuple[str, ...]:
+        """Gets the column names in column order.
+
+        Returns:
+            tuple[str, ...]: The column names.
+        """
+        return tuple(self._objective)
+
+    @property
+    def row_names(self) -> tuple[str, ...]:
+        """Gets the row names in row order.
+
+        Returns:
+            tuple[str, ...]: The row names.
+        """
+        return tuple(self._rows)
+
+    def add_column(
+        self,
+        name: str,
+        objective: float = 0.0,
+        coefficients: dict[str, float] | None = None,
+    ) -> None:
+        """Adds a column.
+
+        Args:
+            name (str): Name of the column.
+            objective (float, optional): Objective coefficient. Defaults
+                to 0.0.
+            coefficients (dict[str, float], optional): Coefficients in
+                existing rows. The row names are the keys.
+
+        Raises:
+            ValueError: The column already exists or a row is unknown.
+        """
+        if name in self._objective:
+            raise ValueError(f"Column {name} already exists")
+
+        coefficients = coefficients or {}
+        for row in coefficients:
+            self._require_row(row)
+
+        self._objective[name] = float(objective)
+        for row, coefficient in coefficients.items():
+            self._rows[row].variables[name] = float(coefficient)
+
+    def remove_column(self, name: str) -> None:
+        """Removes a column and its coefficients.
+
+        Args:
+            name (str): Name of the column.
+
+        Raises:
+            ValueError: The column is unknown.
+        """
+        self._require_column(name)
+
+        del self._objective[name]
+        for row in self._rows.values():
+            row.variables.pop(name, None)
+
+    def add_row(
+        self,
+        name: str,
+        coefficients: dict[str, float],
+        kind: EquationKind,
+        bound: float,
+    ) -> None:
+        """Adds a row.
+
+        Args:
+            name (str): Name of the row.
+            coefficients (dict[str, float]): Coefficients of the row.
+                The column names are the keys.
+            kind (EquationKind): Relationship of the row.
+            bound (float): Right-hand side of the row.
+
+        Raises:
+            ValueError: The row already exists or a column is unknown.
+        """
+        if name in self._rows:
+            raise ValueError(f"Row {name} already exists")
+
+        for column in coefficients:
+            self._require_column(column)
+
+        self._rows[name] = Equation(
+            EquationKind(kind),
+            {column: float(value) for column, value in coefficients.items()},
+            float(bound),
+        )
+
+    def remove_row(self, name: str) -> None:
+        """Removes a row.
+
+        Args:
+            name (str): Name of the row.
+
+        Raises:
+            ValueError: The row is unknown.
+        """
+        self._require_row(name)
+
+        del self._rows[name]
+
+    def set_coefficient(self, row: str, column: str, value: float) -> None:
+        """Sets a constraint coefficient.
+
+        Args:
+            row (str): Name of the row.
+            column (str): Name of the column.
+            value (float): The new coefficient, zero removes it.
+
+        Raises:
+            ValueError: The row or the column is unknown.
+        """
+        self._require_row(row)
+        self._require_column(column)
+
+        if value == 0.0:
+            self._rows[row].variables.pop(column, None)
+        else:
+            self._rows[row].variables[column] = float(value)
+
+    def set_rhs(self, row: str, value: float) -> None:
+        """Sets the right-hand side of a row.
+
+        Args:
+            row (str): Name of the row.
+            value (float): The new right-hand side.
+
+        Raises:
+            ValueError: The row is unknown.
+        """
+        self._require_row(row)
+
+        self._rows[row].bound = float(value)
+
+    def set_objective(self, column: str, value: float) -> None:
+        """Sets an objective coefficient.
+
+        Args:
+            column (str): Name of the column.
+            value (float): The new objective coefficient.
+
+        Raises:
+            ValueError: The column is unknown.
+        """
+        self._require_column(column)
+
+        self._objective[column] = float(value)
+
+    def build(self, sparse: bool = False) -> LinearProgram:
+        """Assembles the current rows and columns into a LinearProgram.
+
+        Args:
+            sparse (bool, optional): Store the constraint matrix in
+                compressed sparse form. Defaults to False.
+
+        Returns:
+            LinearProgram: The assembled program.
+        """
+        columns = {name: j for j, name in enumerate(self._objective)}
+
+        rows, cols, values = [], [], []
+        for i, row in enumerate(self._rows.values()):
+            for name, coefficient in row.variables.items():
+                rows.append(i)
+                cols.append(columns[name])
+                values.append(coefficient)
+
+        shape = (len(self._rows), len(self._objective))
+
+        A = SparseMatrix.from_coo(rows, cols, values, shape)
+        if not sparse:
+            A = DenseMatrix(A.to_dense())
+
+        return LinearProgram(
+            A,
+            np.array([row.bound for row in self._rows.values()], dtype=float),
+            np.array(list(self._objective.values()), dtype=float),
+            tuple(row.kind for row in self._rows.values()),
+            self.variable_names,
+            self.row_names,
+        )
+
+    def solve(
+        self,
+        sparse: bool = False,
+        pricing: PricingStrategy | None = None,
+        warm_start: bool = True,
+        presolve: bool = False,
+    ) -> ModelSolution:
+        """Solves the model, starting from the previous optimal basis
+        when possible.
+
+        Args:
+            sparse (bool, optional): Store the constraint matrix in
+                compressed sparse form. Defaults to False.
+            pricing (PricingStrategy, optional): Rule for choosing the
+                entering variable. Defaults to DantzigPricing.
+            warm_start (bool, optional): Start from the previous basis.
+                Defaults to True.
+            presolve (bool, optional): Reduce the model by Presolver
+                before solving it from scratch. The basis of a presolved
+                solve is not remembered. Defaults to False.
+
+        Returns:
+            ModelSolution: The outcome of the solve.
+        """
+        program = self.build(sparse)
+        if presolve:
+            return self._presolved_solve(program, pricing)
+
+        form = program.standard_form()
+
+        result = None
+        if warm_start:
+            result = self._warm_solve(form, pricing)
+
+        warm_started = result is not None
+        if result is None:
+            result = self._cold_solve(form, pricing)
+
+        if result.status == SimplexStatus.OPTIMAL:
+            self._store_basis(program, form, result.basis)
+
+        return ModelSolution(
+            result.status,
+            result.objective,
+            dict(zip(program.variable_names, result.x[: form.num_structural].tolist())),
+            dict(zip(program.row_names, result.duals.tolist())),
+            result.iterations,
+            warm_started,
+        )
+
+    def save_basis(self, path: str | PathLike) -> None:
+        """Saves the last optimal basis to a JSON file.
+
+        Args:
+            path (str | PathLike): Path of the file.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "columns": self._basic_columns,
+                    "basic_rows": self._basic_rows,
+                    "nonbasic_rows": self._nonbasic_rows,
+                },
+                file,
+            )
+
+    def load_basis(self, path: str | PathLike) -> None:
+        """Loads a basis saved by `save_basis`, the next solve starts
+        from it.
+
+        Args:
+            path (str | PathLike): Path of the file.
+        """
+        with open(path, encoding="utf-8") as file:
+            basis = json.load(file)
+
+        self._basic_columns = list(basis["columns"])
+        self._basic_rows = list(basis["basic_rows"])
+        self._nonbasic_rows = list(basis["nonbasic_rows"])
+
+    def _require_column(self, name: str) -> None:
+        """Checks that the column exists.
+
+        Args:
+            name (str): Name of the column.
+
+        Raises:
+            ValueError: The column is unknown.
+        """
+        if name not in self._objective:
+            raise ValueError(f"Unknown column {name}")
+
+    def _require_row(self, name: str) -> None:
+        """Checks that the row exists.
+
+        Args:
+            name (str): Name of the row.
+
+        Raises:
+            ValueError: The row is unknown.
+        """
+        if name not in self._rows:
+            raise ValueError(f"Unknown row {name}")
+
+    def _store_basis(
+        self, program: LinearProgram, form: StandardForm, basis: np.ndarray
+    ) -> None:
+        """Remembers the basis by column and row names.
+
+        Args:
+            program (LinearProgram): The solved program.
+            form (StandardForm): Its standard form.
+            basis (numpy.ndarray): Indices of the basic columns.
+        """
+        # Artificials of redundant rows are not remembered.
+        basis = basis[basis < form.A.shape[1]]
+
+        structural = basis[basis < form.num_structural]
+        slacks = basis[basis >= form.num_structural] - form.num_structural
+
+        self._basic_columns = [program.variable_names[j] for j in structural]
+        self._basic_rows = [program.row_names[form.slack_rows[k]] for k in slacks]
+
+        basic_rows = set(self._basic_rows)
+        self._nonbasic_rows = [
+            name for name in program.row_names if name not in basic_rows
+        ]
+
+    def _restore_basis(self, form: StandardForm) -> np.ndarray | None:
+        """Maps the remembered basis onto the current standard form.
+
+        Columns and rows that no longer exist are dropped, inequality
+        rows added since are covered by their slacks.
+
+        Args:
+            form (StandardForm): The current standard form.
+
+        Returns:
+            numpy.ndarray | None: Indices of the basic columns, or None
+                if the remembered basis does not fit the current model.
+        """
+        if not self._basic_columns and not self._basic_rows:
+            return None
+
+        columns = {name: j for j, name in enumerate(self._objective)}
+        basic_rows, nonbasic_rows = set(self._basic_rows), set(self._nonbasic_rows)
+
+        basis = [columns[name] for name in self._basic_columns if name in columns]
+        for name, slack_column in zip(self._rows, form.slack_columns()):
+            if slack_column < 0:
+                continue
+            if name in basic_rows or name not in nonbasic_rows:
+                basis.append(int(slack_column))
+
+        if len(basis) != len(self._rows):
+            return None
+
+        return np.array(basis, dtype=np.int64)
+
+    def _warm_solve(
+        self, form: StandardForm, pricing: PricingStrategy | None
+    ) -> SimplexResult | None:
+        """Solves from the remembered basis.
+
+        Args:
+            form (StandardForm): The current standard form.
+            pricing (PricingStrategy, optional): Rule for choosing the
+                entering variable.
+
+        Returns:
+            SimplexResult | None: The outcome of the solve, or None if
+                the remembered basis is unusable.
+        """
+        basis = self._restore_basis(form)
+        if basis is None:
+            return None
+
+        try:
+            engine = RevisedSimplex(form.A, form.b, form.c, basis, pricing=pricing)
+        except SingularBasisException:
+            return None
+
+        if engine.primal_feasible:
+            return engine.solve()
+        if engine.dual_feasible:
+            return DualSimplex(form.A, form.b, form.c, basis, pricing=pricing).solve()
+
+        return None
+
+    def _cold_solve(
+        self, form: StandardForm, pricing: PricingStrategy | None
+    ) -> SimplexResult:
+        """Solves from a crash basis with the two-phase method.
+
+        Args:
+            form (StandardForm): The current standard form.
+            pricing (PricingStrategy, optional): Rule for choosing the
+                entering variable.
+
+        Returns:
+            SimplexResult: The outcome of the solve.
+        """
+        return TwoPhaseSimplex(form.A, form.b, form.c, pricing=pricing).solve()
+
+    def _presolved_solve(
+        self, program: LinearProgram, pricing: PricingStrategy | None
+    ) -> ModelSolution:
+        """Solves the presolved program with the two-phase method and
+        maps the solution back to the model.
+
+        Args:
+            program (LinearProgram): The assembled program.
+            pricing (PricingStrategy, optional): Rule for choosing the
+                entering variable.
+
+        Returns:
+            ModelSolution: The outcome of the solve.
+        """
+        presolver = Presolver(program)
+
+        try:
+            reduced = presolver.presolve()
+        except InfeasibleException:
+            return ModelSolution(
+                SimplexStatus.INFEASIBLE,
+                0.0,
+                dict.fromkeys(program.variable_names, 0.0),
+                dict.fromkeys(program.row_names, 0.0),
+                0,
+            )
+
+        form = reduced.standard_form()
+
+        # Every column has been fixed, which leaves no rows either.
+        if reduced.shape[1] == 0:
+            result = SimplexResult(
+                SimplexStatus.OPTIMAL,
+                np.zeros(0),
+                0.0,
+                np.zeros(0, dtype=np.int64),
+                np.zeros(0),
+                0,
+            )
+        else:
+            result = self._cold_solve(form, pricing)
+
+        x, duals = presolver.postsolve(result.x[: form.num_structural], result.duals)
+
+        return ModelSolution(
+            result.status,
+            float(program.c @ x),
+            dict(zip(program.variable_names, x.tolist())),
+            dict(zip(program.row_names, duals.tolist())),
+            result.iterations,
+        )
+
+
+__all__ = ("ModelSolution", "Model")
@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from contextlib import suppress
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from algorithm.matrix import DenseMatrix, SparseMatrix
+from algorithm.problem import LinearProgram
+from algorithm.revised import SimplexResult
+from algorithm.scaling import ScalingMethod
+from algorithm.two_phase import TwoPhaseSimplex
+from ast_parser.parser import EquationKind
+
+
+@dataclass
+class SharedArray:
+    """Location of an array inside a shared memory block."""
+
+    offset: int
+    """Byte offset of the first element."""
+    dtype: str
+    """Data type string of the elements."""
+    shape: tuple[int, ...]
+    """Shape of the array."""
+
+    def view(self, buffer: memoryview) -> np.ndarray:
+        """Maps the array onto the block without copying.
+
+        Args:
+            buffer (memoryview): Buffer of the attached block.
+
+        Returns:
+            numpy.ndarray: The array backed by the block.
+        """
+        return np.ndarray(self.shape, np.dtype(self.dtype), buffer, self.offset)
+
+
+@dataclass
+class SharedProgram:
+    """Description of a LinearProgram stored in a shared memory block,
+    small enough to be pickled cheaply."""
+
+    block: str
+    """Name of the shared memory block."""
+    shape: tuple[int, int]
+    """The number of rows and columns."""
+    dense: bool
+    """Whether the constraint matrix is dense."""
+    matrix: tuple[SharedArray, ...]
+    """The dense array, or the coordinate rows, columns and values."""
+    b: SharedArray
+    """Right-hand side vector."""
+    c: SharedArray
+    """Objective coefficients."""
+    senses: tuple[EquationKind, ...]
+    """Relationship of every row."""
+
+    def attach(self, buffer: memoryview) -> LinearProgram:
+        """Rebuilds the program on top of the attached block.
+
+        Args:
+            buffer (memoryview): Buffer of the attached block.
+
+        Returns:
+            LinearProgram: The program, without names.
+        """
+        arrays = [array.view(buffer) for array in self.matrix]
+
+        if self.dense:
+            A = DenseMatrix(arrays[0])
+        else:
+            A = SparseMatrix.from_coo(*arrays, self.shape)
+
+        return LinearProgram(
+            A,
+            self.b.view(buffer),
+            self.c.view(buffer),
+            self.senses,
+            tuple(f"x_{j}" for j in range(self.shape[1])),
+            tuple(f"r_{i}" for i in range(self.shape[0])),
+        )
+
+
+def share_programs(
+    programs: list[LinearProgram],
+) -> tuple[SharedMemory, list[SharedProgram]]:
+    """Copies programs into a single new shared memory block.
+
+    Args:
+        programs (list[LinearProgram]): The programs to share.
+
+    Returns:
+        tuple[SharedMemory, list[SharedProgram]]: The block, which the
+            caller has to close and unlink, and the descriptions of the
+            programs.
+    """
+    arrays: list[np.ndarray] = []
+    for program in programs:
+        if isinstance(program.A, DenseMatrix):
+            arrays.append(np.ascontiguousarray(program.A.to_dense(), dtype=float))
+        else:
+            arrays.extend(program.A.to_coo())
+
+        arrays.append(np.asarray(program.b, dtype=float))
+        arrays.append(np.asarray(program.c, dtype=float))
+
+    # Every array starts at an offset aligned to 8 bytes.
+    offsets = np.cumsum([0] + [-(-array.nbytes // 8) * 8 for array in arrays])
+    block = SharedMemory(create=True, size=max(int(offsets[-1]), 1))
+
+    located = []
+    for array, offset in zip(arrays, offsets):
+        shared = SharedArray(int(offset), array.dtype.str, array.shape)
+        shared.view(block.buf)[...] = array
+        located.append(shared)
+
+    descriptions = []
+    position = 0
+    for program in programs:
+        dense = isinstance(program.A, DenseMatrix)
+        count = 1 if dense else 3
+
+        descriptions.append(
+            SharedProgram(
+                block.name,
+                program.shape,
+                dense,
+                tuple(located[position : position + count]),
+                located[position + count],
+                located[position + count + 1],
+                tuple(program.senses),
+            )
+        )
+        position += count + 2
+
+    return block, descriptions
+
+
+def solve_shared(program: SharedProgram, options: dict) -> SimplexResult:
+    """Solves a shared program with the two-phase method. Runs in the
+    worker processes.
+
+    Args:
+        program (SharedProgram): Description of the program.
+        options (dict): Options passed through to TwoPhaseSimplex.
+
+    Returns:
+        SimplexResult: The outcome of the solve, with the values of the
+            structural columns only.
+    """
+    block = SharedMemory(name=program.block)
+
+    try:
+        form = program.attach(block.buf).standard_form()
+        result = TwoPhaseSimplex(form.A, form.b, form.c, **options).solve()
+    except BaseException:
+        # The traceback may still hold views into the block, so closing
+        # it can fail, which must not hide the error of the solve.
+        form = None
+        with suppress(BufferError):
+            block.close()
+        raise
+
+    # The views into the block have to be released before closing.
+    form = None
+    block.close()
+
+    result.x = result.x[: program.shape[1]]
+
+    return result
+
+
+class ParallelSolver:
+    """Solves independent LinearPrograms on a pool of worker processes.
+
+    The constraint matrices reach the workers through shared memory,
+    only a small description of every program is pickled. The pool is
+    started once and reused by every solve, and results are yielded as
+    the solves finish.
+
+    Args:
+        workers (int, optional): Number of worker processes. Defaults to
+            the number of processors.
+        crash (bool, optional): Cover rows with structural columns
+            before resorting to artificials. Defaults to True.
+        tolerance (float, optional): Optimality and pivot tolerance.
+            Defaults to 1e-9.
+        scaling (ScalingMethod, optional): Rule for scaling the
+            programs, None to solve them unscaled. Defaults to
+            ScalingMethod.GEOMETRIC.
+    """
+
+    workers: int
+    """Number of worker processes."""
+
+    _executor: ProcessPoolExecutor
+    """The worker pool."""
+    _options: dict
+    """Options passed through to TwoPhaseSimplex."""
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        crash: bool = True,
+        tolerance: float = 1e-9,
+        scaling: ScalingMethod | None = ScalingMethod.GEOMETRIC,
+    ) -> None:
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+
+        # Workers attaching to a block register it with the resource
+        # tracker. Sharing the tracker of this process, which unlinks
+        # the blocks, keeps them from being reported as leaked.
+        resource_tracker.ensure_running()
+
+        self._executor = ProcessPoolExecutor(self.workers)
+        self._options = {"crash": crash, "tolerance": tolerance, "scaling": scaling}
+
+    def __enter__(self) -> ParallelSolver:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def warm_up(self) -> None:
+        """Starts all worker processes ahead of the first solve."""
+        futures = [self._executor.submit(int) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def submit(self, program: LinearProgram) -> Future:
+        """Schedules the solve of a single program.
+
+        Args:
+            program (LinearProgram): The program to solve.
+
+        Returns:
+            Future: Resolves to the SimplexResult of the program.
+        """
+        block, (description,) = share_programs([program])
+
+        try:
+            future = self._executor.submit(solve_shared, description, self._options)
+        except BaseException:
+            self._release(block)
+            raise
+
+        future.add_done_callback(lambda _: self._release(block))
+
+        return future
+
+    def solve(
+        self, programs: Iterable[LinearProgram]
+    ) -> Iterator[tuple[int, SimplexResult]]:
+        """Solves programs in parallel.
+
+        Args:
+            programs (Iterable[LinearProgram]): The programs to solve.
+
+        Yields:
+            tuple[int, SimplexResult]: The index of a program and the
+                outcome of its solve, in order of completion.
+        """
+        programs = list(programs)
+        if not programs:
+            return
+
+        block, descriptions = share_programs(programs)
+        futures = {}
+
+        try:
+            for i, description in enumerate(descriptions):
+                future = self._executor.submit(solve_shared, description, self._options)
+                futures[future] = i
+
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+            self._release(block)
+
+    def close(self) -> None:
+        """Shuts the worker pool down."""
+        self._executor.shutdown()
+
+    @staticmethod
+    def _release(block: SharedMemory) -> None:
+        """Closes and removes a shared memory block.
+
+        Args:
+            block (SharedMemory): The block to release.
+        """
+        block.close()
+        block.unlink()
+
+
+__all__ = (
+    "SharedArray",
+    "SharedProgram",
+    "share_programs",
+    "solve_shared",
+    "ParallelSolver",
+)
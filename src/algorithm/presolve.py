@@ -0,0 +1,598 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from algorithm.errors import InfeasibleException
+from algorithm.matrix import DenseMatrix, SparseMatrix
+from algorithm.problem import LinearProgram
+from ast_parser.parser import EquationKind
+
+
+@dataclass
+class SingletonRow:
+    """Postsolve record of a row with a single entry that has been
+    turned into a bound of its column."""
+
+    row: int
+    """Index of the removed row."""
+    column: int
+    """Index of the column of the entry."""
+    coefficient: float
+    """Value of the entry."""
+    bound: float
+    """Bound of the column implied by the row."""
+
+
+@dataclass
+class FixedColumn:
+    """Postsolve record of a column removed at a fixed value."""
+
+    column: int
+    """Index of the removed column."""
+    value: float
+    """Value of the column."""
+
+
+class Presolver:
+    """Presolve reductions of a LinearProgram and the postsolve that
+    maps a solution of the reduced program back.
+
+    The reductions are applied in passes until none of them applies:
+
+    - empty rows are checked and removed;
+    - singleton rows become bounds of their column, the tightest bound
+      wins;
+    - rows that are redundant given the column bounds, and duplicate
+      (parallel) rows, are removed;
+    - fixed, empty and dominated columns are removed at their value.
+
+    Lower bounds are shifted out and remaining upper bounds are added
+    back as one singleton row per column. Every reduction is recorded
+    on a stack that `postsolve` unwinds to recover the primal values
+    and the duals of all original rows and columns.
+
+    Args:
+        program (LinearProgram): The program to reduce.
+        tolerance (float, optional): Feasibility and zero tolerance.
+            Defaults to 1e-9.
+    """
+
+    tolerance: float
+    """Feasibility and zero tolerance."""
+
+    _program: LinearProgram
+    """The original program."""
+
+    _rows: np.ndarray
+    """Row indices of the entries."""
+    _cols: np.ndarray
+    """Column indices of the entries."""
+    _values: np.ndarray
+    """Values of the entries."""
+
+    _b: np.ndarray
+    """Right-hand side with the fixed columns substituted."""
+    _lower: np.ndarray
+    """Lower bounds of the columns."""
+    _upper: np.ndarray
+    """Upper bounds of the columns."""
+
+    _row_active: np.ndarray
+    """Mask of the rows still in the program."""
+    _column_active: np.ndarray
+    """Mask of the columns still in the program."""
+
+    _stack: list[SingletonRow | FixedColumn]
+    """Postsolve stack."""
+
+    def __init__(self, program: LinearProgram, tolerance: float = 1e-9) -> None:
+        self.tolerance = tolerance
+
+        self._program = program
+
+        m, n = program.shape
+        self._rows, self._cols, self._values = (
+            np.asarray(array) for array in program.A.to_coo()
+        )
+
+        self._b = np.array(program.b, dtype=float)
+        self._lower = np.zeros(n)
+        self._upper = np.full(n, np.inf)
+
+        self._row_active = np.ones(m, dtype=bool)
+        self._column_active = np.ones(n, dtype=bool)
+
+        self._stack = []
+
+    @property
+    def removed_rows(self) -> int:
+        """Gets the number of original rows removed.
+
+        Returns:
+            int: The number of removed rows.
+        """
+        return int((~self._row_active).sum())
+
+    @property
+    def removed_columns(self) -> int:
+        """Gets the number of original columns removed.
+
+        Returns:
+            int: The number of removed columns.
+        """
+        return int((~self._column_active).sum())
+
+    def presolve(self) -> LinearProgram:
+        """Applies the reductions.
+
+        Raises:
+            InfeasibleException: A reduction proves the program
+                infeasible.
+
+        Returns:
+            LinearProgram: The reduced program.
+        """
+        changed = True
+
+        while changed:
+            changed = False
+
+            changed |= self._remove_empty_rows()
+            changed |= self._remove_singleton_rows()
+            changed |= self._remove_fixed_columns()
+            changed |= self._remove_empty_columns()
+            changed |= self._remove_dominated_columns()
+            changed |= self._remove_redundant_rows()
+            changed |= self._remove_duplicate_rows()
+
+        return self._reduced_program()
+
+    def postsolve(
+        self, x: np.ndarray, duals: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Maps a solution of the reduced program to the original one.
+
+        Args:
+            x (numpy.ndarray): Values of the reduced columns.
+            duals (numpy.ndarray): Duals of the reduced rows.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: Values of the original
+                columns and duals of the original rows.
+        """
+        m, n = self._program.shape
+        columns = np.flatnonzero(self._column_active)
+        rows = np.flatnonzero(self._row_active)
+
+        x_full = np.zeros(n)
+        x_full[columns] = np.asarray(x)[: columns.shape[0]] + self._lower[columns]
+
+        y_full = np.zeros(m)
+        y_full[rows] = np.asarray(duals)[: rows.shape[0]]
+
+        for record in reversed(self._stack):
+            if isinstance(record, FixedColumn):
+                x_full[record.column] = record.value
+
+        for record in reversed(self._stack):
+            if isinstance(record, SingletonRow):
+                self._postsolve_singleton_row(record, x_full, y_full)
+
+        return x_full, y_full
+
+    def _active_entries(self) -> np.ndarray:
+        """Gets the mask of the entries in active rows and columns.
+
+        Returns:
+            numpy.ndarray: The mask of the active entries.
+        """
+        return self._row_active[self._rows] & self._column_active[self._cols]
+
+    def _remove_empty_rows(self) -> bool:
+        """Removes rows without active entries.
+
+        Raises:
+            InfeasibleException: An empty row cannot be satisfied.
+
+        Returns:
+            bool: True if a row has been removed, False otherwise.
+        """
+        counts = np.bincount(
+            self._rows[self._active_entries()], minlength=self._b.shape[0]
+        )
+        empty = np.flatnonzero(self._row_active & (counts == 0))
+
+        for i in empty:
+            self._check_activity(i, 0.0, 0.0)
+
+        self._row_active[empty] = False
+
+        return empty.shape[0] > 0
+
+    def _remove_singleton_rows(self) -> bool:
+        """Turns rows with a single active entry into column bounds.
+
+        Raises:
+            InfeasibleException: The bounds of a column cross.
+
+        Returns:
+            bool: True if a row has been removed, False otherwise.
+        """
+        active = self._active_entries()
+        counts = np.bincount(self._rows[active], minlength=self._b.shape[0])
+
+        singleton = active & (counts[self._rows] == 1)
+
+        for i, j, a in zip(
+            self._rows[singleton], self._cols[singleton], self._values[singleton]
+        ):
+            kind = self._program.senses[i]
+            bound = self._b[i] / a
+
+            if kind == EquationKind.EQ or (kind == EquationKind.LEQ) == (a > 0.0):
+                self._upper[j] = min(self._upper[j], bound)
+            if kind == EquationKind.EQ or (kind == EquationKind.GEQ) == (a > 0.0):
+                self._lower[j] = max(self._lower[j], bound)
+
+            if self._lower[j] > self._upper[j] + self.tolerance * max(1.0, abs(bound)):
+                raise InfeasibleException(
+                    f"Bounds of column {self._program.variable_names[j]} cross"
+                )
+
+            self._row_active[i] = False
+            self._stack.append(SingletonRow(int(i), int(j), float(a), float(bound)))
+
+        return bool(singleton.any())
+
+    def _remove_fixed_columns(self) -> bool:
+        """Substitutes columns whose bounds coincide.
+
+        Returns:
+            bool: True if a column has been removed, False otherwise.
+        """
+        fixed = np.flatnonzero(
+            self._column_active
+            & (self._upper - self._lower <= self.tolerance * np.maximum(1.0, np.abs(self._lower)))
+        )
+
+        for j in fixed:
+            self._fix_column(j, self._lower[j])
+
+        return fixed.shape[0] > 0
+
+    def _remove_empty_columns(self) -> bool:
+        """Removes columns without active entries at their best bound.
+
+        A profitable empty column without upper bound makes the program
+        unbounded only if the other rows are feasible, so it is kept for
+        the engine to decide.
+
+        Returns:
+            bool: True if a column has been removed, False otherwise.
+        """
+        counts = np.bincount(
+            self._cols[self._active_entries()], minlength=self._lower.shape[0]
+        )
+        c = np.asarray(self._program.c)
+        empty = np.flatnonzero(
+            self._column_active
+            & (counts == 0)
+            & ((c <= 0.0) | np.isfinite(self._upper))
+        )
+
+        for j in empty:
+            self._fix_column(j, self._lower[j] if c[j] <= 0.0 else self._upper[j])
+
+        return empty.shape[0] > 0
+
+    def _remove_dominated_columns(self) -> bool:
+        """Removes columns that can only hurt, i.e. with a non-positive
+        objective coefficient whose increase tightens every row it
+        appears in, at their lower bound.
+
+        Returns:
+            bool: True if a column has been removed, False otherwise.
+        """
+        active = self._active_entries()
+        senses = np.array([kind.value for kind in self._program.senses])[self._rows]
+
+        hurts = ((senses == EquationKind.LEQ.value) & (self._values > 0.0)) | (
+            (senses == EquationKind.GEQ.value) & (self._values < 0.0)
+        )
+        helps = active & ~hurts
+
+        n = self._lower.shape[0]
+        dominated = np.flatnonzero(
+            self._column_active
+            & (np.asarray(self._program.c) <= 0.0)
+            & (np.bincount(self._cols[helps], minlength=n) == 0)
+            & (np.bincount(self._cols[active], minlength=n) > 0)
+        )
+
+        for j in dominated:
+            self._fix_column(j, self._lower[j])
+
+        return dominated.shape[0] > 0
+
+    def _remove_redundant_rows(self) -> bool:
+        """Removes inequality rows that hold for all values within the
+        column bounds.
+
+        Raises:
+            InfeasibleException: A row cannot hold for any values within
+                the column bounds.
+
+        Returns:
+            bool: True if a row has been removed, False otherwise.
+        """
+        minimum, maximum = self._activities()
+
+        redundant = []
+        for i in np.flatnonzero(self._row_active):
+            self._check_activity(i, minimum[i], maximum[i])
+
+            kind = self._program.senses[i]
+            slack = self.tolerance * max(1.0, abs(self._b[i]))
+
+            if (kind == EquationKind.LEQ and maximum[i] <= self._b[i] + slack) or (
+                kind == EquationKind.GEQ and minimum[i] >= self._b[i] - slack
+            ):
+                redundant.append(i)
+
+        self._row_active[redundant] = False
+
+        return len(redundant) > 0
+
+    def _remove_duplicate_rows(self) -> bool:
+        """Removes rows parallel to another row, keeping the tighter one.
+
+        Raises:
+            InfeasibleException: Parallel rows contradict each other.
+
+        Returns:
+            bool: True if a row has been removed, False otherwise.
+        """
+        active = self._active_entries()
+        order = np.lexsort((self._cols[active], self._rows[active]))
+        rows = self._rows[active][order]
+        cols = self._cols[active][order]
+        values = self._values[active][order]
+
+        bounds = np.searchsorted(rows, np.flatnonzero(self._row_active))
+        ends = np.append(bounds[1:], rows.shape[0])
+
+        seen: dict[tuple, tuple[int, float]] = {}
+        removed = False
+
+        for start, end in zip(bounds, ends):
+            i = int(rows[start])
+            scale = values[start]
+            key = (tuple(cols[start:end]), tuple(np.round(values[start:end] / scale, 12)))
+
+            if key not in seen:
+                seen[key] = (i, scale)
+
+                continue
+
+            k, other_scale = seen[key]
+            drop = self._merge_parallel_rows(k, other_scale, i, scale)
+
+            if drop is not None:
+                self._row_active[drop] = False
+                removed = True
+
+                if drop == k:
+                    seen[key] = (i, scale)
+
+        return removed
+
+    def _merge_parallel_rows(
+        self, k: int, k_scale: float, i: int, i_scale: float
+    ) -> int | None:
+        """Decides which of two parallel rows is implied by the other.
+
+        Args:
+            k (int): Index of the first row.
+            k_scale (float): Its first coefficient.
+            i (int): Index of the second row.
+            i_scale (float): Its first coefficient.
+
+        Raises:
+            InfeasibleException: The rows contradict each other.
+
+        Returns:
+            int | None: Index of the row to drop, or None if both rows
+                are needed.
+        """
+
+        def normalized(row: int, scale: float) -> tuple[EquationKind, float]:
+            kind = self._program.senses[row]
+            if scale < 0.0 and kind != EquationKind.EQ:
+                kind = EquationKind.GEQ if kind == EquationKind.LEQ else EquationKind.LEQ
+
+            return kind, self._b[row] / scale
+
+        k_kind, k_bound = normalized(k, k_scale)
+        i_kind, i_bound = normalized(i, i_scale)
+        slack = self.tolerance * max(1.0, abs(k_bound), abs(i_bound))
+
+        if k_kind == EquationKind.EQ or i_kind == EquationKind.EQ:
+            equality, other = (k, i) if k_kind == EquationKind.EQ else (i, k)
+            value = k_bound if equality == k else i_bound
+            other_kind = i_kind if other == i else k_kind
+            other_bound = i_bound if other == i else k_bound
+
+            if (
+                (other_kind == EquationKind.EQ and abs(value - other_bound) > slack)
+                or (other_kind == EquationKind.LEQ and value > other_bound + slack)
+                or (other_kind == EquationKind.GEQ and value < other_bound - slack)
+            ):
+                raise InfeasibleException("Parallel rows contradict each other")
+
+            return other
+
+        if k_kind == i_kind:
+            if k_kind == EquationKind.LEQ:
+                return i if i_bound >= k_bound else k
+
+            return i if i_bound <= k_bound else k
+
+        upper = k_bound if k_kind == EquationKind.LEQ else i_bound
+        lower = i_bound if k_kind == EquationKind.LEQ else k_bound
+        if lower > upper + slack:
+            raise InfeasibleException("Parallel rows contradict each other")
+
+        return None
+
+    def _activities(self) -> tuple[np.ndarray, np.ndarray]:
+        """Computes the smallest and largest activity of every row over
+        the column bounds.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: The minimum and maximum
+                activities.
+        """
+        active = self._active_entries()
+        rows, cols, values = self._rows[active], self._cols[active], self._values[active]
+
+        lower, upper = self._lower[cols], self._upper[cols]
+        positive = values > 0.0
+
+        with np.errstate(invalid="ignore"):
+            low = np.where(positive, values * lower, values * upper)
+            high = np.where(positive, values * upper, values * lower)
+
+        m = self._b.shape[0]
+
+        minimum = np.bincount(
+            rows, weights=np.where(np.isinf(low), 0.0, low), minlength=m
+        ).astype(float)
+        maximum = np.bincount(
+            rows, weights=np.where(np.isinf(high), 0.0, high), minlength=m
+        ).astype(float)
+
+        minimum[np.bincount(rows, weights=np.isinf(low), minlength=m) > 0] = -np.inf
+        maximum[np.bincount(rows, weights=np.isinf(high), minlength=m) > 0] = np.inf
+
+        return minimum, maximum
+
+    def _check_activity(self, i: int, minimum: float, maximum: float) -> None:
+        """Checks that a row can hold within its activity range.
+
+        Args:
+            i (int): Index of the row.
+            minimum (float): Smallest activity of the row.
+            maximum (float): Largest activity of the row.
+
+        Raises:
+            InfeasibleException: The row cannot hold.
+        """
+        kind = self._program.senses[i]
+        slack = self.tolerance * max(1.0, abs(self._b[i]))
+
+        if (kind != EquationKind.GEQ and minimum > self._b[i] + slack) or (
+            kind != EquationKind.LEQ and maximum < self._b[i] - slack
+        ):
+            raise InfeasibleException(
+                f"Row {self._program.row_names[i]} cannot be satisfied"
+            )
+
+    def _fix_column(self, j: int, value: float) -> None:
+        """Removes a column at a fixed value, moving its contribution to
+        the right-hand side.
+
+        Args:
+            j (int): Index of the column.
+            value (float): Value of the column.
+        """
+        entries = (self._cols == j) & self._row_active[self._rows]
+        np.subtract.at(self._b, self._rows[entries], self._values[entries] * value)
+
+        self._column_active[j] = False
+        self._stack.append(FixedColumn(int(j), float(value)))
+
+    def _reduced_program(self) -> LinearProgram:
+        """Assembles the reduced program. Lower bounds are shifted out
+        and finite upper bounds become singleton rows.
+
+        Returns:
+            LinearProgram: The reduced program.
+        """
+        rows = np.flatnonzero(self._row_active)
+        columns = np.flatnonzero(self._column_active)
+
+        row_index = np.full(self._b.shape[0], -1)
+        row_index[rows] = np.arange(rows.shape[0])
+        column_index = np.full(self._lower.shape[0], -1)
+        column_index[columns] = np.arange(columns.shape[0])
+
+        active = self._active_entries()
+        entry_rows, entry_cols = self._rows[active], self._cols[active]
+        entry_values = self._values[active]
+
+        b = self._b[rows] - np.bincount(
+            row_index[entry_rows],
+            weights=entry_values * self._lower[entry_cols],
+            minlength=rows.shape[0],
+        )
+
+        bounded = columns[np.isfinite(self._upper[columns])]
+        names = self._program.variable_names
+
+        coo = (
+            np.concatenate((row_index[entry_rows], rows.shape[0] + np.arange(bounded.shape[0]))),
+            np.concatenate((column_index[entry_cols], column_index[bounded])),
+            np.concatenate((entry_values, np.ones(bounded.shape[0]))),
+        )
+        shape = (rows.shape[0] + bounded.shape[0], columns.shape[0])
+
+        A = SparseMatrix.from_coo(*coo, shape)
+        if isinstance(self._program.A, DenseMatrix):
+            A = DenseMatrix(A.to_dense())
+
+        return LinearProgram(
+            A,
+            np.concatenate((b, self._upper[bounded] - self._lower[bounded])),
+            np.asarray(self._program.c, dtype=float)[columns],
+            tuple(self._program.senses[i] for i in rows)
+            + (EquationKind.LEQ,) * bounded.shape[0],
+            tuple(names[j] for j in columns),
+            tuple(self._program.row_names[i] for i in rows)
+            + tuple(f"{names[j]}_upper" for j in bounded),
+        )
+
+    def _postsolve_singleton_row(
+        self, record: SingletonRow, x: np.ndarray, y: np.ndarray
+    ) -> None:
+        """Recovers the dual of a singleton row. The row takes over the
+        reduced cost of its column if its bound is active and the sign
+        fits the relationship of the row.
+
+        Args:
+            record (SingletonRow): The postsolve record.
+            x (numpy.ndarray): Values of the original columns.
+            y (numpy.ndarray): Duals of the original rows. Updated in
+                place.
+        """
+        j = record.column
+        if abs(x[j] - record.bound) > self.tolerance * max(1.0, abs(record.bound)) * 1e2:
+            return
+
+        entries = self._cols == j
+        reduced_cost = (
+            y[self._rows[entries]] @ self._values[entries] - self._program.c[j]
+        )
+        dual = -reduced_cost / record.coefficient
+
+        kind = self._program.senses[record.row]
+        if (kind == EquationKind.LEQ and dual < 0.0) or (
+            kind == EquationKind.GEQ and dual > 0.0
+        ):
+            return
+
+        y[record.row] = dual
+
+
+__all__ = ("SingletonRow", "FixedColumn", "Presolver")
@@ -0,0 +1,392 @@
+from __future__ import annotations
+
+import numpy as np
+
+from algorithm.lu import BasisFactorization, LUFactorization
+from algorithm.matrix import DenseMatrix, SparseMatrix
+
+_BLOCK = 256
+"""Number of edge directions computed at once by SteepestEdgePricing."""
+
+
+class PricingStrategy:
+    """Base class for rules choosing the entering variable.
+
+    A strategy is initialized once per solve and then notified about
+    every pivot before the basis changes, so it can carry reference
+    weights or candidate lists from one iteration to the next.
+
+    Reduced costs follow the sign convention of the engines,
+    `d = y A - c`; a nonbasic column is attractive when `d_j < 0`.
+
+    Args:
+        tolerance (float, optional): Optimality tolerance. Defaults to
+            1e-9.
+    """
+
+    tolerance: float
+    """Optimality tolerance."""
+
+    _is_basic: np.ndarray
+    """Mask of the basic columns."""
+
+    def __init__(self, tolerance: float = 1e-9) -> None:
+        self.tolerance = tolerance
+
+        self._is_basic = np.zeros(0, dtype=bool)
+
+    def initialize(self, A: DenseMatrix | SparseMatrix, basis: np.ndarray) -> None:
+        """Prepares the strategy for a solve from the given basis.
+
+        Args:
+            A (DenseMatrix | SparseMatrix): The constraint matrix.
+            basis (numpy.ndarray): Indices of the starting basic columns.
+        """
+        self._is_basic = np.zeros(A.shape[1], dtype=bool)
+        self._is_basic[basis] = True
+
+    def select(
+        self, A: DenseMatrix | SparseMatrix, duals: np.ndarray, c: np.ndarray
+    ) -> int | None:
+        """Chooses the entering column.
+
+        Args:
+            A (DenseMatrix | SparseMatrix): The constraint matrix.
+            duals (numpy.ndarray): Simplex multipliers of the basis.
+            c (numpy.ndarray): Objective coefficients.
+
+        Returns:
+            int | None: Index of the entering column, or None if the
+                basis is optimal.
+        """
+        raise NotImplementedError
+
+    def update(
+        self,
+        A: DenseMatrix | SparseMatrix,
+        factorization: BasisFactorization,
+        entering: int,
+        leaving: int,
+        leaving_column: int,
+        alpha: np.ndarray,
+    ) -> None:
+        """Notifies the strategy about a pivot. Called before the basis
+        factorization is updated.
+
+        Args:
+            A (DenseMatrix | SparseMatrix): The constraint matrix.
+            factorization (BasisFactorization): Factorization of the
+                basis before the pivot.
+            entering (int): Index of the entering column.
+            leaving (int): Position of the leaving column in the basis.
+            leaving_column (int): Index of the leaving column.
+            alpha (numpy.ndarray): The entering column transformed by
+                the basis.
+        """
+        self._is_basic[entering] = True
+        self._is_basic[leaving_column] = False
+
+    def _reduced_costs(
+        self, A: DenseMatrix | SparseMatrix, duals: np.ndarray, c: np.ndarray
+    ) -> np.ndarray:
+        """Computes the reduced costs of all columns, zero for the basic
+        ones.
+
+        Args:
+            A (DenseMatrix | SparseMatrix): The constraint matrix.
+            duals (numpy.ndarray): Simplex multipliers of the basis.
+            c (numpy.ndarray): Objective coefficients.
+
+        Returns:
+            numpy.ndarray: The reduced costs.
+        """
+        reduced_costs = A.rmatvec(duals) - c
+        reduced_costs[self._is_basic] = 0.0
+
+        return reduced_costs
+
+    @staticmethod
+    def _pivot_row(
+        A: DenseMatrix | SparseMatrix,
+        factorization: BasisFactorization,
+        leaving: int,
+    ) -> np.ndarray:
+        """Computes the pivot row `e_r B^-1 A` of the leaving position.
+
+        Args:
+            A (DenseMatrix | SparseMatrix): The constraint matrix.
+            factorization (BasisFactorization): Factorization of the
+                basis before the pivot.
+            leaving (int): Position of the leaving column in the basis.
+
+        Returns:
+            numpy.ndarray: The pivot row of length n.
+        """
+        unit = np.zeros(A.shape[0])
+        unit[leaving] = 1.0
+
+        return A.rmatvec(factorization.btran(unit))
+
+
+class DantzigPricing(PricingStrategy):
+    """Dantzig rule, the most negative reduced cost over all columns.
+
+    Args:
+        tolerance (float, optional): Optimality tolerance. Defaults to
+            1e-9.
+    """
+
+    def select(
+        self, A: DenseMatrix | SparseMatrix, duals: np.ndarray, c: np.ndarray
+    ) -> int | None:
+        reduced_costs = self._reduced_costs(A, duals, c)
+
+        entering = int(np.argmin(reduced_costs))
+
+        return entering if reduced_costs[entering] < -self.tolerance else None
+
+
+class PartialPricing(PricingStrategy):
+    """Partial and multiple pricing.
+
+    A major iteration prices the columns segment by segment, starting
+    where the previous scan stopped, until a segment with attractive
+    columns is found; the best of them are kept as a candidate list.
+    Minor iterations reprice only the candidate list until it is
+    exhausted.
+
+    Args:
+        segments (int, optional): Number of segments the columns are
+            split into. Defaults to 8.
+        candidates (int, optional): Size of the candidate list. Defaults
+            to 8.
+        tolerance (float, optional): Optimality tolerance. Defaults to
+            1e-9.
+    """
+
+    segments: int
+    """Number of segments the columns are split into."""
+    candidates: int
+    """Size of the candidate list."""
+
+    _start: int
+    """First column of the next segment to scan."""
+    _candidates: np.ndarray
+    """Candidate list of the minor iterations."""
+
+    def __init__(
+        self, segments: int = 8, candidates: int = 8, tolerance: float = 1e-9
+    ) -> None:
+        super().__init__(tolerance)
+
+        self.segments = segments
+        self.candidates = candidates
+
+        self._start = 0
+        self._candidates = np.zeros(0, dtype=np.int64)
+
+    def initialize(self, A: DenseMatrix | SparseMatrix, basis: np.ndarray) -> None:
+        super().initialize(A, basis)
+
+        self._start = 0
+        self._candidates = np.zeros(0, dtype=np.int64)
+
+    def select(
+        self, A: DenseMatrix | SparseMatrix, duals: np.ndarray, c: np.ndarray
+    ) -> int | None:
+        # Minor iteration: reprice the candidate list only.
+        entering = self._best(A, duals, c, self._candidates, keep=False)
+        if entering is not None:
+            return entering
+
+        # Major iteration: scan the segments in a round-robin fashion.
+        n = A.shape[1]
+        size = max(-(-n // self.segments), 1)
+
+        for _ in range(-(-n // size)):
+            end = min(self._start + size, n)
+            segment = np.arange(self._start, end)
+
+            self._start = end % n
+
+            entering = self._best(A, duals, c, segment, keep=True)
+            if entering is not None:
+                return entering
+
+        return None
+
+    def _best(
+        self,
+        A: DenseMatrix | SparseMatrix,
+        duals: np.ndarray,
+        c: np.ndarray,
+        columns: np.ndarray,
+        keep: bool,
+    ) -> int | None:
+        """Prices the given columns and picks the most attractive one.
+
+        Args:
+            A (DenseMatrix | SparseMatrix): The constraint matrix.
+            duals (numpy.ndarray): Simplex multipliers of the basis.
+            c (numpy.ndarray): Objective coefficients.
+            columns (numpy.ndarray): Indices of the columns to price.
+            keep (bool): Replace the candidate list with the best
+                attractive columns.
+
+        Returns:
+            int | None: Index of the entering column, or None if no
+                column is attractive.
+        """
+        if columns.shape[0] == 0:
+            return None
+
+        reduced_costs = A.rmatvec_columns(duals, columns) - c[columns]
+        reduced_costs[self._is_basic[columns]] = 0.0
+
+        attractive = reduced_costs < -self.tolerance
+        columns, reduced_costs = columns[attractive], reduced_costs[attractive]
+
+        order = np.argsort(reduced_costs, kind="stable")
+        if keep:
+            self._candidates = columns[order[: self.candidates]]
+        else:
+            self._candidates = columns[order]
+
+        if columns.shape[0] == 0:
+            return None
+
+        entering = int(self._candidates[0])
+        self._candidates = self._candidates[1:]
+
+        return entering
+
+
+class DevexPricing(PricingStrategy):
+    """Devex pricing of Forrest and Goldfarb.
+
+    Reduced costs are scaled by approximate reference weights of the
+    edge directions. The weights start at 1 in the reference framework
+    of the starting basis and are updated from the pivot row.
+
+    Args:
+        tolerance (float, optional): Optimality tolerance. Defaults to
+            1e-9.
+    """
+
+    _weights: np.ndarray
+    """Reference weights of the columns."""
+
+    def initialize(self, A: DenseMatrix | SparseMatrix, basis: np.ndarray) -> None:
+        super().initialize(A, basis)
+
+        self._weights = np.ones(A.shape[1])
+
+    def select(
+        self, A: DenseMatrix | SparseMatrix, duals: np.ndarray, c: np.ndarray
+    ) -> int | None:
+        reduced_costs = self._reduced_costs(A, duals, c)
+
+        scores = np.where(
+            reduced_costs < -self.tolerance, reduced_costs**2 / self._weights, 0.0
+        )
+        entering = int(np.argmax(scores))
+
+        return entering if scores[entering] > 0.0 else None
+
+    def update(
+        self,
+        A: DenseMatrix | SparseMatrix,
+        factorization: BasisFactorization,
+        entering: int,
+        leaving: int,
+        leaving_column: int,
+        alpha: np.ndarray,
+    ) -> None:
+        ratios = self._pivot_row(A, factorization, leaving) / alpha[leaving]
+        weight = self._weights[entering]
+
+        self._weights = np.maximum(self._weights, ratios**2 * weight)
+        self._weights[leaving_column] = max(weight / alpha[leaving] ** 2, 1.0)
+
+        super().update(A, factorization, entering, leaving, leaving_column, alpha)
+
+
+class SteepestEdgePricing(PricingStrategy):
+    """Primal steepest-edge pricing with the Goldfarb-Reid update.
+
+    Reduced costs are scaled by the norms `1 + |B^-1 a_j|^2` of the edge
+    directions. The norms are computed for the starting basis, straight
+    from the columns of A for the slack basis and by solving with the
+    basis otherwise, e.g. for a crashed or warm-started one, and updated
+    exactly after every pivot.
+
+    Args:
+        tolerance (float, optional): Optimality tolerance. Defaults to
+            1e-9.
+    """
+
+    _weights: np.ndarray
+    """Edge direction norms of the columns."""
+
+    def initialize(self, A: DenseMatrix | SparseMatrix, basis: np.ndarray) -> None:
+        super().initialize(A, basis)
+
+        self._weights = 1.0 + A.column_norms()
+
+        # The norms of the columns are those of the edge directions when
+        # the basis is a signed permutation, e.g. the slack basis.
+        B = A.columns(basis)
+        nonzeros = B[B != 0.0]
+        if nonzeros.shape[0] == basis.shape[0] and np.all(np.abs(nonzeros) == 1.0):
+            return
+
+        factorization = LUFactorization(B)
+        for start in range(0, A.shape[1], _BLOCK):
+            indices = np.arange(start, min(start + _BLOCK, A.shape[1]))
+            directions = factorization.solve(A.columns(indices))
+
+            self._weights[indices] = 1.0 + np.einsum(
+                "ij,ij->j", directions, directions
+            )
+
+    def select(
+        self, A: DenseMatrix | SparseMatrix, duals: np.ndarray, c: np.ndarray
+    ) -> int | None:
+        reduced_costs = self._reduced_costs(A, duals, c)
+
+        scores = np.where(
+            reduced_costs < -self.tolerance, reduced_costs**2 / self._weights, 0.0
+        )
+        entering = int(np.argmax(scores))
+
+        return entering if scores[entering] > 0.0 else None
+
+    def update(
+        self,
+        A: DenseMatrix | SparseMatrix,
+        factorization: BasisFactorization,
+        entering: int,
+        leaving: int,
+        leaving_column: int,
+        alpha: np.ndarray,
+    ) -> None:
+        ratios = self._pivot_row(A, factorization, leaving) / alpha[leaving]
+        products = A.rmatvec(factorization.btran(alpha))
+        weight = 1.0 + alpha @ alpha
+
+        self._weights = np.maximum(
+            self._weights - 2.0 * ratios * products + ratios**2 * weight,
+            1.0 + ratios**2,
+        )
+        self._weights[leaving_column] = max(weight / alpha[leaving] ** 2, 1.0)
+
+        super().update(A, factorization, entering, leaving, leaving_column, alpha)
+
+
+__all__ = (
+    "PricingStrategy",
+    "DantzigPricing",
+    "PartialPricing",
+    "DevexPricing",
+    "SteepestEdgePricing",
+)
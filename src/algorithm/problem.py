@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from algorithm.matrix import DenseMatrix, SparseMatrix
+from ast_parser.coo import CooEquations
+from ast_parser.parser import EquationKind
+
+
+@dataclass
+class StandardForm:
+    """Linear program `max c x, A x = b, x >= 0` obtained by adding one
+    slack column to every inequality row."""
+
+    A: DenseMatrix | SparseMatrix
+    """Constraint matrix, structural columns followed by slacks."""
+    b: np.ndarray
+    """Right-hand side vector."""
+    c: np.ndarray
+    """Objective coefficients, zero for the slacks."""
+    num_structural: int
+    """Number of structural columns."""
+    slack_rows: np.ndarray
+    """Row of every slack column."""
+    slack_signs: np.ndarray
+    """Coefficient of every slack column, 1 for `<=` rows and -1 for
+    `>=` rows."""
+
+    def slack_columns(self) -> np.ndarray:
+        """Maps every row to its slack column.
+
+        Returns:
+            numpy.ndarray: Index of the slack column of every row, -1
+                for equality rows.
+        """
+        columns = np.full(self.A.shape[0], -1, dtype=np.int64)
+        columns[self.slack_rows] = self.num_structural + np.arange(
+            self.slack_rows.shape[0]
+        )
+
+        return columns
+
+
+@dataclass
+class LinearProgram:
+    """Linear program `max c x, A x (<=, =, >=) b, x >= 0`."""
+
+    A: DenseMatrix | SparseMatrix
+    """Constraint matrix of shape (m, n)."""
+    b: np.ndarray
+    """Right-hand side vector of length m."""
+    c: np.ndarray
+    """Objective coefficients of length n."""
+    senses: tuple[EquationKind, ...]
+    """Relationship of every row."""
+    variable_names: tuple[str, ...]
+    """Name of every column."""
+    row_names: tuple[str, ...]
+    """Name of every row."""
+
+    @classmethod
+    def from_coo(
+        cls, equations: CooEquations, sparse: bool = False, objective: str = "Z"
+    ) -> LinearProgram:
+        """Builds a program from parsed coordinate triplets, the same way
+        Model.from_equations and Model.build interpret the Equations.
+
+        The equation with a non-zero coefficient of the objective
+        variable is the objective function, the others are the rows,
+        named `r_0`, `r_1`, ... The columns are the variables of the
+        objective function, then the other variables in order of
+        appearance.
+
+        Args:
+            equations (CooEquations): The parsed equations.
+            sparse (bool, optional): Store the constraint matrix in
+                compressed sparse form. Defaults to False.
+            objective (str, optional): Name of the objective variable.
+                Defaults to "Z".
+
+        Raises:
+            ValueError: The objective function is missing, repeated or
+                not an equality.
+
+        Returns:
+            LinearProgram: The program.
+        """
+        rows = np.frombuffer(equations.rows, dtype=np.int64)
+        cols = np.frombuffer(equations.columns, dtype=np.int64)
+        values = np.frombuffer(equations.values, dtype=float)
+        symbols = equations.symbols
+
+        m = len(equations)
+
+        is_objective = np.zeros(cols.shape[0], dtype=bool)
+        candidates = np.zeros(0, dtype=np.int64)
+        if objective in symbols:
+            is_objective = cols == symbols.index(objective)
+            totals = np.bincount(
+                rows[is_objective], weights=values[is_objective], minlength=m
+            )
+            candidates = np.flatnonzero(totals != 0.0)
+
+        if any(equations.kinds[i] != EquationKind.EQ for i in candidates):
+            raise ValueError("Objective functions must be equalities")
+        if candidates.shape[0] != 1:
+            raise ValueError("Exactly one objective function Z must be given")
+
+        in_objective = rows == candidates[0]
+        objective_terms = in_objective & ~is_objective
+
+        # Columns in order of first appearance, the objective function
+        # first.
+        order = np.concatenate(
+            (np.flatnonzero(objective_terms), np.flatnonzero(~in_objective))
+        )
+        names, first = np.unique(cols[order], return_index=True)
+        names = names[np.argsort(first, kind="stable")]
+
+        positions = np.full(len(symbols), -1, dtype=np.int64)
+        positions[names] = np.arange(names.shape[0])
+
+        n = names.shape[0]
+
+        c = np.zeros(n)
+        np.add.at(c, positions[cols[objective_terms]], -values[objective_terms])
+
+        kept = np.flatnonzero(np.arange(m) != candidates[0])
+        row_rows = rows[~in_objective]
+
+        A = SparseMatrix.from_coo(
+            row_rows - (row_rows > candidates[0]),
+            positions[cols[~in_objective]],
+            values[~in_objective],
+            (m - 1, n),
+        )
+        if not sparse:
+            A = DenseMatrix(A.to_dense())
+
+        return cls(
+            A,
+            np.frombuffer(equations.bounds, dtype=float)[kept].copy(),
+            c,
+            tuple(equations.kinds[i] for i in kept),
+            tuple(symbols.names[j] for j in names),
+            tuple(f"r_{i}" for i in range(m - 1)),
+        )
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Gets the number of rows and columns.
+
+        Returns:
+            tuple[int, int]: The number of rows and columns.
+        """
+        return self.A.shape
+
+    def standard_form(self) -> StandardForm:
+        """Converts the program to the standard form by adding a slack
+        column to every inequality row.
+
+        Returns:
+            StandardForm: The equivalent program with equality rows.
+        """
+        n = self.A.shape[1]
+
+        slack_rows = np.array(
+            [i for i, sense in enumerate(self.senses) if sense != EquationKind.EQ],
+            dtype=np.int64,
+        )
+        slack_signs = np.array(
+            [1.0 if self.senses[i] == EquationKind.LEQ else -1.0 for i in slack_rows]
+        )
+
+        A = self.A.append_unit_columns(slack_rows, slack_signs)
+        c = np.concatenate((np.asarray(self.c, dtype=float), np.zeros(len(slack_rows))))
+
+        return StandardForm(
+            A,
+            np.asarray(self.b, dtype=float),
+            c,
+            n,
+            slack_rows,
+            slack_signs,
+        )
+
+
+__all__ = ("StandardForm", "LinearProgram")
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import cProfile
+import gc
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from typing import ContextManager, Iterator
+
+
+@dataclass
+class StageReport:
+    """Measurements of every run of a stage."""
+
+    name: str
+    """Name of the stage."""
+    calls: int
+    """Number of runs."""
+    wall_time: float
+    """Total elapsed time, in seconds."""
+    cpu_time: float
+    """Total CPU time of the process, in seconds."""
+    peak_memory: int
+    """Largest memory, in bytes, allocated by a run on top of what was
+    allocated when it started. Zero if memory is not traced."""
+    allocated_blocks: int
+    """Memory blocks allocated and still alive at the end of the runs,
+    freed blocks subtracted."""
+    gc_collections: int
+    """Garbage collections, of all generations, during the runs."""
+    profiles: list[str]
+    """Paths of the cProfile dumps of the runs."""
+
+
+@dataclass
+class _ActiveStage:
+    """State of a running stage."""
+
+    report: StageReport
+    """Report the run is added to."""
+    wall_start: float
+    """Wall clock at the start."""
+    cpu_start: float
+    """CPU clock at the start."""
+    blocks_start: int
+    """Allocated blocks at the start."""
+    collections_start: int
+    """Garbage collections at the start."""
+    memory_start: int
+    """Traced memory at the start."""
+    peak: int
+    """Largest traced memory seen in nested stages."""
+    profile: cProfile.Profile | None
+    """Profiler of the run, if it is profiled."""
+
+
+class StageProfiler:
+    """Opt-in instrumentation of the stages of a solve: wall and CPU
+    time, allocations, garbage collections and peak memory of every
+    stage, as a structured report.
+
+    Stages may nest, the measurements of a stage include those of its
+    nested stages. Memory is traced with tracemalloc, started by the
+    outermost stage if it is not already tracing. With a profile
+    directory, every run of an outermost stage is also profiled with
+    cProfile and dumped there.
+
+    Args:
+        memory (bool, optional): Trace the peak memory, which slows the
+            stages down. Defaults to True.
+        profile_dir (str, optional): Directory of the cProfile dumps.
+            Defaults to None, no profiling.
+    """
+
+    memory: bool
+    """Whether the peak memory is traced."""
+    profile_dir: str | None
+    """Directory of the cProfile dumps."""
+
+    _reports: dict[str, StageReport]
+    """Report of every stage, in the order they first ran."""
+    _stack: list[_ActiveStage]
+    """The running stages, innermost last."""
+    _tracing: bool
+    """Whether tracemalloc has been started by the profiler."""
+    _dumps: int
+    """Number of cProfile dumps written."""
+
+    def __init__(self, memory: bool = True, profile_dir: str | None = None) -> None:
+        self.memory = memory
+        self.profile_dir = profile_dir
+
+        self._reports = {}
+        self._stack = []
+        self._tracing = False
+        self._dumps = 0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Measures the body of the context as a run of a stage.
+
+        Args:
+            name (str): Name of the stage.
+
+        Yields:
+            None: Nothing.
+        """
+        report = self._reports.get(name)
+        if report is None:
+            report = self._reports[name] = StageReport(name, 0, 0.0, 0.0, 0, 0, 0, [])
+
+        memory_start = 0
+        if self.memory:
+            if not self._stack and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracing = True
+
+            memory_start, peak = tracemalloc.get_traced_memory()
+            # The peak is reset for this stage, the enclosing one keeps
+            # what it has seen so far.
+            if self._stack:
+                self._stack[-1].peak = max(self._stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+
+        profile = None
+        if self.profile_dir is not None and not any(
+            active.profile for active in self._stack
+        ):
+            profile = cProfile.Profile()
+
+        active = _ActiveStage(
+            report,
+            time.perf_counter(),
+            time.process_time(),
+            sys.getallocatedblocks(),
+            _collections(),
+            memory_start,
+            memory_start,
+            profile,
+        )
+        self._stack.append(active)
+
+        if profile is not None:
+            profile.enable()
+
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+
+            self._stack.pop()
+            self._finish(active)
+
+    def report(self) -> dict:
+        """Gets the measurements of every stage.
+
+        Returns:
+            dict: The stages, in the order they first ran, as plain
+                values that serialize to JSON.
+        """
+        return {"stages": [asdict(report) for report in self._reports.values()]}
+
+    def to_json(self, indent: int | None = 2) -> str:
+        """Serializes the report.
+
+        Args:
+            indent (int, optional): Indentation of the JSON. Defaults to
+                2.
+
+        Returns:
+            str: The report as JSON.
+        """
+        return json.dumps(self.report(), indent=indent)
+
+    def write(self, path: str) -> None:
+        """Writes the report as JSON.
+
+        Args:
+            path (str): Path of the file.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.to_json())
+            file.write("\n")
+
+    def _finish(self, active: _ActiveStage) -> None:
+        """Adds a finished run to the report of its stage.
+
+        Args:
+            active (_ActiveStage): The run.
+        """
+        report = active.report
+
+        report.calls += 1
+        report.wall_time += time.perf_counter() - active.wall_start
+        report.cpu_time += time.process_time() - active.cpu_start
+        report.allocated_blocks += sys.getallocatedblocks() - active.blocks_start
+        report.gc_collections += _collections() - active.collections_start
+
+        if self.memory and tracemalloc.is_tracing():
+            peak = max(active.peak, tracemalloc.get_traced_memory()[1])
+            report.peak_memory = max(report.peak_memory, peak - active.memory_start)
+
+            if self._stack:
+                self._stack[-1].peak = max(self._stack[-1].peak, peak)
+            elif self._tracing:
+                tracemalloc.stop()
+                self._tracing = False
+
+        if active.profile is not None:
+            os.makedirs(self.profile_dir, exist_ok=True)
+
+            self._dumps += 1
+            path = os.path.join(
+                self.profile_dir,
+                f"{self._dumps:03d}-{re.sub(r'[^A-Za-z0-9_.-]+', '_', report.name)}.prof",
+            )
+            active.profile.dump_stats(path)
+            report.profiles.append(path)
+
+
+def _collections() -> int:
+    """Counts the garbage collections so far.
+
+    Returns:
+        int: The collections of all generations.
+    """
+    return sum(generation["collections"] for generation in gc.get_stats())
+
+
+def profiled(profiler: StageProfiler | None, name: str) -> ContextManager[None]:
+    """Measures a stage if profiling is enabled.
+
+    Args:
+        profiler (StageProfiler | None): The profiler, None to disable
+            profiling.
+        name (str): Name of the stage.
+
+    Returns:
+        ContextManager[None]: The context measuring the stage, or doing
+            nothing.
+    """
+    if profiler is None:
+        return nullcontext()
+
+    return profiler.stage(name)
+
+
+__all__ = ("StageReport", "StageProfiler", "profiled")
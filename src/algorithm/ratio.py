@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+
+import numpy as np
+
+
+class RatioTest(str, Enum):
+    """Rule for choosing the leaving variable."""
+
+    TEXTBOOK = "textbook"
+    """Exact minimum ratio, ties broken by the largest pivot."""
+    HARRIS = "harris"
+    """Harris two-pass test with relaxed bounds."""
+
+
+@dataclass
+class RatioTestResult:
+    """Outcome of a ratio test."""
+
+    row: int | None
+    """Position of the leaving variable in the basis, or None if the
+    entering column is unbounded."""
+    step: float
+    """Step length of the entering variable."""
+    ties: np.ndarray
+    """Positions of all candidates that are eligible to leave."""
+
+
+def textbook_ratio_test(
+    x_B: np.ndarray, alpha: np.ndarray, pivot_tolerance: float = 1e-9
+) -> RatioTestResult:
+    """Chooses the leaving row by the exact minimum ratio.
+
+    All rows attaining the minimum ratio are reported as ties, the one
+    with the largest pivot element leaves.
+
+    Args:
+        x_B (numpy.ndarray): Values of the basic variables.
+        alpha (numpy.ndarray): The entering column transformed by the
+            basis.
+        pivot_tolerance (float, optional): Smallest acceptable pivot
+            element. Defaults to 1e-9.
+
+    Returns:
+        RatioTestResult: The leaving row, the step and the ties.
+    """
+    candidates = np.flatnonzero(alpha > pivot_tolerance)
+    if candidates.shape[0] == 0:
+        return RatioTestResult(None, np.inf, candidates)
+
+    ratios = np.maximum(x_B[candidates], 0.0) / alpha[candidates]
+    step = ratios.min()
+
+    ties = candidates[ratios <= step + pivot_tolerance * max(1.0, step)]
+    row = int(ties[np.argmax(alpha[ties])])
+
+    return RatioTestResult(row, float(step), ties)
+
+
+def harris_ratio_test(
+    x_B: np.ndarray,
+    alpha: np.ndarray,
+    pivot_tolerance: float = 1e-9,
+    feasibility_tolerance: float = 1e-9,
+) -> RatioTestResult:
+    """Chooses the leaving row by the Harris two-pass ratio test.
+
+    The first pass computes the largest step that keeps every basic
+    variable within the feasibility tolerance of its bound. The second
+    pass picks, among the rows whose exact ratio does not exceed that
+    step, the one with the largest pivot element, trading a tiny bound
+    violation for a numerically stable pivot.
+
+    Args:
+        x_B (numpy.ndarray): Values of the basic variables.
+        alpha (numpy.ndarray): The entering column transformed by the
+            basis.
+        pivot_tolerance (float, optional): Smallest acceptable pivot
+            element. Defaults to 1e-9.
+        feasibility_tolerance (float, optional): Allowed violation of
+            the lower bounds. Defaults to 1e-9.
+
+    Returns:
+        RatioTestResult: The leaving row, the step and the ties.
+    """
+    candidates = np.flatnonzero(alpha > pivot_tolerance)
+    if candidates.shape[0] == 0:
+        return RatioTestResult(None, np.inf, candidates)
+
+    pivots = alpha[candidates]
+
+    # First pass: maximum step with relaxed bounds.
+    relaxed_step = ((x_B[candidates] + feasibility_tolerance) / pivots).min()
+
+    # Second pass: largest pivot among the rows within the relaxed step.
+    ratios = x_B[candidates] / pivots
+    ties = candidates[ratios <= relaxed_step]
+    row = int(ties[np.argmax(alpha[ties])])
+
+    return RatioTestResult(row, max(float(x_B[row] / alpha[row]), 0.0), ties)
+
+
+__all__ = (
+    "RatioTest",
+    "RatioTestResult",
+    "textbook_ratio_test",
+    "harris_ratio_test",
+)
@@ -0,0 +1,384 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from enum import Enum
+
+import numpy as np
+
+from algorithm.events import PivotCallback, PivotEvent
+from algorithm.lu import BasisFactorization
+from algorithm.matrix import DenseMatrix, SparseMatrix, as_matrix
+from algorithm.pricing import DantzigPricing, PricingStrategy
+from algorithm.ratio import (
+    RatioTest,
+    RatioTestResult,
+    harris_ratio_test,
+    textbook_ratio_test,
+)
+
+
+class SimplexStatus(str, Enum):
+    """Termination status of a simplex engine."""
+
+    OPTIMAL = "optimal"
+    """An optimal basis has been found."""
+    UNBOUNDED = "unbounded"
+    """The objective function is unbounded over the feasible region."""
+    INFEASIBLE = "infeasible"
+    """The constraints have no feasible solution."""
+    ITERATION_LIMIT = "iteration limit"
+    """The iteration limit has been reached before optimality."""
+
+
+@dataclass
+class SimplexResult:
+    """Outcome of a simplex solve."""
+
+    status: SimplexStatus
+    """Termination status of the engine."""
+    x: np.ndarray
+    """Values of all columns of the constraint matrix."""
+    objective: float
+    """Value of the objective function at x."""
+    basis: np.ndarray
+    """Indices of the basic columns, one per constraint row."""
+    duals: np.ndarray
+    """Simplex multipliers of the constraint rows."""
+    iterations: int
+    """Number of pivots performed."""
+
+
+class RevisedSimplex:
+    """Primal revised simplex method for `max c x, A x = b, x >= 0`.
+
+    Instead of inverting the basis matrix every iteration, the engine
+    keeps a BasisFactorization that is updated after each pivot and
+    refactorized from scratch only periodically.
+
+    A SparseMatrix saves the memory and the work of the constraint
+    matrix in pricing and column access, the basis is still factorized
+    as a dense (m, m) matrix.
+
+    Args:
+        A (numpy.ndarray | DenseMatrix | SparseMatrix): Constraint
+            matrix of shape (m, n), dense or sparse.
+        b (numpy.ndarray): Right-hand side vector of length m.
+        c (numpy.ndarray): Objective coefficients of length n.
+        basis (numpy.ndarray, optional): Indices of the starting basic
+            columns. Must be primal feasible. Defaults to the last m
+            columns, i.e. the slack basis.
+        refactorization_frequency (int, optional): Number of pivots
+            between two fresh factorizations. Defaults to 64.
+        tolerance (float, optional): Optimality and pivot tolerance.
+            Defaults to 1e-9.
+        max_iterations (int, optional): Maximum number of pivots.
+            Defaults to a limit proportional to the problem size.
+        ratio_test (RatioTest, optional): Rule for choosing the leaving
+            variable. Defaults to RatioTest.HARRIS.
+        pricing (PricingStrategy, optional): Rule for choosing the
+            entering variable. Defaults to DantzigPricing.
+        callback (PivotCallback, optional): Called with a PivotEvent
+            after every pivot, e.g. a PivotTrace. Defaults to None.
+    """
+
+    _A: DenseMatrix | SparseMatrix
+    """Constraint matrix."""
+    _b: np.ndarray
+    """Right-hand side vector."""
+    _c: np.ndarray
+    """Objective coefficients."""
+
+    _basis: np.ndarray
+    """Indices of the basic columns."""
+    _factorization: BasisFactorization
+    """Factorization of the current basis matrix."""
+    _x_B: np.ndarray
+    """Values of the basic variables."""
+
+    tolerance: float
+    """Optimality and pivot tolerance."""
+    max_iterations: int
+    """Maximum number of pivots."""
+    ratio_test: RatioTest
+    """Rule for choosing the leaving variable."""
+    pricing: PricingStrategy
+    """Rule for choosing the entering variable."""
+    callback: PivotCallback | None
+    """Called after every pivot."""
+
+    def __init__(
+        self,
+        A: np.ndarray | DenseMatrix | SparseMatrix,
+        b: np.ndarray,
+        c: np.ndarray,
+        basis: np.ndarray | None = None,
+        refactorization_frequency: int = 64,
+        tolerance: float = 1e-9,
+        max_iterations: int | None = None,
+        ratio_test: RatioTest = RatioTest.HARRIS,
+        pricing: PricingStrategy | None = None,
+        callback: PivotCallback | None = None,
+    ) -> None:
+        self._A = as_matrix(A)
+        self._b = np.asarray(b, dtype=float).reshape(-1)
+        self._c = np.asarray(c, dtype=float).reshape(-1)
+
+        m, n = self._A.shape
+
+        if basis is None:
+            basis = np.arange(n - m, n)
+
+        self._basis = np.array(basis, dtype=int)
+
+        self.tolerance = tolerance
+        self.max_iterations = (
+            max_iterations if max_iterations is not None else max(50 * (m + n), 1)
+        )
+        self.ratio_test = RatioTest(ratio_test)
+        self.pricing = pricing if pricing is not None else DantzigPricing(tolerance)
+        self.callback = callback
+
+        self._factorization = BasisFactorization(
+            self._A.columns(self._basis), refactorization_frequency, tolerance * 1e-2
+        )
+        self._x_B = self._factorization.ftran(self._b)
+
+    @property
+    def basis(self) -> np.ndarray:
+        """Gets the indices of the current basic columns.
+
+        Returns:
+            numpy.ndarray: The indices of the basic columns.
+        """
+        return self._basis
+
+    @property
+    def primal_feasible(self) -> bool:
+        """Checks if the basic variables are non-negative.
+
+        Returns:
+            bool: True if the basis is primal feasible, False otherwise.
+        """
+        return bool(self._x_B.min(initial=0.0) >= -self.tolerance)
+
+    @property
+    def dual_feasible(self) -> bool:
+        """Checks if the reduced costs are non-negative.
+
+        Returns:
+            bool: True if the basis is dual feasible, False otherwise.
+        """
+        return bool(self._reduced_costs().min(initial=0.0) >= -self.tolerance)
+
+    def solve(self) -> SimplexResult:
+        """Runs the pivot loop until optimality, unboundedness or the
+        iteration limit.
+
+        Returns:
+            SimplexResult: The outcome of the solve.
+        """
+        iterations = 0
+        callback = self.callback
+
+        self.pricing.initialize(self._A, self._basis)
+
+        while iterations < self.max_iterations:
+            if callback is not None:
+                start = time.perf_counter()
+
+            duals = self._factorization.btran(self._c[self._basis])
+
+            entering = self._price(duals)
+            if entering is None:
+                return self._result(SimplexStatus.OPTIMAL, iterations)
+
+            alpha = self._factorization.ftran(self._A.column(entering))
+
+            ratio = self._ratio_test(alpha)
+            if ratio.row is None:
+                return self._result(SimplexStatus.UNBOUNDED, iterations)
+
+            if callback is not None:
+                # The pivot updates alpha and the basis in place.
+                leaving = int(self._basis[ratio.row])
+                pivot = float(alpha[ratio.row])
+                dual_infeasibility = self._dual_infeasibility(duals)
+
+            self._pivot(entering, ratio.row, alpha, ratio.step)
+
+            iterations += 1
+
+            if callback is not None:
+                callback(
+                    self._event(
+                        iterations,
+                        entering,
+                        leaving,
+                        ratio.row,
+                        pivot,
+                        ratio.step,
+                        dual_infeasibility,
+                        start,
+                    )
+                )
+
+        return self._result(SimplexStatus.ITERATION_LIMIT, iterations)
+
+    def _reduced_costs(self) -> np.ndarray:
+        """Computes the reduced costs of the current basis, zero for the
+        basic columns.
+
+        Returns:
+            numpy.ndarray: The reduced costs.
+        """
+        duals = self._factorization.btran(self._c[self._basis])
+
+        reduced_costs = self._A.rmatvec(duals) - self._c
+        reduced_costs[self._basis] = 0.0
+
+        return reduced_costs
+
+    def _price(self, duals: np.ndarray) -> int | None:
+        """Chooses the entering column by the configured pricing
+        strategy.
+
+        Args:
+            duals (numpy.ndarray): Simplex multipliers of the basis.
+
+        Returns:
+            int | None: Index of the entering column, or None if the
+                basis is optimal.
+        """
+        return self.pricing.select(self._A, duals, self._c)
+
+    def _ratio_test(self, alpha: np.ndarray) -> RatioTestResult:
+        """Chooses the leaving row by the configured ratio test.
+
+        Args:
+            alpha (numpy.ndarray): The entering column transformed by
+                the basis.
+
+        Returns:
+            RatioTestResult: The leaving row, the step and the ties.
+        """
+        if self.ratio_test == RatioTest.HARRIS:
+            return harris_ratio_test(self._x_B, alpha, self.tolerance, self.tolerance)
+
+        return textbook_ratio_test(self._x_B, alpha, self.tolerance)
+
+    def _pivot(
+        self, entering: int, leaving: int, alpha: np.ndarray, theta: float
+    ) -> None:
+        """Exchanges the leaving basic column with the entering one.
+
+        Args:
+            entering (int): Index of the entering column.
+            leaving (int): Position of the leaving column in the basis.
+            alpha (numpy.ndarray): The entering column transformed by
+                the basis.
+            theta (float): Step length of the entering variable.
+        """
+        self.pricing.update(
+            self._A,
+            self._factorization,
+            entering,
+            leaving,
+            int(self._basis[leaving]),
+            alpha,
+        )
+
+        self._basis[leaving] = entering
+
+        if self._factorization.requires_refactorization:
+            self._factorization.refactorize(self._A.columns(self._basis))
+            self._x_B = self._factorization.ftran(self._b)
+
+            return
+
+        self._factorization.update(leaving, alpha)
+
+        self._x_B -= theta * alpha
+        self._x_B[leaving] = theta
+
+    def _dual_infeasibility(self, duals: np.ndarray) -> float:
+        """Measures how far the basis is from optimality, over every
+        column whatever the pricing strategy looks at.
+
+        Args:
+            duals (numpy.ndarray): Simplex multipliers of the basis.
+
+        Returns:
+            float: The largest negative part of the reduced costs.
+        """
+        reduced_costs = self._A.rmatvec(duals) - self._c
+        reduced_costs[self._basis] = 0.0
+
+        return max(0.0, -float(reduced_costs.min()))
+
+    def _event(
+        self,
+        iteration: int,
+        entering: int,
+        leaving: int,
+        row: int,
+        pivot: float,
+        step: float,
+        dual_infeasibility: float,
+        start: float,
+    ) -> PivotEvent:
+        """Builds the PivotEvent of a pivot just performed.
+
+        Args:
+            iteration (int): Number of pivots performed.
+            entering (int): Index of the entering column.
+            leaving (int): Index of the leaving column.
+            row (int): Position of the exchange in the basis.
+            pivot (float): Pivot element.
+            step (float): Step length of the entering variable.
+            dual_infeasibility (float): Largest negative part of the
+                reduced costs of the basis the pivot started from.
+            start (float): Performance counter at the start of the
+                iteration.
+
+        Returns:
+            PivotEvent: The pivot.
+        """
+        return PivotEvent(
+            iteration,
+            0,
+            entering,
+            leaving,
+            row,
+            float(self._c[self._basis] @ self._x_B),
+            max(0.0, -float(self._x_B.min(initial=0.0))),
+            dual_infeasibility,
+            pivot,
+            float(step),
+            time.perf_counter() - start,
+        )
+
+    def _result(self, status: SimplexStatus, iterations: int) -> SimplexResult:
+        """Builds the SimplexResult of the current basis.
+
+        Args:
+            status (SimplexStatus): Termination status of the engine.
+            iterations (int): Number of pivots performed.
+
+        Returns:
+            SimplexResult: The outcome of the solve.
+        """
+        x = np.zeros(self._c.shape[0])
+        x[self._basis] = self._x_B
+
+        return SimplexResult(
+            status,
+            x,
+            float(self._c @ x),
+            self._basis.copy(),
+            self._factorization.btran(self._c[self._basis]),
+            iterations,
+        )
+
+
+__all__ = ("SimplexStatus", "SimplexResult", "RevisedSimplex")
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+from enum import Enum
+
+import numpy as np
+
+from algorithm.matrix import DenseMatrix, SparseMatrix
+
+
+class ScalingMethod(str, Enum):
+    """Rule for choosing the row and column factors."""
+
+    GEOMETRIC = "geometric"
+    """Iterated geometric mean of the smallest and largest entry of
+    every row and column, followed by an equilibration pass."""
+    EQUILIBRATION = "equilibration"
+    """Largest entry of every row, then of every column, scaled to
+    one."""
+
+
+class Scaling:
+    """Row and column scaling of a linear program `max c x, A x = b`.
+
+    The scaled program is `max (S c) x', (R A S) x' = R b` with diagonal
+    R and S, whose solution maps back by `x = S x'` and `y = R y'`. The
+    factors are rounded to powers of two, so scaling and unscaling are
+    exact in floating point.
+
+    Args:
+        A (DenseMatrix | SparseMatrix): Constraint matrix to scale.
+        method (ScalingMethod, optional): Rule for choosing the factors.
+            Defaults to ScalingMethod.GEOMETRIC.
+        passes (int, optional): Maximum number of geometric mean passes.
+            Defaults to 8.
+    """
+
+    method: ScalingMethod
+    """Rule for choosing the factors."""
+    row_factors: np.ndarray
+    """Factor of every row, the diagonal of R."""
+    column_factors: np.ndarray
+    """Factor of every column, the diagonal of S."""
+
+    def __init__(
+        self,
+        A: DenseMatrix | SparseMatrix,
+        method: ScalingMethod = ScalingMethod.GEOMETRIC,
+        passes: int = 8,
+    ) -> None:
+        self.method = ScalingMethod(method)
+
+        m, n = A.shape
+        rows, cols, values = (np.asarray(array) for array in A.to_coo())
+        magnitudes = np.abs(values)
+
+        self.row_factors = np.ones(m)
+        self.column_factors = np.ones(n)
+
+        if self.method == ScalingMethod.GEOMETRIC:
+            spread = self._spread(magnitudes)
+
+            for _ in range(passes):
+                self._geometric_pass(0, rows, cols, magnitudes)
+                self._geometric_pass(1, rows, cols, magnitudes)
+
+                # Stop once a pass improves the spread by less than 10%.
+                current = self._spread(self._scaled(magnitudes, rows, cols))
+                if current > 0.9 * spread:
+                    break
+
+                spread = current
+
+        self._equilibration_pass(0, rows, cols, magnitudes)
+        self._equilibration_pass(1, rows, cols, magnitudes)
+
+    def scale_matrix(self, A: DenseMatrix | SparseMatrix) -> DenseMatrix | SparseMatrix:
+        """Scales a constraint matrix.
+
+        Args:
+            A (DenseMatrix | SparseMatrix): The matrix to scale.
+
+        Returns:
+            DenseMatrix | SparseMatrix: The matrix `R A S`.
+        """
+        return A.scaled(self.row_factors, self.column_factors)
+
+    def scale_rhs(self, b: np.ndarray) -> np.ndarray:
+        """Scales a right-hand side vector.
+
+        Args:
+            b (numpy.ndarray): The vector to scale.
+
+        Returns:
+            numpy.ndarray: The vector `R b`.
+        """
+        return np.asarray(b, dtype=float) * self.row_factors
+
+    def scale_objective(self, c: np.ndarray) -> np.ndarray:
+        """Scales an objective vector.
+
+        Args:
+            c (numpy.ndarray): The vector to scale.
+
+        Returns:
+            numpy.ndarray: The vector `S c`.
+        """
+        return np.asarray(c, dtype=float) * self.column_factors
+
+    def unscale_primal(self, x: np.ndarray) -> np.ndarray:
+        """Maps values of the scaled columns back.
+
+        Args:
+            x (numpy.ndarray): Values of the scaled columns.
+
+        Returns:
+            numpy.ndarray: The values `S x'`.
+        """
+        return np.asarray(x) * self.column_factors
+
+    def unscale_duals(self, y: np.ndarray) -> np.ndarray:
+        """Maps duals of the scaled rows back.
+
+        Args:
+            y (numpy.ndarray): Duals of the scaled rows.
+
+        Returns:
+            numpy.ndarray: The duals `R y'`.
+        """
+        return np.asarray(y) * self.row_factors
+
+    def _scaled(
+        self, magnitudes: np.ndarray, rows: np.ndarray, cols: np.ndarray
+    ) -> np.ndarray:
+        """Applies the current factors to the entry magnitudes.
+
+        Args:
+            magnitudes (numpy.ndarray): Absolute values of the entries.
+            rows (numpy.ndarray): Row indices of the entries.
+            cols (numpy.ndarray): Column indices of the entries.
+
+        Returns:
+            numpy.ndarray: The scaled magnitudes.
+        """
+        return magnitudes * self.row_factors[rows] * self.column_factors[cols]
+
+    @staticmethod
+    def _spread(magnitudes: np.ndarray) -> float:
+        """Computes the ratio of the largest to the smallest entry.
+
+        Args:
+            magnitudes (numpy.ndarray): Absolute values of the entries.
+
+        Returns:
+            float: The ratio, 1.0 for an empty matrix.
+        """
+        if magnitudes.shape[0] == 0:
+            return 1.0
+
+        return float(magnitudes.max() / magnitudes.min())
+
+    def _geometric_pass(
+        self, axis: int, rows: np.ndarray, cols: np.ndarray, magnitudes: np.ndarray
+    ) -> None:
+        """Divides every row or column by the geometric mean of its
+        smallest and largest scaled entry.
+
+        Args:
+            axis (int): 0 to scale the rows, 1 to scale the columns.
+            rows (numpy.ndarray): Row indices of the entries.
+            cols (numpy.ndarray): Column indices of the entries.
+            magnitudes (numpy.ndarray): Absolute values of the entries.
+        """
+        lines, factors = self._lines(axis, rows, cols)
+        scaled = self._scaled(magnitudes, rows, cols)
+
+        largest = np.zeros(factors.shape[0])
+        smallest = np.full(factors.shape[0], np.inf)
+        np.maximum.at(largest, lines, scaled)
+        np.minimum.at(smallest, lines, scaled)
+
+        present = largest > 0.0
+        factors[present] *= self._power_of_two(
+            1.0 / np.sqrt(largest[present] * smallest[present])
+        )
+
+    def _equilibration_pass(
+        self, axis: int, rows: np.ndarray, cols: np.ndarray, magnitudes: np.ndarray
+    ) -> None:
+        """Divides every row or column by its largest scaled entry.
+
+        Args:
+            axis (int): 0 to scale the rows, 1 to scale the columns.
+            rows (numpy.ndarray): Row indices of the entries.
+            cols (numpy.ndarray): Column indices of the entries.
+            magnitudes (numpy.ndarray): Absolute values of the entries.
+        """
+        lines, factors = self._lines(axis, rows, cols)
+        scaled = self._scaled(magnitudes, rows, cols)
+
+        largest = np.zeros(factors.shape[0])
+        np.maximum.at(largest, lines, scaled)
+
+        present = largest > 0.0
+        factors[present] *= self._power_of_two(1.0 / largest[present])
+
+    def _lines(
+        self, axis: int, rows: np.ndarray, cols: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Selects the rows or the columns.
+
+        Args:
+            axis (int): 0 for the rows, 1 for the columns.
+            rows (numpy.ndarray): Row indices of the entries.
+            cols (numpy.ndarray): Column indices of the entries.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: The line index of every
+                entry and the factors of the lines.
+        """
+        if axis == 0:
+            return rows, self.row_factors
+
+        return cols, self.column_factors
+
+    @staticmethod
+    def _power_of_two(factors: np.ndarray) -> np.ndarray:
+        """Rounds factors to the nearest powers of two.
+
+        Args:
+            factors (numpy.ndarray): Positive factors.
+
+        Returns:
+            numpy.ndarray: The rounded factors.
+        """
+        return np.exp2(np.round(np.log2(factors)))
+
+
+__all__ = ("ScalingMethod", "Scaling")
@@ -1,4 +1,9 @@
 import numpy as np
+from algorithm.errors import InfeasibleException, SolverException, UnboundedException
+from algorithm.matrix import SparseMatrix
+from algorithm.profiling import profiled
+from algorithm.revised import SimplexStatus
+from algorithm.two_phase import TwoPhaseSimplex
 from ast_parser.parser import EquationKind  # Assuming EquationKind is imported from another module
 
 class Solver:
@@ -9,8 +14,38 @@ class Solver:
     Args:
         objective_functions (list of Equation objects): List of objective functions.
         constraints (list of Equation objects): List of constraint equations.
+        sparse (bool, optional): Store the constraint matrix in compressed
+            sparse form instead of a dense array. Defaults to False.
+        pricing (PricingStrategy, optional): Rule for choosing the entering
+            variable. Defaults to DantzigPricing.
+        profiler (StageProfiler, optional): Measures the matrix assembly
+            and pivoting stages. Defaults to None, no measurements.
+        callback (PivotCallback, optional): Called with a PivotEvent after
+            every pivot, e.g. a PivotTrace. Defaults to None.
     """
-    def __init__(self, objective_functions, constraints):
+    def __init__(self, objective_functions, constraints, sparse=False, pricing=None, profiler=None, callback=None):
+        self.add_slack_variables(objective_functions, constraints)
+
+        with profiled(profiler, "matrix assembly"):
+            A, B, C = self.convert_to_matrices(sparse)
+
+        with profiled(profiler, "pivoting"):
+            objective_values, solution, variable_names = self.advanced_simplex(A, B, C, pricing, callback)
+        variable_names = list(variable_names.values())
+        print("The vector of decision variables is : ")
+        for i in range(len(objective_values)):
+            print(variable_names[i], ": ", round(objective_values[i, 0], 2))
+        print("The optimal solution is ", solution , '\n')
+
+    def add_slack_variables(self, objective_functions, constraints):
+        """Takes over the equations, negating the objective function and
+        adding a slack variable to every <= row and a surplus variable to
+        every >= row. The Equations are modified in place.
+
+        Args:
+            objective_functions (list of Equation objects): List of objective functions.
+            constraints (list of Equation objects): List of constraint equations.
+        """
         # Extract objective function variables and negate their coefficients
         self.objective_functions = objective_functions[0].variables
         self.objective_functions.pop('Z')
@@ -24,70 +59,100 @@ class Solver:
         for key in self.objective_functions:
             self.objective_functions[key] *= -1
 
-        # Add slack variables to constraints if necessary
-        for temp_dict in constraints:
-            for key in self.objective_functions.keys():
-                if key not in temp_dict.variables:
-                    temp_dict.variables[key] = 0
-                
-        slack = len(self.constraints)
         i = 0
-        
+
+        # Add slack variables to <= rows and surplus variables to >= rows
         for _, constraint in enumerate(self.constraints):
-            if constraint.kind == EquationKind.LEQ:
-                constraint.variables["s_" + str(i)] = 1.0
-                self.objective_functions["s_" + str(i)] = 0
-                i += 1
+            if constraint.kind == EquationKind.EQ:
+                continue
 
-        while i < slack:
-            constraint.variables["s_" + str(i)] = 1.0
+            constraint.variables["s_" + str(i)] = 1.0 if constraint.kind == EquationKind.LEQ else -1.0
             self.objective_functions["s_" + str(i)] = 0
             i += 1
 
-        A, B, C = self.convert_to_matrices()
-
-        objective_values, solution, variable_names = self.advanced_simplex(A, B, C)
-        variable_names = list(variable_names.values())
-        print("The vector of decision variables is : ")
-        for i in range(len(objective_values)):
-            print(variable_names[i], ": ", round(objective_values[i, 0], 2))
-        print("The optimal solution is ", solution , '\n')
-
-    def convert_to_matrices(self):
+    def convert_to_matrices(self, sparse=False):
         """Converts objective functions and constraints to matrices.
 
+        Args:
+            sparse (bool, optional): Assemble A as a SparseMatrix from
+                the nonzero coefficients only. Defaults to False.
+
         Returns:
-            A (numpy.ndarray): Coefficients matrix for constraints.
+            A (numpy.ndarray | SparseMatrix): Coefficients matrix for constraints.
             B (numpy.ndarray): Right-hand side matrix for constraints.
             C (numpy.ndarray): Coefficients matrix for objective function.
         """
         num_constraints = len(self.constraints)
         num_variables = len(self.objective_functions)
 
+        if sparse:
+            return self._convert_to_sparse_matrices(num_constraints, num_variables)
+
+        # Column of every variable, looked up once per coefficient
+        columns = {name: j for j, name in enumerate(self.objective_functions)}
+
         A = np.zeros((num_constraints, num_variables))
-        C = np.zeros((1, num_variables))
+        C = np.array([list(self.objective_functions.values())], dtype=float)
         B = np.zeros((num_constraints, 1))
 
         for i, constraint in enumerate(self.constraints):
             for variable_name, coefficient in constraint.variables.items():
-                j = list(self.objective_functions.keys()).index(variable_name)
-                A[i, j] = coefficient
-
-            for variable_name, coefficient in self.objective_functions.items():
-                j = list(self.objective_functions.keys()).index(variable_name)
-                C[0, j] = coefficient
+                A[i, columns[variable_name]] = coefficient
 
             B[i, 0] = constraint.bound
 
         return A, B, C
 
-    def advanced_simplex(self, A, b, C):
-        """Performs the advanced simplex algorithm to find the optimal solution.
+    def _convert_to_sparse_matrices(self, num_constraints, num_variables):
+        """Converts objective functions and constraints to matrices, the
+        constraint matrix being assembled from coordinate triplets.
+
+        Args:
+            num_constraints (int): Number of constraint rows.
+            num_variables (int): Number of variables, slacks included.
+
+        Returns:
+            A (SparseMatrix): Coefficients matrix for constraints.
+            B (numpy.ndarray): Right-hand side matrix for constraints.
+            C (numpy.ndarray): Coefficients matrix for objective function.
+        """
+        columns = {name: j for j, name in enumerate(self.objective_functions)}
+
+        rows, cols, values = [], [], []
+        for i, constraint in enumerate(self.constraints):
+            for variable_name, coefficient in constraint.variables.items():
+                if coefficient != 0:
+                    rows.append(i)
+                    cols.append(columns[variable_name])
+                    values.append(coefficient)
+
+        A = SparseMatrix.from_coo(rows, cols, values, (num_constraints, num_variables))
+        C = np.array([list(self.objective_functions.values())], dtype=float)
+        B = np.array([[constraint.bound] for constraint in self.constraints], dtype=float)
+
+        return A, B.reshape(num_constraints, 1), C
+
+    def advanced_simplex(self, A, b, C, pricing=None, callback=None):
+        """Performs the revised simplex algorithm to find the optimal solution.
+
+        The basis is kept as an LU factorization that is updated after
+        every pivot, see RevisedSimplex. The starting basis is crashed and
+        made feasible by phase 1, see TwoPhaseSimplex, so = and >= rows
+        need no rewriting.
 
         Args:
             A (numpy.ndarray): Coefficients matrix for constraints.
             b (numpy.ndarray): Right-hand side matrix for constraints.
             C (numpy.ndarray): Coefficients matrix for objective function.
+            pricing (PricingStrategy, optional): Rule for choosing the
+                entering variable. Defaults to DantzigPricing.
+            callback (PivotCallback, optional): Called with a PivotEvent
+                after every pivot. Defaults to None.
+
+        Raises:
+            InfeasibleException: The constraints are infeasible.
+            UnboundedException: The objective function is unbounded.
+            SolverException: The iteration limit has been reached.
 
         Returns:
             objective_values (numpy.ndarray): The values of the objective function variables.
@@ -95,45 +160,22 @@ class Solver:
         """
         n, m = A.shape
 
-        B = np.eye(n)
-        C_B = np.zeros((1, n))
-
-        count = 0
-        
-        variable_names = list(self.objective_functions.keys())[-n:]  
-        variable_names = {key: value for key, value in zip(range(n), variable_names)}
-       
-        prev_solution = float('inf')
-        while True:
-            count += 1
-            B_inverse = np.around(np.linalg.inv(B), decimals=2)
-            for row in B_inverse:
-                for value in row:
-                    if value == -0:
-                        value = 0
-
-            X_B = np.matmul(B_inverse, b)
-            P_table = np.round(np.matmul(B_inverse, A), 2)
-            objective_values = np.matmul(C_B, P_table) - C
-            solution = np.round(np.matmul(C_B, X_B), 2)
-            
-            if abs(prev_solution - solution) < 0.0001:
-                return X_B, solution, variable_names
-
-            entering_var_idx = np.argmin(objective_values)
-
-            ratios = []
-            for i in range(n):
-                if P_table[i, entering_var_idx] > 0:
-                    ratios.append(X_B[i, 0] / P_table[i, entering_var_idx])
-                else:
-                    ratios.append(np.inf)  
-
-            exiting_var_idx = np.argmin(ratios)
-            
-            temp_list = list(self.objective_functions.keys())
-
-            variable_names[exiting_var_idx] = temp_list[entering_var_idx]
-            B[:, exiting_var_idx] = A[:, entering_var_idx]
-            C_B[:, exiting_var_idx] = C[:, entering_var_idx]
-            prev_solution = solution
\ No newline at end of file
+        result = TwoPhaseSimplex(A, b, C, pricing=pricing, callback=callback).solve()
+
+        if result.status == SimplexStatus.INFEASIBLE:
+            raise InfeasibleException("Constraints are infeasible")
+        if result.status == SimplexStatus.UNBOUNDED:
+            raise UnboundedException("Objective function is unbounded")
+        if result.status != SimplexStatus.OPTIMAL:
+            raise SolverException(f"Solver stopped: {result.status.value}")
+
+        temp_list = list(self.objective_functions.keys())
+        variable_names = {
+            i: temp_list[j] if j < m else "a_" + str(i) for i, j in enumerate(result.basis)
+        }
+
+        x = np.concatenate((result.x, np.zeros(n)))
+        X_B = x[result.basis].reshape(n, 1)
+        solution = np.round(np.array([[result.objective]]), 2)
+
+        return X_B, solution, variable_names
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from os import PathLike
+from typing import BinaryIO
+
+import numpy as np
+
+from algorithm.matrix import DenseMatrix, SparseMatrix
+from algorithm.problem import LinearProgram
+from algorithm.revised import SimplexResult, SimplexStatus
+from ast_parser.parser import EquationKind
+
+MAGIC = b"LPMODEL\x00"
+"""First bytes of a model file."""
+VERSION = 1
+"""Version of the layout written by save_model."""
+
+_ALIGNMENT = 8
+"""Every array starts at a multiple of this many bytes."""
+_SENSES = tuple(EquationKind)
+"""Relationship of every sense code."""
+_SEPARATOR = "\x00"
+"""Separator of the names in the name tables."""
+
+
+@dataclass
+class StoredModel:
+    """Program and optional solution loaded from a model file."""
+
+    program: LinearProgram
+    """The program."""
+    result: SimplexResult | None
+    """The solution saved with the program, if any."""
+
+
+def save_model(
+    path: str | PathLike, program: LinearProgram, result: SimplexResult | None = None
+) -> None:
+    """Saves a program, and optionally its solution, to a binary file
+    that load_model maps back into memory without parsing.
+
+    The file holds the magic bytes, the byte length of a JSON header,
+    the header, and the arrays the header locates. The file is written
+    next to its destination and moved in place, so readers never see a
+    partial file.
+
+    Args:
+        path (str | PathLike): Path of the file.
+        program (LinearProgram): The program.
+        result (SimplexResult, optional): Solution of the program,
+            basis and duals included. Defaults to None.
+
+    Raises:
+        ValueError: A name contains a null character.
+    """
+    arrays: dict[str, np.ndarray] = {}
+
+    if isinstance(program.A, DenseMatrix):
+        arrays["A"] = program.A.to_dense()
+    else:
+        for name, array in zip(
+            (
+                "col_indptr",
+                "col_indices",
+                "col_data",
+                "col_ids",
+                "row_indptr",
+                "row_indices",
+                "row_data",
+            ),
+            program.A.to_compressed(),
+        ):
+            arrays[name] = array
+
+    arrays["b"] = program.b
+    arrays["c"] = program.c
+    arrays["senses"] = np.array(
+        [_SENSES.index(sense) for sense in program.senses], dtype=np.uint8
+    )
+    arrays["variable_names"] = _name_table(program.variable_names)
+    arrays["row_names"] = _name_table(program.row_names)
+
+    header = {
+        "version": VERSION,
+        "shape": list(program.shape),
+        "dense": isinstance(program.A, DenseMatrix),
+        "result": None,
+    }
+
+    if result is not None:
+        arrays["x"] = result.x
+        arrays["basis"] = result.basis
+        arrays["duals"] = result.duals
+
+        header["result"] = {
+            "status": result.status.value,
+            "objective": float(result.objective),
+            "iterations": int(result.iterations),
+        }
+
+    # Integers and floats are stored little-endian whatever the machine.
+    arrays = {
+        name: np.ascontiguousarray(array, dtype=np.asarray(array).dtype.newbyteorder("<"))
+        for name, array in arrays.items()
+    }
+
+    offset = 0
+    header["arrays"] = {}
+    for name, array in arrays.items():
+        header["arrays"][name] = {
+            "offset": offset,
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+        }
+        offset += _aligned(array.nbytes)
+
+    encoded = json.dumps(header).encode("utf-8")
+    encoded += b" " * (_aligned(len(encoded)) - len(encoded))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(MAGIC)
+            file.write(len(encoded).to_bytes(8, "little"))
+            file.write(encoded)
+
+            for array in arrays.values():
+                _write_array(file, array)
+
+        # mkstemp creates the file private to the owner, a model file
+        # gets the permissions of any other new file.
+        os.chmod(temporary, 0o666 & ~_umask())
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def load_model(path: str | PathLike, memory_map: bool = True) -> StoredModel:
+    """Loads a file written by save_model.
+
+    With memory mapping, the matrix, vectors and solution are read-only
+    views into the mapped file: nothing is copied, and processes mapping
+    the same file share its pages. Only the names are decoded.
+
+    Args:
+        path (str | PathLike): Path of the file.
+        memory_map (bool, optional): Map the file instead of reading it.
+            Defaults to True.
+
+    Raises:
+        ValueError: The file is not a model file or has an unsupported
+            version.
+
+    Returns:
+        StoredModel: The program and its solution, if saved.
+    """
+    if memory_map:
+        data = np.memmap(path, dtype=np.uint8, mode="r")
+    else:
+        data = np.fromfile(path, dtype=np.uint8)
+
+    if data.shape[0] < 16 or bytes(data[:8]) != MAGIC:
+        raise ValueError(f"{os.fspath(path)} is not a model file")
+
+    length = int.from_bytes(bytes(data[8:16]), "little")
+    header = json.loads(bytes(data[16 : 16 + length]).decode("utf-8"))
+
+    if header["version"] != VERSION:
+        raise ValueError(f"Unsupported model file version {header['version']}")
+
+    start = 16 + length
+    arrays = {
+        name: _view(data, start + location["offset"], location)
+        for name, location in header["arrays"].items()
+    }
+
+    shape = tuple(header["shape"])
+    if header["dense"]:
+        A = DenseMatrix(arrays["A"])
+    else:
+        A = SparseMatrix.from_compressed(
+            shape,
+            tuple(
+                arrays[name]
+                for name in (
+                    "col_indptr",
+                    "col_indices",
+                    "col_data",
+                    "col_ids",
+                    "row_indptr",
+                    "row_indices",
+                    "row_data",
+                )
+            ),
+        )
+
+    program = LinearProgram(
+        A,
+        arrays["b"],
+        arrays["c"],
+        tuple(_SENSES[code] for code in arrays["senses"].tolist()),
+        _names(arrays["variable_names"], shape[1]),
+        _names(arrays["row_names"], shape[0]),
+    )
+
+    result = None
+    if header["result"] is not None:
+        result = SimplexResult(
+            SimplexStatus(header["result"]["status"]),
+            arrays["x"],
+            header["result"]["objective"],
+            arrays["basis"],
+            arrays["duals"],
+            header["result"]["iterations"],
+        )
+
+    return StoredModel(program, result)
+
+
+def _umask() -> int:
+    """Gets the file mode creation mask of the process.
+
+    Returns:
+        int: The mask.
+    """
+    # The mask can only be read by setting it.
+    mask = os.umask(0)
+    os.umask(mask)
+
+    return mask
+
+
+def _aligned(size: int) -> int:
+    """Rounds a byte size up to the alignment.
+
+    Args:
+        size (int): The size.
+
+    Returns:
+        int: The aligned size.
+    """
+    return -(-size // _ALIGNMENT) * _ALIGNMENT
+
+
+def _write_array(file: BinaryIO, array: np.ndarray) -> None:
+    """Writes an array followed by its alignment padding.
+
+    Args:
+        file (BinaryIO): The file.
+        array (numpy.ndarray): The contiguous array.
+    """
+    file.write(memoryview(array.reshape(-1)).cast("B"))
+    file.write(b"\x00" * (_aligned(array.nbytes) - array.nbytes))
+
+
+def _view(data: np.ndarray, offset: int, location: dict) -> np.ndarray:
+    """Maps an array of the file without copying it.
+
+    Args:
+        data (numpy.ndarray): Bytes of the file.
+        offset (int): Byte offset of the array in the file.
+        location (dict): Data type and shape of the array.
+
+    Returns:
+        numpy.ndarray: The array backed by the file.
+    """
+    dtype = np.dtype(location["dtype"])
+    shape = tuple(location["shape"])
+    size = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+
+    return data[offset : offset + size].view(dtype).reshape(shape)
+
+
+def _name_table(names: tuple[str, ...]) -> np.ndarray:
+    """Encodes names into a single byte array.
+
+    Args:
+        names (tuple[str, ...]): The names.
+
+    Raises:
+        ValueError: A name contains the separator.
+
+    Returns:
+        numpy.ndarray: The UTF-8 bytes of the names, separated by null
+            characters.
+    """
+    text = _SEPARATOR.join(names)
+
+    if text.count(_SEPARATOR) != max(len(names) - 1, 0):
+        raise ValueError("Names must not contain null characters")
+
+    return np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+
+
+def _names(table: np.ndarray, count: int) -> tuple[str, ...]:
+    """Decodes a name table.
+
+    Args:
+        table (numpy.ndarray): The bytes of the table.
+        count (int): Number of names.
+
+    Returns:
+        tuple[str, ...]: The names.
+    """
+    if count == 0:
+        return ()
+
+    return tuple(bytes(table).decode("utf-8").split(_SEPARATOR))
+
+
+__all__ = ("MAGIC", "VERSION", "StoredModel", "save_model", "load_model")
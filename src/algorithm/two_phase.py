@@ -0,0 +1,408 @@
+from __future__ import annotations
+
+import numpy as np
+
+from algorithm.events import PivotCallback, PivotEvent
+from algorithm.lu import BasisFactorization
+from algorithm.matrix import DenseMatrix, SparseMatrix, as_matrix
+from algorithm.pricing import PricingStrategy
+from algorithm.ratio import RatioTest
+from algorithm.revised import RevisedSimplex, SimplexResult, SimplexStatus
+from algorithm.scaling import Scaling, ScalingMethod
+
+
+class TwoPhaseSimplex:
+    """Two-phase primal simplex method for `max c x, A x = b, x >= 0`
+    that needs no feasible starting basis.
+
+    The starting basis is assembled by a crash procedure:
+
+    1. rows with a negative right-hand side are negated;
+    2. every row that has a singleton column with a positive entry,
+       typically a `<=` slack, is covered by it;
+    3. the remaining rows are covered by structural columns chosen so
+       that the crash part of the basis is triangular;
+    4. crash columns taking negative values are replaced, together with
+       the still uncovered rows, by artificial columns whose signs make
+       them non-negative.
+
+    Phase 1 maximizes minus the sum of the artificials. Artificials left
+    in the basis at zero are pivoted out where possible before phase 2
+    optimizes the original objective.
+
+    Both phases run on the program scaled by Scaling, the result is
+    unscaled.
+
+    Args:
+        A (numpy.ndarray | DenseMatrix | SparseMatrix): Constraint
+            matrix of shape (m, n), dense or sparse.
+        b (numpy.ndarray): Right-hand side vector of length m.
+        c (numpy.ndarray): Objective coefficients of length n.
+        crash (bool, optional): Cover rows with structural columns
+            before resorting to artificials. Defaults to True.
+        refactorization_frequency (int, optional): Number of pivots
+            between two fresh factorizations. Defaults to 64.
+        tolerance (float, optional): Optimality and pivot tolerance.
+            Defaults to 1e-9.
+        feasibility_tolerance (float, optional): Largest sum of the
+            artificials, relative to the right-hand side, that is still
+            considered feasible. Defaults to 1e-7.
+        max_iterations (int, optional): Maximum number of pivots per
+            phase. Defaults to a limit proportional to the problem size.
+        ratio_test (RatioTest, optional): Rule for choosing the leaving
+            variable. Defaults to RatioTest.HARRIS.
+        pricing (PricingStrategy, optional): Rule for choosing the
+            entering variable. Defaults to DantzigPricing.
+        scaling (ScalingMethod, optional): Rule for scaling the program,
+            None to solve it unscaled. Defaults to
+            ScalingMethod.GEOMETRIC.
+        callback (PivotCallback, optional): Called with a PivotEvent
+            after every pivot of both phases, tagged with its phase and
+            numbered across them. Defaults to None.
+    """
+
+    _A: DenseMatrix | SparseMatrix
+    """Scaled constraint matrix with the rows of negative bound
+    negated."""
+    _b: np.ndarray
+    """Scaled non-negative right-hand side vector."""
+    _c: np.ndarray
+    """Scaled objective coefficients."""
+    _row_signs: np.ndarray
+    """Sign every row has been multiplied by."""
+    _scaling: Scaling | None
+    """Factors the program has been scaled by, None if unscaled."""
+
+    crash: bool
+    """Cover rows with structural columns before resorting to
+    artificials."""
+    tolerance: float
+    """Optimality and pivot tolerance."""
+    feasibility_tolerance: float
+    """Largest relative sum of the artificials considered feasible."""
+    callback: PivotCallback | None
+    """Called after every pivot."""
+
+    _options: dict
+    """Options passed through to the RevisedSimplex engines."""
+
+    def __init__(
+        self,
+        A: np.ndarray | DenseMatrix | SparseMatrix,
+        b: np.ndarray,
+        c: np.ndarray,
+        crash: bool = True,
+        refactorization_frequency: int = 64,
+        tolerance: float = 1e-9,
+        feasibility_tolerance: float = 1e-7,
+        max_iterations: int | None = None,
+        ratio_test: RatioTest = RatioTest.HARRIS,
+        pricing: PricingStrategy | None = None,
+        scaling: ScalingMethod | None = ScalingMethod.GEOMETRIC,
+        callback: PivotCallback | None = None,
+    ) -> None:
+        A = as_matrix(A)
+        b = np.asarray(b, dtype=float).reshape(-1)
+
+        self._row_signs = np.where(b < 0.0, -1.0, 1.0)
+        self._A = A.scaled(self._row_signs, np.ones(A.shape[1]))
+        self._b = b * self._row_signs
+        self._c = np.asarray(c, dtype=float).reshape(-1)
+
+        self._scaling = None
+        if scaling is not None:
+            self._scaling = Scaling(self._A, scaling)
+
+            self._A = self._scaling.scale_matrix(self._A)
+            self._b = self._scaling.scale_rhs(self._b)
+            self._c = self._scaling.scale_objective(self._c)
+
+        self.crash = crash
+        self.tolerance = tolerance
+        self.feasibility_tolerance = feasibility_tolerance
+        self.callback = callback
+
+        self._options = {
+            "refactorization_frequency": refactorization_frequency,
+            "tolerance": tolerance,
+            "max_iterations": max_iterations,
+            "ratio_test": ratio_test,
+            "pricing": pricing,
+        }
+
+    def solve(self) -> SimplexResult:
+        """Runs phase 1 and phase 2.
+
+        Returns:
+            SimplexResult: The outcome of the solve. Basic positions
+                still held by artificials of redundant rows have indices
+                of n and above.
+        """
+        m, n = self._A.shape
+
+        basis, x_B = self._crash_basis()
+        artificial_rows = np.flatnonzero(basis < 0)
+        artificial_signs = np.where(x_B[artificial_rows] < 0.0, -1.0, 1.0)
+        basis[artificial_rows] = n + np.arange(artificial_rows.shape[0])
+
+        iterations = 0
+
+        if artificial_rows.shape[0] > 0:
+            A = self._A.append_unit_columns(artificial_rows, artificial_signs)
+            c = np.concatenate((np.zeros(n), -np.ones(artificial_rows.shape[0])))
+
+            phase = RevisedSimplex(
+                A,
+                self._b,
+                c,
+                basis,
+                callback=self._phase_callback(1, 0),
+                **self._options,
+            ).solve()
+            iterations += phase.iterations
+
+            if phase.status == SimplexStatus.ITERATION_LIMIT:
+                return self._result(phase, iterations, n)
+            if phase.objective < -self.feasibility_tolerance * max(
+                1.0, np.abs(self._b).max(initial=0.0)
+            ):
+                return self._result(
+                    SimplexResult(
+                        SimplexStatus.INFEASIBLE,
+                        phase.x,
+                        float(self._c @ phase.x[:n]),
+                        phase.basis,
+                        phase.duals,
+                        phase.iterations,
+                    ),
+                    iterations,
+                    n,
+                )
+
+            basis = self._drive_out_artificials(phase, A, n)
+
+        kept = np.sort(basis[basis >= n]) - n
+        A = self._A.append_unit_columns(artificial_rows[kept], artificial_signs[kept])
+        c = np.concatenate((self._c, np.zeros(kept.shape[0])))
+
+        positions = {int(k): n + i for i, k in enumerate(kept)}
+        basis = np.array(
+            [j if j < n else positions[int(j) - n] for j in basis], dtype=np.int64
+        )
+
+        phase = RevisedSimplex(
+            A,
+            self._b,
+            c,
+            basis,
+            callback=self._phase_callback(2, iterations),
+            **self._options,
+        ).solve()
+
+        return self._result(phase, iterations + phase.iterations, n)
+
+    def _phase_callback(self, phase: int, offset: int) -> PivotCallback | None:
+        """Wraps the callback for the engine of a phase.
+
+        Args:
+            phase (int): The phase, 1 or 2.
+            offset (int): Number of pivots of the earlier phase.
+
+        Returns:
+            PivotCallback | None: The callback tagging the events with
+                the phase, None if there is no callback.
+        """
+        callback = self.callback
+        if callback is None:
+            return None
+
+        def tagged(event: PivotEvent) -> None:
+            event.phase = phase
+            event.iteration += offset
+
+            callback(event)
+
+        return tagged
+
+    def _crash_basis(self) -> tuple[np.ndarray, np.ndarray]:
+        """Assembles the starting basis.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: The basic column of
+                every row, -1 for the rows left to artificials, and the
+                values of the basic variables, with unit artificials.
+        """
+        m, n = self._A.shape
+        rows, cols, values = self._A.to_coo()
+
+        basis = np.full(m, -1, dtype=np.int64)
+
+        # Singleton columns with a positive entry, e.g. `<=` slacks.
+        counts = np.bincount(cols, minlength=n)
+        singletons = (counts[cols] == 1) & (values > self.tolerance)
+        basis[rows[singletons]] = cols[singletons]
+        singleton_rows = np.flatnonzero(basis >= 0)
+
+        crashed = np.zeros(0, dtype=np.int64)
+        if self.crash:
+            crashed = self._triangular_crash(basis, rows, cols, values)
+
+        # The crash columns form a lower triangular block in the order
+        # their rows were covered, and have no entry in the rows covered
+        # before them. Forward substitution in that order, the singletons
+        # last, solves the basis in a single pass over its entries.
+        order = np.argsort(cols, kind="stable")
+        rows, values = rows[order], values[order]
+        starts = np.searchsorted(cols[order], np.arange(n + 1))
+
+        residual = self._b.copy()
+        x_B = np.zeros(m)
+
+        for i in np.concatenate((crashed, singleton_rows)):
+            entries = slice(starts[basis[i]], starts[basis[i] + 1])
+            pivot = values[entries][rows[entries] == i][0]
+
+            value = residual[i] / pivot
+            if value < -self.tolerance:
+                # Replaced by an artificial, which keeps the basis
+                # triangular.
+                basis[i] = -1
+
+                continue
+
+            x_B[i] = value
+            residual[rows[entries]] -= values[entries] * value
+
+        # Unit artificials take what is left of their rows.
+        uncovered = basis < 0
+        x_B[uncovered] = residual[uncovered]
+
+        return basis, x_B
+
+    def _triangular_crash(
+        self,
+        basis: np.ndarray,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        values: np.ndarray,
+    ) -> np.ndarray:
+        """Covers the uncovered rows with structural columns forming a
+        lower triangular block.
+
+        Rows are processed from the sparsest. A column is eligible for a
+        row if it has no entry in any row covered by the crash before,
+        and the largest eligible entry, preferably positive, is chosen.
+
+        Args:
+            basis (numpy.ndarray): The basic column of every row, -1 for
+                uncovered rows. Updated in place.
+            rows (numpy.ndarray): Row indices of the entries.
+            cols (numpy.ndarray): Column indices of the entries.
+            values (numpy.ndarray): Values of the entries.
+
+        Returns:
+            numpy.ndarray: The rows covered, in the order of the block.
+        """
+        n = self._A.shape[1]
+
+        order = np.argsort(rows, kind="stable")
+        rows, cols, values = rows[order], cols[order], values[order]
+        starts = np.searchsorted(rows, np.arange(self._A.shape[0] + 1))
+
+        blocked = np.zeros(n, dtype=bool)
+        blocked[basis[basis >= 0]] = True
+
+        uncovered = np.flatnonzero(basis < 0)
+        lengths = starts[uncovered + 1] - starts[uncovered]
+        covered = []
+
+        for i in uncovered[np.argsort(lengths, kind="stable")]:
+            entries = slice(starts[i], starts[i + 1])
+            candidates, pivots = cols[entries], values[entries]
+
+            eligible = ~blocked[candidates] & (np.abs(pivots) > self.tolerance)
+            if eligible.any():
+                scores = np.where(eligible, np.abs(pivots), -np.inf)
+                scores[eligible & (pivots > 0.0)] += np.abs(pivots).max()
+
+                basis[i] = candidates[int(np.argmax(scores))]
+                covered.append(i)
+
+            blocked[candidates] = True
+
+        return np.array(covered, dtype=np.int64)
+
+    def _drive_out_artificials(
+        self, phase: SimplexResult, A: DenseMatrix | SparseMatrix, n: int
+    ) -> np.ndarray:
+        """Replaces the artificials left in the basis by nonbasic
+        original columns with a nonzero pivot, which are degenerate
+        exchanges. Artificials of redundant rows stay in the basis.
+
+        Args:
+            phase (SimplexResult): The outcome of phase 1.
+            A (DenseMatrix | SparseMatrix): The phase 1 constraint
+                matrix.
+            n (int): Number of original columns.
+
+        Returns:
+            numpy.ndarray: The basis for phase 2.
+        """
+        basis = phase.basis.copy()
+        factorization = BasisFactorization(
+            A.columns(basis),
+            self._options["refactorization_frequency"],
+            self.tolerance * 1e-2,
+        )
+
+        for position in np.flatnonzero(basis >= n):
+            unit = np.zeros(basis.shape[0])
+            unit[position] = 1.0
+
+            row = self._A.rmatvec(factorization.btran(unit))
+            row[basis[basis < n]] = 0.0
+
+            entering = int(np.argmax(np.abs(row)))
+            if abs(row[entering]) <= self.tolerance:
+                continue
+
+            basis[position] = entering
+
+            if factorization.requires_refactorization:
+                factorization.refactorize(A.columns(basis))
+            else:
+                factorization.update(position, factorization.ftran(A.column(entering)))
+
+        return basis
+
+    def _result(self, phase: SimplexResult, iterations: int, n: int) -> SimplexResult:
+        """Maps the outcome of a phase back to the original, unscaled
+        rows and columns.
+
+        Args:
+            phase (SimplexResult): The outcome of the last phase.
+            iterations (int): Number of pivots of both phases.
+            n (int): Number of original columns.
+
+        Returns:
+            SimplexResult: The outcome of the solve.
+        """
+        x = phase.x[:n]
+        duals = phase.duals
+        objective = float(self._c @ x)
+
+        if self._scaling is not None:
+            x = self._scaling.unscale_primal(x)
+            duals = self._scaling.unscale_duals(duals)
+
+        return SimplexResult(
+            phase.status,
+            x,
+            objective,
+            phase.basis,
+            duals * self._row_signs,
+            iterations,
+        )
+
+
+__all__ = ("TwoPhaseSimplex",)
@@ -1,3 +1,4 @@
+from ast_parser.cache import ParseCache, copy_equation
 from ast_parser.chars import (
     is_alpha,
     is_ascii,
@@ -9,13 +10,18 @@ from ast_parser.chars import (
     is_variable_start,
     print_char_code,
 )
+from ast_parser.coo import CooEquations, CooParser, SymbolTable
 from ast_parser.errors import LexerException, LinterException, PositionedException
+from ast_parser.fast_lexer import FastLexer
 from ast_parser.lexer import Lexer
 from ast_parser.linter import Linter
 from ast_parser.parser import Equation, EquationKind, Parser
+from ast_parser.replay_lexer import ReplayLexer
+from ast_parser.stream import StreamParser, parse_file
 from ast_parser.token import (
     Location,
     Token,
+    TokenBuffer,
     TokenKind,
     is_binary_operator,
     is_relational_operator,
@@ -35,12 +41,22 @@ __all__ = (
     "LexerException",
     "LinterException",
     "Lexer",
+    "FastLexer",
+    "ReplayLexer",
     "Linter",
     "EquationKind",
     "Equation",
     "Parser",
+    "SymbolTable",
+    "CooEquations",
+    "CooParser",
+    "copy_equation",
+    "ParseCache",
+    "StreamParser",
+    "parse_file",
     "TokenKind",
     "Location",
+    "TokenBuffer",
     "Token",
     "is_binary_operator",
     "is_relational_operator",
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+
+from ast_parser.errors import PositionedException
+from ast_parser.parser import Equation, Parser
+
+
+def copy_equation(equation: Equation) -> Equation:
+    """Copies an Equation, so that the copy can be modified freely.
+
+    Args:
+        equation (Equation): The Equation to copy.
+
+    Returns:
+        Equation: The copy.
+    """
+    return Equation(equation.kind, dict(equation.variables), equation.bound)
+
+
+class ParseCache:
+    """Memoizes the Equations of parsed sources.
+
+    A source is looked up by its hash first. On a miss it is split at
+    the commas, which only ever separate equations, and every equation
+    text is looked up on its own, so only the equations not seen before
+    are lexed and linted. If any of them fails to parse on its own, the
+    whole source is parsed again, so the exception carries its location
+    in the source.
+
+    Both levels are bounded by LRU eviction. The cached Equations are
+    never handed out: every call returns fresh copies, since consumers
+    such as Solver modify the Equations they are given.
+
+    Args:
+        max_sources (int, optional): Largest number of cached sources.
+            Defaults to 128.
+        max_fragments (int, optional): Largest number of cached
+            equation texts. Defaults to 65536.
+    """
+
+    max_sources: int
+    """Largest number of cached sources."""
+    max_fragments: int
+    """Largest number of cached equation texts."""
+
+    hits: int
+    """Number of sources or equation texts found in the cache."""
+    misses: int
+    """Number of sources or equation texts parsed."""
+
+    _sources: OrderedDict[bytes, tuple[Equation, ...]]
+    """Equations of the sources. The source hashes are the keys, least
+    recently used first."""
+    _fragments: OrderedDict[str, Equation]
+    """Equation of every equation text, least recently used first."""
+
+    def __init__(self, max_sources: int = 128, max_fragments: int = 65536) -> None:
+        self.max_sources = max_sources
+        self.max_fragments = max_fragments
+
+        self.hits = 0
+        self.misses = 0
+
+        self._sources = OrderedDict()
+        self._fragments = OrderedDict()
+
+    def parse(self, source: str) -> tuple[Equation, ...]:
+        """Parses a source, reusing the cached Equations.
+
+        Args:
+            source (str): The source to parse.
+
+        Raises:
+            LexerException: The source does not lex, see Parser.
+            LinterException: The source does not lint, see Parser.
+
+        Returns:
+            tuple[Equation, ...]: Copies of the Equations of the source.
+        """
+        key = hashlib.blake2b(source.encode("utf-8", "surrogatepass")).digest()
+
+        equations = self._sources.get(key)
+        if equations is not None:
+            self._sources.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+
+            equations = self._parse_fragments(source)
+            if equations is None:
+                equations = tuple(Parser(source))
+
+            self._sources[key] = equations
+            if len(self._sources) > self.max_sources:
+                self._sources.popitem(last=False)
+
+        return tuple(copy_equation(equation) for equation in equations)
+
+    def clear(self) -> None:
+        """Removes all cached sources and equation texts."""
+        self._sources.clear()
+        self._fragments.clear()
+
+    def _parse_fragments(self, source: str) -> tuple[Equation, ...] | None:
+        """Parses a source equation by equation.
+
+        Args:
+            source (str): The source to parse.
+
+        Returns:
+            tuple[Equation, ...] | None: The Equations, or None if an
+                equation text does not parse into exactly one Equation
+                on its own.
+        """
+        equations = []
+
+        for fragment in source.split(","):
+            fragment = fragment.strip(" \t\r\n\ufeff")
+
+            # A leading `*` passes the Linter at the start of the source
+            # only, not after a comma.
+            if fragment.startswith("*") and equations:
+                return None
+
+            equation = self._fragments.get(fragment)
+            if equation is not None:
+                self._fragments.move_to_end(fragment)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+                try:
+                    parsed = tuple(Parser(fragment))
+                except PositionedException:
+                    return None
+
+                if len(parsed) != 1:
+                    return None
+
+                equation = parsed[0]
+
+                self._fragments[fragment] = equation
+                if len(self._fragments) > self.max_fragments:
+                    self._fragments.popitem(last=False)
+
+            equations.append(equation)
+
+        return tuple(equations)
+
+
+__all__ = ("copy_equation", "ParseCache")
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+
+from ast_parser.fast_lexer import FastLexer
+from ast_parser.lexer import Lexer
+from ast_parser.parser import EquationAccumulator, EquationKind, Parser
+
+
+class SymbolTable:
+    """Interns variable names into consecutive indices, in the order
+    they are first seen."""
+
+    names: list[str]
+    """Name of every index."""
+
+    _indices: dict[str, int]
+    """Index of every name."""
+
+    def __init__(self) -> None:
+        self.names = []
+
+        self._indices = {}
+
+    def __len__(self) -> int:
+        """Gets the number of interned names.
+
+        Returns:
+            int: The number of interned names.
+        """
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        """Checks whether a name is interned.
+
+        Args:
+            name (str): The name.
+
+        Returns:
+            bool: True if the name is interned, False otherwise.
+        """
+        return name in self._indices
+
+    def intern(self, name: str) -> int:
+        """Gets the index of a name, interning it if it is new.
+
+        Args:
+            name (str): The name.
+
+        Returns:
+            int: The index of the name.
+        """
+        index = self._indices.get(name)
+
+        if index is None:
+            index = self._indices[name] = len(self.names)
+            self.names.append(name)
+
+        return index
+
+    def index(self, name: str) -> int:
+        """Gets the index of an interned name.
+
+        Args:
+            name (str): The name.
+
+        Raises:
+            KeyError: The name is not interned.
+
+        Returns:
+            int: The index of the name.
+        """
+        return self._indices[name]
+
+
+@dataclass
+class CooEquations:
+    """Equations of a source as coordinate triplets: the term `value *
+    names[column]` of every triplet belongs to the equation `row`. The
+    terms of a variable repeated in an equation are not summed."""
+
+    symbols: SymbolTable
+    """Names of the variables, the columns are their indices."""
+    rows: array
+    """Equation of every term."""
+    columns: array
+    """Variable of every term."""
+    values: array
+    """Coefficient of every term, moved to the left side."""
+    kinds: list[EquationKind]
+    """Kind of every equation."""
+    bounds: array
+    """Bound of every equation."""
+
+    def __len__(self) -> int:
+        """Gets the number of equations.
+
+        Returns:
+            int: The number of equations.
+        """
+        return len(self.kinds)
+
+
+class CooParser(Parser):
+    """Parser appending the terms of the Equations to coordinate
+    triplets instead of building a dictionary per Equation.
+
+    The variable names are interned into a SymbolTable as they are
+    parsed and the triplets are kept in typed arrays, so they turn into
+    a matrix without any further lookup, see LinearProgram.from_coo.
+    Iterating yields the index of every parsed equation.
+
+    Args:
+        source (str): The source to parse.
+        lexer (type[Lexer] | Lexer, optional): Lexer class of the
+            source, or a Lexer of it. Defaults to FastLexer.
+        trusted (bool, optional): Skip linting, see Parser. Defaults to
+            False.
+    """
+
+    _equations: CooEquations
+    """The equations parsed so far."""
+
+    def __init__(
+        self,
+        source: str,
+        lexer: type[Lexer] | Lexer = FastLexer,
+        trusted: bool = False,
+    ) -> None:
+        super().__init__(source, lexer, trusted)
+
+        self._equations = CooEquations(
+            SymbolTable(), array("q"), array("q"), array("d"), [], array("d")
+        )
+
+    def parse(self) -> CooEquations:
+        """Parses the rest of the source.
+
+        Raises:
+            LexerException: The source does not lex, see Parser.
+            LinterException: The source does not lint, see Parser.
+
+        Returns:
+            CooEquations: The equations of the source.
+        """
+        for _ in self:
+            pass
+
+        return self._equations
+
+    def _extend_variables(self) -> None:
+        """Appends the current term to the triplets, or to the bound if
+        it has no variable.
+        """
+        accumulator = self._accumulator
+
+        if accumulator.coefficient:
+            if accumulator.kind:
+                accumulator.coefficient *= -1.0
+            if accumulator.variable:
+                equations = self._equations
+
+                equations.rows.append(len(equations.kinds))
+                equations.columns.append(equations.symbols.intern(accumulator.variable))
+                equations.values.append(accumulator.coefficient)
+            else:
+                accumulator.bound -= accumulator.coefficient
+
+    def _derive_equation(self) -> int:
+        """Closes the current equation.
+
+        Returns:
+            int: The index of the equation.
+        """
+        self._extend_variables()
+
+        equations = self._equations
+
+        equations.kinds.append(self._accumulator.kind)
+        equations.bounds.append(self._accumulator.bound)
+
+        self._accumulator = EquationAccumulator()
+
+        return len(equations.kinds) - 1
+
+
+__all__ = ("SymbolTable", "CooEquations", "CooParser")
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import re
+
+from ast_parser.chars import is_coefficient_start, print_char_code
+from ast_parser.errors import LexerException
+from ast_parser.lexer import Lexer
+from ast_parser.token import Location, Token, TokenKind
+
+_TOKEN = re.compile(
+    r"""
+    [\ufeff\t\ ]*
+    (?:
+        (?P<newline>\r\n?|\n)
+        | (?P<variable>[A-Za-z_][A-Za-z0-9_]*)
+        # A coefficient is only matched when the Lexer would not read
+        # any further, otherwise the Lexer reads it and raises its
+        # exception.
+        | (?P<coefficient>
+            (?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?(?![.eE0-9])
+            | \.[0-9]+(?:[eE][-+]?[0-9]+)?(?![.eE0-9])
+        )
+        | (?P<add>\+)
+        | (?P<sub>-)
+        | (?P<mul>\*)
+        | (?P<eq>==?)
+        | (?P<leq><=|\u2264)
+        | (?P<geq>>=|\u2265)
+        | (?P<comma>,)
+    )?
+    """,
+    re.VERBOSE,
+)
+"""Master pattern of a Token and the ignored characters in front of
+it."""
+
+_KINDS = {
+    "variable": TokenKind.VARIABLE,
+    "coefficient": TokenKind.COEFFICIENT,
+    "add": TokenKind.ADD,
+    "sub": TokenKind.SUB,
+    "mul": TokenKind.MUL,
+    "eq": TokenKind.EQ,
+    "leq": TokenKind.LEQ,
+    "geq": TokenKind.GEQ,
+    "comma": TokenKind.COMMA,
+}
+"""Kind of the Token of every group of the master pattern."""
+
+
+class FastLexer(Lexer):
+    """Lexer matching a precompiled master pattern instead of reading
+    the source one character at a time.
+
+    It emits the same Tokens as Lexer and raises the same exceptions at
+    the same Locations: the characters the pattern does not match are
+    handed to the Lexer helpers, which raise the exception.
+
+    Args:
+        source (str): The source string being tokenized.
+    """
+
+    def _next_token(self) -> Token:
+        """Gets the next token from the source.
+
+        Raises:
+            LexerException: Unexpected character, less than operator is
+                not allowed.
+            LexerException: Unexpected character, greater than operator
+                is not allowed.
+            LexerException: Invalid character: <code>.
+            LexerException: Invalid coefficient, unexpected digit after
+                0: <code>.
+            LexerException: Invalid coefficient, expected digit but
+                got: <code>.
+
+        Returns:
+            Token: The next token from the source.
+        """
+        source = self._source
+        position = self._token.end
+
+        while True:
+            match = _TOKEN.match(source, position)
+            group = match.lastgroup
+            position = match.end()
+
+            if group is None:
+                break
+            if group == "newline":
+                self._line += 1
+                self._line_start = position
+
+                continue
+
+            start = match.start(group)
+
+            return self._buffer.append(
+                _KINDS[group], start, position, self._line, 1 + start - self._line_start
+            )
+
+        if position == len(source):
+            return self._create_token(TokenKind.EOF, position, position)
+
+        code = ord(source[position])
+
+        if is_coefficient_start(code):  # <digit> | `.`
+            return self._read_coefficient(position, code)
+
+        location = Location(self._line, 1 + position - self._line_start)
+
+        if code == 0x003C:  # `<`
+            raise LexerException(
+                source,
+                location,
+                "Unexpected character, less than operator is not allowed",
+            )
+        if code == 0x003E:  # `>`
+            raise LexerException(
+                source,
+                location,
+                "Unexpected character, greater than operator is not allowed",
+            )
+
+        raise LexerException(
+            source, location, f"Invalid character: {print_char_code(code)}"
+        )
+
+
+__all__ = ("FastLexer",)
@@ -10,7 +10,7 @@ from ast_parser.chars import (
     print_char_code,
 )
 from ast_parser.errors import LexerException
-from ast_parser.token import Location, Token, TokenKind
+from ast_parser.token import Location, Token, TokenBuffer, TokenKind
 
 
 class Lexer:
@@ -28,8 +28,11 @@ class Lexer:
     _source: str
     """The source string being tokenized."""
 
-    _token: Token
-    """The currently active Token."""
+    _buffer: TokenBuffer
+    """The Tokens lexed so far."""
+    _token: Token | None
+    """The currently active Token, None once the EOF Token has been
+    returned."""
 
     _line: int
     """The current line number."""
@@ -39,7 +42,8 @@ class Lexer:
     def __init__(self, source: str) -> None:
         self._source = source
 
-        self._token = Token(TokenKind.SOF, 0, 0, Location(0, 0), "")
+        self._buffer = TokenBuffer(source)
+        self._token = self._buffer.append(TokenKind.SOF, 0, 0, 0, 0)
 
         self._line = 1
         self._line_start = 0
@@ -53,6 +57,15 @@ class Lexer:
         """
         return self._source
 
+    @property
+    def buffer(self) -> TokenBuffer:
+        """Gets the Tokens lexed so far.
+
+        Returns:
+            TokenBuffer: The Tokens lexed so far.
+        """
+        return self._buffer
+
     def __iter__(self) -> Lexer:
         """Gets an iterator over the Tokens in the source.
 
@@ -80,31 +93,18 @@ class Lexer:
             Token: The next token from the source.
         """
         last_token = self._token
-        next_token = self._next_token()
-
-        if last_token.kind == TokenKind.EOF and next_token.kind == TokenKind.EOF:
-            if last_token.prev_token is None:
-                raise LexerException(
-                    self._source,
-                    last_token.location,
-                    "Crude modification of the token chain is detected",
-                )
-
-            if last_token.prev_token.kind == TokenKind.EOF:
-                raise StopIteration
-
-            self._token = next_token
 
-            return last_token
+        if last_token is None:
+            raise StopIteration
 
-        self._token.next_token = next_token
-        next_token.prev_token = self._token
-
-        self._token = next_token
+        if last_token.kind == TokenKind.EOF:
+            self._token = None
+        else:
+            self._token = self._next_token()
 
         return last_token
 
-    def _create_token(self, kind: TokenKind, start: int, end: int, value: str) -> Token:
+    def _create_token(self, kind: TokenKind, start: int, end: int) -> Token:
         """Creates a token with the given parameters.
 
         A token is created relative to the current state of the Lexer.
@@ -113,14 +113,13 @@ class Lexer:
             kind (TokenKind): The kind of token.
             start (int): The index of the first character of the token.
             end (int): The index of the first character after the token.
-            value (str): The value of the token.
 
         Returns:
             Token:
         """
-        location = Location(self._line, 1 + start - self._line_start)
-
-        return Token(kind, start, end, location, value, self._token)
+        return self._buffer.append(
+            kind, start, end, self._line, 1 + start - self._line_start
+        )
 
     def _read_code(self, position: int) -> int | None:
         """Reads the character code at the given position in the source.
@@ -175,7 +174,7 @@ class Lexer:
         Returns:
             int: The index of the first character after the digits.
         """
-        if not is_digit(first_code):  # not <digit>
+        if first_code is None or not is_digit(first_code):  # not <digit>
             raise LexerException(
                 self._source,
                 Location(self._line, 1 + start - self._line_start),
@@ -207,7 +206,7 @@ class Lexer:
             position += 1
             code = self._read_code(position)
 
-            if is_digit(code):  # <digit>
+            if code is not None and is_digit(code):  # <digit>
                 raise LexerException(
                     self._source,
                     Location(self._line, 1 + position - self._line_start),
@@ -236,9 +235,7 @@ class Lexer:
 
             position = self._read_digits(position, code)
 
-        return self._create_token(
-            TokenKind.COEFFICIENT, start, position, self._source[start:position]
-        )
+        return self._create_token(TokenKind.COEFFICIENT, start, position)
 
     def _read_variable(self, start: int) -> Token:
         """Reads a variable token from the source starting at the given
@@ -252,9 +249,7 @@ class Lexer:
         """
         position = self._read_while(start + 1, is_variable_continue)
 
-        return self._create_token(
-            TokenKind.VARIABLE, start, position, self._source[start:position]
-        )
+        return self._create_token(TokenKind.VARIABLE, start, position)
 
     def _next_token(self) -> Token:
         """Gets the next token from the source starting at the given
@@ -315,23 +310,15 @@ class Lexer:
                 # - relational operators;
                 # - comma.
                 case 0x002B | 0x002D | 0x002A:  # `+` | `-` | `*`
-                    return self._create_token(
-                        TokenKind(char), position, position + 1, char
-                    )
+                    return self._create_token(TokenKind(char), position, position + 1)
                 case 0x003D:  # `=`
                     if self._read_code(position + 1) == 0x003D:
-                        return self._create_token(
-                            TokenKind.EQ, position, position + 2, "=="
-                        )
+                        return self._create_token(TokenKind.EQ, position, position + 2)
 
-                    return self._create_token(
-                        TokenKind.EQ, position, position + 1, char
-                    )
+                    return self._create_token(TokenKind.EQ, position, position + 1)
                 case 0x003C:  # `<`
                     if self._read_code(position + 1) == 0x003D:  # `=`
-                        return self._create_token(
-                            TokenKind.LEQ, position, position + 2, "<="
-                        )
+                        return self._create_token(TokenKind.LEQ, position, position + 2)
 
                     raise LexerException(
                         self._source,
@@ -340,9 +327,7 @@ class Lexer:
                     )
                 case 0x003E:  # `>`
                     if self._read_code(position + 1) == 0x003D:  # `=`
-                        return self._create_token(
-                            TokenKind.GEQ, position, position + 2, ">="
-                        )
+                        return self._create_token(TokenKind.GEQ, position, position + 2)
 
                     raise LexerException(
                         self._source,
@@ -350,17 +335,11 @@ class Lexer:
                         "Unexpected character, greater than operator is not allowed",
                     )
                 case 0x2264:  # `≤`
-                    return self._create_token(
-                        TokenKind.LEQ, position, position + 1, char
-                    )
+                    return self._create_token(TokenKind.LEQ, position, position + 1)
                 case 0x2265:  # `≥`
-                    return self._create_token(
-                        TokenKind.GEQ, position, position + 1, char
-                    )
+                    return self._create_token(TokenKind.GEQ, position, position + 1)
                 case 0x002C:  # `,`
-                    return self._create_token(
-                        TokenKind.COMMA, position, position + 1, char
-                    )
+                    return self._create_token(TokenKind.COMMA, position, position + 1)
 
             # Multi-char tokens:
             # - coefficient;
@@ -376,7 +355,7 @@ class Lexer:
                 f"Invalid character: {print_char_code(code)}",
             )
 
-        return self._create_token(TokenKind.EOF, position, position, "")
+        return self._create_token(TokenKind.EOF, position, position)
 
 
 __all__ = ("Lexer",)
@@ -16,12 +16,17 @@ class Linter:
 
     _source: str
 
+    _index: int
+    """The index of the last linted Token."""
+
     _variable_provided: bool
     _relation_provided: bool
 
     def __init__(self, source: str) -> None:
         self._source = source
 
+        self._index = -1
+
         self._variable_provided = False
         self._relation_provided = False
 
@@ -49,15 +54,16 @@ class Linter:
             LinterException: Equation must contain a relational
                 operator.
         """
-        if token.kind != TokenKind.SOF and (
-            token.prev_token is None or token.prev_token.next_token is not token
-        ):
+        # The Tokens must come one after another, starting with SOF.
+        if token.index != self._index + 1:
             raise LinterException(
                 self._source,
                 token.location,
                 "Crude modification of the token chain is detected",
             )
 
+        self._index = token.index
+
         if token.kind == TokenKind.EOF:
             self._lint_eof(token)
 
@@ -265,7 +271,7 @@ class Linter:
         if is_binary_operator(token.prev_token):
             raise LinterException(
                 self._source,
-                token.prev_token,
+                token.prev_token.location,
                 "Unexpected binary operator at the end of the equation",
             )
         if token.prev_token.kind == TokenKind.MUL:
@@ -3,8 +3,9 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from enum import Enum
 
+from ast_parser.errors import LinterException
+from ast_parser.fast_lexer import FastLexer
 from ast_parser.lexer import Lexer
-from ast_parser.linter import Linter
 from ast_parser.token import Token, TokenKind
 
 
@@ -59,26 +60,147 @@ class EquationAccumulator:
     """Name of the current variable."""
 
 
+_BINARY = (TokenKind.ADD, TokenKind.SUB)
+"""Kinds of the algebraic binary operators."""
+_RELATIONAL = (TokenKind.EQ, TokenKind.LEQ, TokenKind.GEQ)
+"""Kinds of the relational operators."""
+
+_RULES = (
+    # Kinds of the Token, kinds of the previous Token, description, and
+    # whether the error is located at the previous Token.
+    (
+        (TokenKind.EOF,),
+        _BINARY,
+        "Unexpected binary operator at the end of the equation",
+        True,
+    ),
+    ((TokenKind.EOF,), (TokenKind.MUL,), "Unexpected EOF, multiplier missed", False),
+    (
+        (TokenKind.EOF,),
+        _RELATIONAL,
+        "Unexpected EOF, right side of the equation is missed",
+        False,
+    ),
+    (
+        (TokenKind.EOF,),
+        (TokenKind.COMMA,),
+        "Unexpected comma at the end of the equation",
+        False,
+    ),
+    (_BINARY, _BINARY, "Unexpected binary operator, term missed", False),
+    (
+        _BINARY,
+        (TokenKind.MUL,),
+        "Unexpected binary operator, multiplier missed",
+        False,
+    ),
+    (
+        (TokenKind.MUL,),
+        _BINARY + _RELATIONAL + (TokenKind.COMMA,),
+        "Unexpected multiplication operator, term missed",
+        False,
+    ),
+    (
+        (TokenKind.MUL,),
+        (TokenKind.MUL,),
+        "Unexpected multiplication operator, multiplier missed",
+        False,
+    ),
+    (
+        _RELATIONAL,
+        (TokenKind.SOF, TokenKind.COMMA),
+        "Unexpected relational operator, left side of the equation is missed",
+        False,
+    ),
+    (_RELATIONAL, _BINARY, "Unexpected binary operator, term missed", False),
+    (
+        _RELATIONAL,
+        (TokenKind.MUL,),
+        "Unexpected relational operator, multiplier missed",
+        False,
+    ),
+    (
+        (TokenKind.COMMA,),
+        (TokenKind.SOF,),
+        "Unexpected comma at the beginning of the equation",
+        False,
+    ),
+    (
+        (TokenKind.COMMA,),
+        _BINARY,
+        "Unexpected binary operator at the end of the equation",
+        True,
+    ),
+    (
+        (TokenKind.COMMA,),
+        (TokenKind.MUL,),
+        "Unexpected comma, multiplier missed",
+        False,
+    ),
+    (
+        (TokenKind.COMMA,),
+        _RELATIONAL,
+        "Unexpected comma, right side of the equation is missed",
+        False,
+    ),
+    ((TokenKind.COMMA,), (TokenKind.COMMA,), "Unexpected comma, equation missed", False),
+)
+"""Errors that only depend on the kinds of two successive Tokens, as
+raised by the Linter."""
+
+_TRANSITIONS = {
+    (prev_kind, kind): (description, at_prev)
+    for kinds, prev_kinds, description, at_prev in _RULES
+    for kind in kinds
+    for prev_kind in prev_kinds
+}
+"""Error of every forbidden pair of the kinds of the previous Token and
+the Token, with whether it is located at the previous Token."""
+
+
 class Parser:
     """Source Parser. It parses the source and returns a list of
     Equation objects found in the source.
 
+    Every Token is linted and accumulated in a single transition: the
+    errors the Linter raises are looked up by the kinds of the previous
+    Token and the Token, or derived from the state of the accumulator.
+
     Args:
         source (str): The source to parse.
+        lexer (type[Lexer] | Lexer, optional): Lexer class of the
+            source, or a Lexer of it such as a ReplayLexer. Defaults to
+            FastLexer, Lexer is the reference one.
+        trusted (bool, optional): Skip linting, for machine-generated
+            sources known to be valid. An invalid source then parses
+            into unspecified Equations. Defaults to False.
     """
 
+    trusted: bool
+    """Whether linting is skipped."""
+
+    _source: str
+    """The source to parse."""
     _lexer: Lexer
     """Lexer of the source."""
-    _linter: Linter
-    """Linter of the source."""
 
+    _token: Token | None
+    """The last parsed Token."""
     _accumulator: EquationAccumulator
     """Equation accumulator."""
 
-    def __init__(self, source: str) -> None:
-        self._lexer = Lexer(source)
-        self._linter = Linter(source)
+    def __init__(
+        self,
+        source: str,
+        lexer: type[Lexer] | Lexer = FastLexer,
+        trusted: bool = False,
+    ) -> None:
+        self.trusted = trusted
+
+        self._source = source
+        self._lexer = lexer if isinstance(lexer, Lexer) else lexer(source)
 
+        self._token = None
         self._accumulator = EquationAccumulator()
 
     def __iter__(self) -> Parser:
@@ -124,14 +246,18 @@ class Parser:
         """
         while True:
             token = next(self._lexer)
+            kind = token.kind
+
+            prev_token, self._token = self._token, token
 
-            self._linter.lint(token)
+            if not self.trusted:
+                self._lint(prev_token, token, kind)
 
-            match token.kind:
+            match kind:
                 case TokenKind.SOF | TokenKind.MUL:
                     continue
                 case TokenKind.EOF:
-                    if token.prev_token.kind == TokenKind.SOF:
+                    if prev_token.kind == TokenKind.SOF:
                         raise StopIteration
 
                     return self._derive_equation()
@@ -158,6 +284,68 @@ class Parser:
                 case TokenKind.COMMA:
                     return self._derive_equation()
 
+    def _lint(self, prev_token: Token | None, token: Token, kind: TokenKind) -> None:
+        """Lints a Token, as the Linter does.
+
+        Args:
+            prev_token (Token | None): The previous Token, None for SOF.
+            token (Token): The Token.
+            kind (TokenKind): The kind of the Token.
+
+        Raises:
+            LinterException: The Token is unexpected, see Linter.
+        """
+        # The Tokens must come one after another, starting with SOF.
+        if token.index != (-1 if prev_token is None else prev_token.index) + 1:
+            raise LinterException(
+                self._source,
+                token.location,
+                "Crude modification of the token chain is detected",
+            )
+
+        if prev_token is None:
+            return
+
+        prev_kind = prev_token.kind
+        accumulator = self._accumulator
+
+        if kind == TokenKind.VARIABLE:
+            if accumulator.variable is not None:
+                raise LinterException(
+                    self._source,
+                    token.location,
+                    "Term must contain no more than one variable",
+                )
+
+            return
+
+        if kind in _RELATIONAL and accumulator.kind is not None:
+            raise LinterException(
+                self._source,
+                token.location,
+                "Equation must contain only one relational operator",
+            )
+        if (
+            kind in (TokenKind.COMMA, TokenKind.EOF)
+            and prev_kind != TokenKind.SOF
+            and accumulator.kind is None
+        ):
+            raise LinterException(
+                self._source,
+                token.location,
+                "Equation must contain a relational operator",
+            )
+
+        error = _TRANSITIONS.get((prev_kind, kind))
+        if error is not None:
+            description, at_prev = error
+
+            raise LinterException(
+                self._source,
+                prev_token.location if at_prev else token.location,
+                description,
+            )
+
     def _extend_variables(self) -> None:
         """Extend the variables with the current variable and
         coefficient.
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from ast_parser.lexer import Lexer
+from ast_parser.token import Token, TokenBuffer, TokenKind
+
+
+class ReplayLexer(Lexer):
+    """Lexer returning the Tokens of a source lexed before, so that it
+    can be parsed without lexing it again.
+
+    Args:
+        buffer (TokenBuffer): The Tokens of the source, from SOF to
+            EOF.
+
+    Raises:
+        ValueError: The buffer does not end with EOF.
+    """
+
+    def __init__(self, buffer: TokenBuffer) -> None:
+        if not len(buffer) or buffer[len(buffer) - 1].kind != TokenKind.EOF:
+            raise ValueError("The buffer must hold the Tokens up to EOF")
+
+        super().__init__(buffer.source)
+
+        self._buffer = buffer
+        self._token = buffer[0]
+
+    def _next_token(self) -> Token:
+        """Gets the next token from the buffer.
+
+        Returns:
+            Token: The next token from the buffer.
+        """
+        return self._buffer[self._token.index + 1]
+
+
+__all__ = ("ReplayLexer",)
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import codecs
+import mmap
+from typing import BinaryIO, Iterator, TextIO
+
+from ast_parser.errors import LexerException, LinterException, PositionedException
+from ast_parser.fast_lexer import FastLexer
+from ast_parser.parser import Equation, Parser
+from ast_parser.token import Location, TokenKind
+
+_PREFIX = "1=1,"
+"""Equation put in front of every segment but the first, so that the
+segment is linted as following a comma."""
+_SUFFIX = ",1=1"
+"""Equation put behind every segment but the last, so that the segment
+is linted as followed by a comma."""
+
+
+class StreamParser:
+    """Parser over a file object or a memory map, read in chunks.
+
+    The input is cut at commas into segments of complete equations,
+    which are parsed one after another, so only the current segment and
+    its Token chain are ever held in memory: about a chunk and the
+    longest equation, whatever the size of the input. The Equations and
+    the exceptions are the same as those of Parser on the whole input,
+    the exceptions carry the segment as their source and their Location
+    in the whole input.
+
+    Args:
+        stream (TextIO | BinaryIO | mmap.mmap): The input. Bytes are
+            decoded as UTF-8.
+        chunk_size (int, optional): Number of characters or bytes read
+            at a time. Defaults to 1 MiB.
+    """
+
+    chunk_size: int
+    """Number of characters or bytes read at a time."""
+
+    _stream: TextIO | BinaryIO | mmap.mmap
+    """The input."""
+    _decoder: codecs.IncrementalDecoder
+    """Decoder of binary input."""
+
+    _line: int
+    """Line of the start of the pending input."""
+    _column: int
+    """Column of the start of the pending input."""
+    _first: bool
+    """Whether no segment has been parsed yet."""
+    _deferred: PositionedException | None
+    """Exception of the last segment, raised once the first Token of the
+    next segment lexes."""
+
+    def __init__(
+        self, stream: TextIO | BinaryIO | mmap.mmap, chunk_size: int = 1 << 20
+    ) -> None:
+        self.chunk_size = chunk_size
+
+        self._stream = stream
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+
+        self._line = 1
+        self._column = 1
+        self._first = True
+        self._deferred = None
+
+    def __iter__(self) -> Iterator[Equation]:
+        """Parses the input.
+
+        Raises:
+            LexerException: The input does not lex, see Parser.
+            LinterException: The input does not lint, see Parser.
+
+        Yields:
+            Equation: The Equations of the input, in order.
+        """
+        pending = ""
+
+        while True:
+            chunk = self._stream.read(self.chunk_size)
+            final = not chunk
+
+            if isinstance(chunk, str):
+                pending += chunk
+            else:
+                pending += self._decoder.decode(chunk, final)
+
+            if final:
+                yield from self._parse_segment(pending, True)
+
+                return
+
+            comma = pending.rfind(",")
+            if comma < 0:
+                continue
+
+            yield from self._parse_segment(pending[:comma], False)
+
+            self._advance(pending[: comma + 1])
+            pending = pending[comma + 1 :]
+
+    def _parse_segment(self, segment: str, last: bool) -> Iterator[Equation]:
+        """Parses a segment of complete equations.
+
+        Args:
+            segment (str): The segment, without the comma behind it.
+            last (bool): Whether the segment ends the input.
+
+        Raises:
+            LexerException: The segment does not lex.
+            LinterException: The segment does not lint.
+
+        Yields:
+            Equation: The Equations of the segment.
+        """
+        prefix = "" if self._first else _PREFIX
+        suffix = "" if last else _SUFFIX
+
+        if self._deferred is not None:
+            self._raise_deferred(segment, suffix)
+
+        try:
+            equations = list(Parser(prefix + segment + suffix))
+        except LinterException as error:
+            if last or not self._fails_at_comma(prefix + segment):
+                raise self._relocate(error, segment) from None
+
+            # The whole input lexes the Token behind the comma before it
+            # lints the comma, so a LexerException there comes first.
+            self._deferred = self._relocate(error, segment)
+            return
+        except PositionedException as error:
+            raise self._relocate(error, segment) from None
+        finally:
+            self._first = False
+
+        yield from equations[1 if prefix else 0 : -1 if suffix else None]
+
+    def _fails_at_comma(self, text: str) -> bool:
+        """Checks whether a text followed by a comma lints up to the
+        comma.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            bool: Whether the Linter fails only on the comma.
+        """
+        try:
+            list(Parser(text + ",#"))
+        except LexerException as error:
+            return error.location == _locate_end(text + ",")
+        except LinterException:
+            return False
+
+        return False
+
+    def _raise_deferred(self, segment: str, suffix: str) -> None:
+        """Raises the deferred exception, or the LexerException of the
+        first Token of the segment behind it.
+
+        Args:
+            segment (str): The segment behind the deferred exception.
+            suffix (str): The text put behind the segment.
+
+        Raises:
+            LexerException: The first Token of the segment does not lex.
+            LinterException: The deferred exception.
+        """
+        try:
+            for token in FastLexer(_PREFIX + segment + suffix):
+                # Returning the comma lexes the Token behind it.
+                if token.kind == TokenKind.COMMA:
+                    break
+        except LexerException as error:
+            raise self._relocate(error, segment) from None
+
+        raise self._deferred
+
+    def _advance(self, text: str) -> None:
+        """Moves the start of the pending input behind the given text.
+
+        Args:
+            text (str): The consumed text.
+        """
+        end = _locate_end(text)
+
+        if end.line == 1:
+            self._column += end.column - 1
+        else:
+            self._line += end.line - 1
+            self._column = end.column
+
+    def _relocate(
+        self, error: PositionedException, segment: str
+    ) -> PositionedException:
+        """Maps an exception raised in a segment to the whole input.
+
+        Args:
+            error (PositionedException): The exception.
+            segment (str): The segment.
+
+        Returns:
+            PositionedException: The same exception, located in the
+                whole input.
+        """
+        location = error.location
+
+        if location.line == 1:
+            offset = 0 if self._first else len(_PREFIX)
+            location = Location(
+                self._line, location.column - offset + self._column - 1
+            )
+        else:
+            location = Location(self._line + location.line - 1, location.column)
+
+        return type(error)(segment, location, str(error))
+
+
+def _locate_end(text: str) -> Location:
+    """Gets the Location right behind a text.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        Location: The Location behind the last character of the text.
+    """
+    # `\r\n` and a lone `\r` end a line as `\n` does.
+    lines = text.count("\n") + text.count("\r") - text.count("\r\n")
+    line_start = max(text.rfind("\n"), text.rfind("\r")) + 1
+
+    return Location(1 + lines, 1 + len(text) - line_start)
+
+
+def parse_file(
+    path: str, memory_map: bool = True, chunk_size: int = 1 << 20
+) -> Iterator[Equation]:
+    """Parses a file with StreamParser.
+
+    Args:
+        path (str): Path of the file.
+        memory_map (bool, optional): Read the file through a memory map
+            instead of buffered reads. Defaults to True.
+        chunk_size (int, optional): Number of bytes read at a time.
+            Defaults to 1 MiB.
+
+    Raises:
+        LexerException: The file does not lex, see Parser.
+        LinterException: The file does not lint, see Parser.
+
+    Yields:
+        Equation: The Equations of the file, in order.
+    """
+    with open(path, "rb") as file:
+        # Empty files cannot be mapped.
+        if not memory_map or file.seek(0, 2) == 0:
+            file.seek(0)
+
+            yield from StreamParser(file, chunk_size)
+
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield from StreamParser(mapped, chunk_size)
+
+
+__all__ = ("StreamParser", "parse_file")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from array import array
+from dataclasses import dataclass
 from enum import Enum
 
 
@@ -35,6 +36,12 @@ class TokenKind(str, Enum):
     """Comma."""
 
 
+_KINDS = tuple(TokenKind)
+"""Every TokenKind, in the order of their codes in a TokenBuffer."""
+_KIND_CODES = {kind: code for code, kind in enumerate(_KINDS)}
+"""Code of every TokenKind in a TokenBuffer."""
+
+
 @dataclass
 class Location:
     """Location of the Token in the source.
@@ -48,27 +55,203 @@ class Location:
     """Column number of the token in the source. Starts at 1."""
 
 
-@dataclass
+class TokenBuffer:
+    """Struct of arrays holding the Tokens of a source.
+
+    Every Token takes a few dozen bytes in the parallel arrays, instead
+    of a dataclass, a Location and two references each. Token objects
+    are only views into the buffer, created on demand.
+
+    Args:
+        source (str): The source string being tokenized.
+    """
+
+    source: str
+    """The source string being tokenized."""
+
+    kinds: array
+    """Code of the kind of every Token."""
+    starts: array
+    """The index of the first character of every Token."""
+    ends: array
+    """The index of the first character after every Token."""
+    lines: array
+    """Line number of every Token."""
+    columns: array
+    """Column number of every Token."""
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+
+        self.kinds = array("B")
+        self.starts = array("q")
+        self.ends = array("q")
+        self.lines = array("q")
+        self.columns = array("q")
+
+    def __len__(self) -> int:
+        """Gets the number of Tokens in the buffer.
+
+        Returns:
+            int: The number of Tokens.
+        """
+        return len(self.kinds)
+
+    def __getitem__(self, index: int) -> Token:
+        """Gets a view of a Token.
+
+        Args:
+            index (int): The index of the Token.
+
+        Returns:
+            Token: The Token.
+        """
+        return Token(self, index)
+
+    def append(
+        self, kind: TokenKind, start: int, end: int, line: int, column: int
+    ) -> Token:
+        """Adds a Token at the end of the buffer.
+
+        Args:
+            kind (TokenKind): The kind of the Token.
+            start (int): The index of the first character of the Token.
+            end (int): The index of the first character after the Token.
+            line (int): Line number of the Token.
+            column (int): Column number of the Token.
+
+        Returns:
+            Token: The added Token.
+        """
+        self.kinds.append(_KIND_CODES[kind])
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+        self.columns.append(column)
+
+        return Token(self, len(self.kinds) - 1)
+
+
 class Token:
-    """Token of the source code."""
+    """Token of the source code, a view into a TokenBuffer.
+
+    Args:
+        buffer (TokenBuffer): The buffer holding the Token.
+        index (int): The index of the Token in the buffer.
+    """
+
+    __slots__ = ("buffer", "index")
+
+    buffer: TokenBuffer
+    """The buffer holding the Token."""
+    index: int
+    """The index of the Token in the buffer."""
+
+    def __init__(self, buffer: TokenBuffer, index: int) -> None:
+        self.buffer = buffer
+        self.index = index
+
+    @property
+    def kind(self) -> TokenKind:
+        """Gets the kind of the token.
+
+        Returns:
+            TokenKind: The kind of the token.
+        """
+        return _KINDS[self.buffer.kinds[self.index]]
+
+    @property
+    def start(self) -> int:
+        """Gets the index of the first character of the token.
+
+        Returns:
+            int: The index of the first character.
+        """
+        return self.buffer.starts[self.index]
+
+    @property
+    def end(self) -> int:
+        """Gets the index of the first character after the token.
+
+        Returns:
+            int: The index of the first character after the token.
+        """
+        return self.buffer.ends[self.index]
+
+    @property
+    def location(self) -> Location:
+        """Gets the Location of the token in the source.
+
+        Returns:
+            Location: The Location of the token.
+        """
+        return Location(self.buffer.lines[self.index], self.buffer.columns[self.index])
+
+    @property
+    def value(self) -> str:
+        """Gets the value of the token.
+
+        Returns:
+            str: The value of the token.
+        """
+        buffer = self.buffer
+
+        return buffer.source[buffer.starts[self.index] : buffer.ends[self.index]]
+
+    @property
+    def prev_token(self) -> Token | None:
+        """Gets the previous Token in the source.
+
+        Returns:
+            Token | None: The previous Token, None for the SOF Token.
+        """
+        return Token(self.buffer, self.index - 1) if self.index > 0 else None
+
+    @property
+    def next_token(self) -> Token | None:
+        """Gets the next Token in the source.
+
+        Returns:
+            Token | None: The next Token, None if it is not lexed yet.
+        """
+        if self.index + 1 < len(self.buffer):
+            return Token(self.buffer, self.index + 1)
+
+        return None
+
+    def __eq__(self, other: object) -> bool:
+        """Checks whether two views show the same Token.
+
+        Args:
+            other (object): The other view.
+
+        Returns:
+            bool: True if both views show the same Token, False
+                otherwise.
+        """
+        if not isinstance(other, Token):
+            return NotImplemented
+
+        return self.buffer is other.buffer and self.index == other.index
 
-    kind: TokenKind
-    """Kind of the token."""
+    def __hash__(self) -> int:
+        """Hashes the view by its buffer and index.
 
-    start: int = field(repr=False)
-    """The index of the first character of the token."""
-    end: int = field(repr=False)
-    """The index of the first character after the token."""
-    location: Location
-    """The Location of the token in the source."""
+        Returns:
+            int: The hash of the view.
+        """
+        return hash((id(self.buffer), self.index))
 
-    value: str
-    """The value of the token."""
+    def __repr__(self) -> str:
+        """Describes the Token.
 
-    prev_token: Token | None = field(repr=False, default=None)
-    """The previous Token in the source."""
-    next_token: Token | None = field(repr=False, default=None)
-    """The next Token in the source."""
+        Returns:
+            str: The description of the Token.
+        """
+        return (
+            f"Token(kind={self.kind!r}, location={self.location!r}, "
+            f"value={self.value!r})"
+        )
 
 
 def is_binary_operator(token: Token) -> bool:
@@ -100,6 +283,7 @@ def is_relational_operator(token: Token) -> bool:
 __all__ = (
     "TokenKind",
     "Location",
+    "TokenBuffer",
     "Token",
     "is_binary_operator",
     "is_relational_operator",
@@ -1,59 +1,241 @@
-from ast_parser import Parser, EquationKind
+import argparse
+
+from ast_parser import (
+    CooParser,
+    EquationKind,
+    FastLexer,
+    LexerException,
+    Linter,
+    ParseCache,
+    Parser,
+    ReplayLexer,
+)
 from algorithm import solver
+from algorithm.events import PivotTrace
+from algorithm.parallel import ParallelSolver
+from algorithm.problem import LinearProgram
+from algorithm.profiling import StageProfiler, profiled
+from algorithm.revised import SimplexStatus
+from algorithm.storage import load_model
 
-print("Enter all equations, following each with a comma. The last equation should be without a comma")
-print("As an example 'Z = 5x_1 + 4x_2', '6x_1 + 4x_2 <= 24'")
-input_equation = input()
+# Suffix of the binary model files.
+MODEL_SUFFIX = ".lpm"
 
-parser = Parser(input_equation)
+# Sources of a batch or of the service share most of their equations.
+parse_cache = ParseCache()
 
-equations = tuple(parser)
 
-for equation in equations:
-    if equation.kind == EquationKind.GEQ and equation.bound < 0.0:
-        for variable, coefficient in equation.variables.items():
-            equation.variables[variable] *= -1.0
+def parse_equations(text, profiler=None):
+    """Parses a problem.
 
-        equation.bound *= -1.0
-        equation.kind = EquationKind.LEQ
+    Without a profiler, the Equations come from the parse cache. With
+    one, the source is lexed, linted and parsed as three measured
+    stages, and the cache is bypassed so that every stage really runs.
 
-        continue
+    Args:
+        text (str): The problem, equations separated by commas.
+        profiler (StageProfiler, optional): Measures the stages.
+            Defaults to None.
 
-    if equation.kind == EquationKind.GEQ:
-        raise ValueError("Equation kind must be either EQ or LEQ")
-    if equation.bound < 0.0:
-        raise ValueError("Equation bound must be non-negative")
+    Raises:
+        LexerException: The source does not lex, see Parser.
+        LinterException: The source does not lint, see Parser.
 
-demand: dict[str, list[int]] = {}
-for i, equation in enumerate(equations):
-    for variable, coefficient in equation.variables.items():
-        if coefficient == 0.0:
-            continue
+    Returns:
+        tuple: The Equations of the problem.
+    """
+    if profiler is None:
+        return parse_cache.parse(text)
 
-        if variable not in demand:
-            demand[variable] = []
+    with profiler.stage("lexing"):
+        lexer, error = FastLexer(text), None
+        try:
+            for _ in lexer:
+                pass
+        except LexerException as exception:
+            error = exception
 
-        demand[variable].append(i)
+    with profiler.stage("linting"):
+        linter = Linter(text)
+        # The Parser lexes one Token ahead, so a lexer exception is
+        # raised before the Token in front of it is linted.
+        for index in range(len(lexer.buffer) - (error is not None)):
+            linter.lint(lexer.buffer[index])
 
-objective_variables = tuple(
-    filter(lambda variable: len(demand[variable]) == 1, demand.keys())
-)
+    if error is not None:
+        raise error
+
+    with profiler.stage("parsing"):
+        return tuple(Parser(text, ReplayLexer(lexer.buffer), trusted=True))
+
+
+def find_objective(equations):
+    """Separates the objective function from the constraints.
 
-objective_functions = tuple(
-    filter(
-        lambda function: function.kind == EquationKind.EQ,
-        map(lambda variable: equations[demand[variable][0]], objective_variables),
+    Args:
+        equations (tuple): The Equations of a problem.
+
+    Raises:
+        ValueError: The objective function is missing, repeated or not
+            an equality.
+
+    Returns:
+        tuple: The objective functions and the constraints.
+    """
+    objective_candidates = tuple(
+        filter(lambda equation: equation.variables.get("Z", 0.0) != 0.0, equations)
     )
-)
 
-if len(objective_variables) != len(objective_functions):
-    raise ValueError("Objective functions must be equalities")
+    objective_functions = tuple(
+        filter(lambda function: function.kind == EquationKind.EQ, objective_candidates)
+    )
+
+    if len(objective_candidates) != len(objective_functions):
+        raise ValueError("Objective functions must be equalities")
+    if len(objective_functions) != 1:
+        raise ValueError("Exactly one objective function Z must be given")
 
-constraints = tuple(
-    filter(
-        lambda function: function not in objective_functions,
-        equations,
+    constraints = tuple(
+        filter(
+            lambda function: function not in objective_functions,
+            equations,
+        )
     )
-)
 
-solver.Solver(objective_functions, constraints)
\ No newline at end of file
+    return objective_functions, constraints
+
+
+def split_equations(text):
+    """Parses a problem and separates the objective function from the
+    constraints.
+
+    Args:
+        text (str): The problem, equations separated by commas.
+
+    Raises:
+        ValueError: The objective function is missing, repeated or not
+            an equality.
+
+    Returns:
+        tuple: The objective functions and the constraints.
+    """
+    return find_objective(parse_equations(text))
+
+
+def solve(text, profiler=None, callback=None):
+    """Parses and solves a problem, printing the result.
+
+    Args:
+        text (str): The problem, equations separated by commas.
+        profiler (StageProfiler, optional): Measures the lexing,
+            linting, parsing, objective detection, matrix assembly and
+            pivoting stages. Defaults to None.
+        callback (PivotCallback, optional): Called with a PivotEvent
+            after every pivot. Defaults to None.
+    """
+    equations = parse_equations(text, profiler)
+
+    with profiled(profiler, "objective detection"):
+        objective_functions, constraints = find_objective(equations)
+
+    solver.Solver(
+        objective_functions, constraints, profiler=profiler, callback=callback
+    )
+
+
+def print_trace(trace):
+    """Prints the pivots kept by a trace.
+
+    Args:
+        trace (PivotTrace): The trace.
+    """
+    print(f"Pivots: {trace.count}, degenerate: {trace.degenerate}")
+    print(
+        f"{'iter':>6}{'phase':>6}{'in':>6}{'out':>6}{'objective':>14}"
+        f"{'primal inf':>12}{'dual inf':>12}{'pivot':>12}{'step':>12}{'ms':>9}"
+    )
+
+    for event in trace.events():
+        print(
+            f"{event.iteration:>6}{event.phase:>6}{event.entering:>6}{event.leaving:>6}"
+            f"{event.objective:>14.6g}{event.primal_infeasibility:>12.3g}"
+            f"{event.dual_infeasibility:>12.3g}{event.pivot:>12.3g}"
+            f"{event.step:>12.3g}{event.elapsed * 1e3:>9.3f}"
+        )
+
+
+def solve_batch(paths, profiler=None):
+    """Solves one problem per file on all cores, printing every result
+    as soon as it is available.
+
+    Args:
+        paths (list of str): Paths of the problem files, as equations or
+            as binary model files ending with MODEL_SUFFIX.
+        profiler (StageProfiler, optional): Measures the loading of the
+            files and the parallel solve. Defaults to None.
+    """
+    programs = []
+    for path in paths:
+        with profiled(profiler, "loading"):
+            # Model files saved by save_model are mapped without parsing.
+            if path.endswith(MODEL_SUFFIX):
+                programs.append(load_model(path).program)
+
+                continue
+
+            with open(path, encoding="utf-8") as file:
+                equations = CooParser(file.read()).parse()
+
+            programs.append(LinearProgram.from_coo(equations, sparse=True))
+
+    with profiled(profiler, "solving"), ParallelSolver() as pool:
+        for i, result in pool.solve(programs):
+            print(paths[i], ": ", result.status.value, sep="")
+
+            # Infeasible, unbounded and unfinished solves have no solution.
+            if result.status != SimplexStatus.OPTIMAL:
+                continue
+
+            for name, value in zip(programs[i].variable_names, result.x):
+                print("  ", name, ": ", round(value, 2), sep="")
+            print("  Z: ", round(result.objective, 2), sep="")
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(
+        description="Solves the problem typed in, or one problem per file on all cores."
+    )
+    arguments.add_argument("paths", nargs="*", help="problem files")
+    arguments.add_argument(
+        "--profile", metavar="REPORT", help="write a JSON report of the stages"
+    )
+    arguments.add_argument(
+        "--profile-dir", metavar="DIR", help="dump a cProfile file per stage"
+    )
+    arguments.add_argument(
+        "--trace",
+        metavar="N",
+        type=int,
+        help="print the last N pivots of the problem typed in",
+    )
+    args = arguments.parse_args()
+
+    profiler = None
+    if args.profile or args.profile_dir:
+        profiler = StageProfiler(profile_dir=args.profile_dir)
+
+    if args.paths:
+        solve_batch(args.paths, profiler)
+    else:
+        print("Enter all equations, following each with a comma. The last equation should be without a comma")
+        print("As an example 'Z = 5x_1 + 4x_2', '6x_1 + 4x_2 <= 24'")
+        input_equation = input()
+
+        trace = PivotTrace(args.trace) if args.trace else None
+        solve(input_equation, profiler, trace)
+
+        if trace is not None:
+            print_trace(trace)
+
+    if args.profile:
+        profiler.write(args.profile)
@@ -0,0 +1,475 @@
+import argparse
+import asyncio
+import json
+from typing import Awaitable, TypeVar
+
+import numpy as np
+
+from algorithm.builder import ProgramBuilder
+from algorithm.cache import ResultCache
+from algorithm.errors import SolverException
+from algorithm.model import Model
+from algorithm.parallel import ParallelSolver
+from algorithm.problem import LinearProgram
+from algorithm.revised import SimplexResult
+from ast_parser import PositionedException
+from main import split_equations
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    408: "Request Timeout",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+"""Reason phrases of the status codes the service responds with."""
+
+T = TypeVar("T")
+"""Result of a read of the request."""
+
+
+class RequestError(Exception):
+    """A RequestError is raised when a request cannot be served.
+
+    Args:
+        status (int): HTTP status code of the response.
+        description (str): Description of the error.
+    """
+
+    status: int
+    """HTTP status code of the response."""
+
+    def __init__(self, status: int, description: str) -> None:
+        super().__init__(description)
+
+        self.status = status
+
+
+class SolveService:
+    """Local solve server built on asyncio, listening over HTTP or a
+    Unix socket.
+
+    Requests are parsed on the event loop and queued for a fixed number
+    of dispatchers that hand the solves to a pre-warmed ParallelSolver.
+    The queue is bounded: when it is full, a request is rejected at once
+    with status 503 instead of waiting, which keeps the latency of the
+    accepted requests bounded. Results are kept in a ResultCache, so a
+    resubmitted problem, even with reordered rows or variables, is
+    answered without solving it again.
+
+    `POST /solve` takes a JSON object with either a `problem` string in
+    the syntax of main.py, or the arrays `A`, `b`, `c` and `senses` with
+    optional `variables`. The response is a JSON object with the status,
+    the objective, the values of the variables, the duals of the rows
+    and the number of pivots. `GET /health` reports the queue length.
+
+    A request has to arrive in full within the read timeout, or it is
+    answered with status 408, so idle or slow clients do not hold their
+    connections. Requests with more header lines, or more header bytes,
+    than allowed are answered with status 431.
+
+    Args:
+        workers (int, optional): Number of worker processes. Defaults to
+            the number of processors.
+        queue_size (int, optional): Largest number of solves waiting for
+            a worker. Defaults to 64.
+        max_body (int, optional): Largest accepted request body in
+            bytes. Defaults to 16 MiB.
+        cache_size (int, optional): Largest number of cached results.
+            Defaults to 1024.
+        cache_ttl (float, optional): Seconds a cached result stays
+            valid. Defaults to 300.0.
+        read_timeout (float, optional): Seconds a client has to send a
+            whole request. Defaults to 10.0.
+        max_headers (int, optional): Largest number of header lines.
+            Defaults to 100.
+        max_header_size (int, optional): Largest size of the request
+            line and the headers in bytes. Defaults to 32 KiB.
+    """
+
+    queue_size: int
+    """Largest number of solves waiting for a worker."""
+    max_body: int
+    """Largest accepted request body in bytes."""
+    read_timeout: float
+    """Seconds a client has to send a whole request."""
+    max_headers: int
+    """Largest number of header lines."""
+    max_header_size: int
+    """Largest size of the request line and the headers in bytes."""
+
+    _pool: ParallelSolver
+    """The worker pool."""
+    _cache: ResultCache
+    """Results of the recent solves."""
+    _queue: asyncio.Queue | None
+    """Solves waiting for a worker, with the futures of their results."""
+    _dispatchers: list[asyncio.Task]
+    """Tasks moving the queued solves to the pool."""
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        queue_size: int = 64,
+        max_body: int = 16 * 1024 * 1024,
+        cache_size: int = 1024,
+        cache_ttl: float = 300.0,
+        read_timeout: float = 10.0,
+        max_headers: int = 100,
+        max_header_size: int = 32 * 1024,
+    ) -> None:
+        self.queue_size = queue_size
+        self.max_body = max_body
+        self.read_timeout = read_timeout
+        self.max_headers = max_headers
+        self.max_header_size = max_header_size
+
+        self._pool = ParallelSolver(workers)
+        self._pool.warm_up()
+
+        self._cache = ResultCache(cache_size, cache_ttl)
+
+        self._queue = None
+        self._dispatchers = []
+
+    async def serve_http(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        """Serves requests over TCP until cancelled.
+
+        Args:
+            host (str, optional): Interface to listen on. Defaults to
+                "127.0.0.1".
+            port (int, optional): Port to listen on. Defaults to 8080.
+        """
+        self._start()
+
+        server = await asyncio.start_server(self._handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_unix(self, path: str) -> None:
+        """Serves requests over a Unix socket until cancelled.
+
+        Args:
+            path (str): Path of the socket.
+        """
+        self._start()
+
+        server = await asyncio.start_unix_server(self._handle, path)
+        async with server:
+            await server.serve_forever()
+
+    async def solve(self, payload: dict) -> dict:
+        """Solves a problem given as a decoded request body.
+
+        Args:
+            payload (dict): The request body.
+
+        Raises:
+            RequestError: The problem is invalid or the queue is full.
+
+        Returns:
+            dict: The response body.
+        """
+        self._start()
+
+        program = self._program(payload)
+        result = await self._cache.solve_async(program, self._enqueue)
+
+        return {
+            "status": result.status.value,
+            "objective": result.objective,
+            "values": dict(zip(program.variable_names, result.x.tolist())),
+            "duals": dict(zip(program.row_names, result.duals.tolist())),
+            "iterations": result.iterations,
+        }
+
+    async def _enqueue(self, program: LinearProgram) -> SimplexResult:
+        """Queues a solve and waits for its result.
+
+        Args:
+            program (LinearProgram): The program to solve.
+
+        Raises:
+            RequestError: The queue is full.
+
+        Returns:
+            SimplexResult: The outcome of the solve.
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((program, future))
+        except asyncio.QueueFull:
+            raise RequestError(503, "Solve queue is full") from None
+
+        return await future
+
+    def close(self) -> None:
+        """Stops the dispatchers and shuts the worker pool down."""
+        for dispatcher in self._dispatchers:
+            dispatcher.cancel()
+
+        self._pool.close()
+
+    def _start(self) -> None:
+        """Creates the queue and the dispatchers on the running loop."""
+        if self._queue is not None:
+            return
+
+        self._queue = asyncio.Queue(self.queue_size)
+        self._dispatchers = [
+            asyncio.create_task(self._dispatch()) for _ in range(self._pool.workers)
+        ]
+
+    async def _dispatch(self) -> None:
+        """Moves queued solves to the pool, one at a time."""
+        while True:
+            program, future = await self._queue.get()
+
+            try:
+                result = await asyncio.wrap_future(self._pool.submit(program))
+            except Exception as error:
+                if not future.done():
+                    future.set_exception(error)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _program(payload: dict) -> LinearProgram:
+        """Builds the program of a request.
+
+        Args:
+            payload (dict): The request body.
+
+        Raises:
+            RequestError: The problem is invalid.
+
+        Returns:
+            LinearProgram: The program to solve.
+        """
+        if not isinstance(payload, dict):
+            raise RequestError(400, "Request body must be a JSON object")
+
+        try:
+            if "problem" in payload:
+                objective_functions, constraints = split_equations(
+                    str(payload["problem"])
+                )
+
+                return Model.from_equations(objective_functions, constraints).build(
+                    sparse=True
+                )
+
+            A = np.asarray(payload["A"], dtype=float).reshape(len(payload["b"]), -1)
+
+            return ProgramBuilder.from_arrays(
+                A,
+                payload["b"],
+                payload["c"],
+                payload["senses"],
+                payload.get("variables"),
+            ).build(sparse=False)
+        except PositionedException as error:
+            location = error.location
+            raise RequestError(
+                400, f"{error} at line {location.line}, column {location.column}"
+            ) from None
+        except (KeyError, TypeError, ValueError) as error:
+            raise RequestError(400, f"Invalid problem: {error}") from None
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serves a single HTTP/1.1 request of a connection.
+
+        Args:
+            reader (asyncio.StreamReader): Reading end of the connection.
+            writer (asyncio.StreamWriter): Writing end of the connection.
+        """
+        try:
+            status, body = 200, await self._respond(reader)
+        except RequestError as error:
+            status, body = error.status, {"error": str(error)}
+        except SolverException as error:
+            status, body = 400, {"error": str(error)}
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        except Exception as error:
+            status, body = 500, {"error": str(error)}
+
+        content = json.dumps(body).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(content)}\r\n"
+            f"Connection: close\r\n\r\n".encode()
+            + content
+        )
+
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _respond(self, reader: asyncio.StreamReader) -> dict:
+        """Reads a request and computes its response body.
+
+        Args:
+            reader (asyncio.StreamReader): Reading end of the connection.
+
+        Raises:
+            RequestError: The request cannot be served.
+
+        Returns:
+            dict: The response body.
+        """
+        # The whole request shares one deadline, so a client cannot keep
+        # the connection by sending it a piece at a time.
+        deadline = asyncio.get_running_loop().time() + self.read_timeout
+
+        method, path, headers = await self._read(self._read_head(reader), deadline)
+
+        if path == "/health":
+            return {
+                "status": "ok",
+                "queued": self._queue.qsize(),
+                "cached": len(self._cache),
+            }
+        if path != "/solve":
+            raise RequestError(404, f"Unknown path {path}")
+        if method != "POST":
+            raise RequestError(405, "Use POST to solve")
+
+        length = headers.get("content-length", "0")
+        if not length.isdigit():
+            raise RequestError(400, "Invalid Content-Length")
+
+        length = int(length)
+        if length > self.max_body:
+            raise RequestError(413, "Request body is too large")
+
+        try:
+            payload = json.loads(await self._read(reader.readexactly(length), deadline))
+        except json.JSONDecodeError as error:
+            raise RequestError(400, f"Invalid JSON: {error}") from None
+
+        return await self.solve(payload)
+
+    async def _read_head(
+        self, reader: asyncio.StreamReader
+    ) -> tuple[str, str, dict[str, str]]:
+        """Reads the request line and the headers.
+
+        Args:
+            reader (asyncio.StreamReader): Reading end of the connection.
+
+        Raises:
+            RequestError: The request line is malformed, or the headers
+                exceed the limits.
+
+        Returns:
+            tuple[str, str, dict[str, str]]: The method, the path and
+                the headers by lowercase name.
+        """
+        line = await self._read_line(reader)
+        size = len(line)
+
+        request_line = line.decode("latin-1").split()
+        if len(request_line) != 3:
+            raise RequestError(400, "Malformed request line")
+
+        method, path, _ = request_line
+
+        headers, count = {}, 0
+        while (line := await self._read_line(reader)) not in (b"\r\n", b"\n", b""):
+            count += 1
+            size += len(line)
+            if count > self.max_headers or size > self.max_header_size:
+                raise RequestError(431, "Request headers are too large")
+
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        return method, path, headers
+
+    @staticmethod
+    async def _read_line(reader: asyncio.StreamReader) -> bytes:
+        """Reads a line of the request head.
+
+        Args:
+            reader (asyncio.StreamReader): Reading end of the connection.
+
+        Raises:
+            RequestError: The line is longer than the stream buffer.
+
+        Returns:
+            bytes: The line with its terminator.
+        """
+        try:
+            return await reader.readline()
+        except ValueError:
+            raise RequestError(431, "Request header line is too long") from None
+
+    @staticmethod
+    async def _read(read: Awaitable[T], deadline: float) -> T:
+        """Waits for a read of the request until the deadline.
+
+        Args:
+            read (Awaitable[T]): The read.
+            deadline (float): Event loop time by which the request must
+                have arrived.
+
+        Raises:
+            RequestError: The deadline has passed.
+
+        Returns:
+            T: The result of the read.
+        """
+        timeout = max(deadline - asyncio.get_running_loop().time(), 0.0)
+
+        try:
+            return await asyncio.wait_for(read, timeout)
+        except asyncio.TimeoutError:
+            raise RequestError(408, "Request not received in time") from None
+
+
+def main() -> None:
+    """Runs the service from the command line."""
+    arguments = argparse.ArgumentParser(description="Simplex solve service")
+    arguments.add_argument("--host", default="127.0.0.1")
+    arguments.add_argument("--port", type=int, default=8080)
+    arguments.add_argument("--unix", help="serve over a Unix socket at this path")
+    arguments.add_argument("--workers", type=int)
+    arguments.add_argument("--queue-size", type=int, default=64)
+    arguments.add_argument(
+        "--read-timeout",
+        type=float,
+        default=10.0,
+        help="seconds a client has to send a whole request",
+    )
+    options = arguments.parse_args()
+
+    service = SolveService(
+        options.workers, options.queue_size, read_timeout=options.read_timeout
+    )
+
+    try:
+        if options.unix:
+            asyncio.run(service.serve_unix(options.unix))
+        else:
+            asyncio.run(service.serve_http(options.host, options.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()